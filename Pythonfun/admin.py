@@ -1,5 +1,13 @@
-from django.contrib import admin
-from .models import Article, MainCategory, SubCategory, Tag
+from functools import reduce
+from operator import or_
+
+from django.contrib import admin, messages
+from django.db.models import Q
+from .bulk import set_published
+from .models import (
+    Article, MainCategory, SubCategory, Tag, FunctionEntry, FunctionParameter, Library, LibraryModule, LibraryItem,
+)
+from .search import matching_articles, split_query_terms
 
 @admin.register(Article)
 class ArticleAdmin(admin.ModelAdmin):
@@ -7,6 +15,10 @@ class ArticleAdmin(admin.ModelAdmin):
     list_filter = ['is_published', 'category', 'tags', 'created_at']
     search_fields = ['title', 'summary', 'content_html']
     readonly_fields = ['created_at', 'updated_at']
+    list_select_related = ['category__parent']
+    # 文章表很大时不再额外统计全表行数
+    show_full_result_count = False
+    actions = ['publish_selected', 'unpublish_selected']
     
     fieldsets = (
         ('基本信息', {
@@ -27,21 +39,62 @@ class ArticleAdmin(admin.ModelAdmin):
         })
     )
 
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        match = request.resolver_match
+        if match and match.url_name and match.url_name.endswith('_changelist'):
+            # 列表页不展示正文
+            queryset = queryset.defer('content_html', 'content_code', 'compiled_html', 'toc')
+        return queryset
+
+    def get_search_results(self, request, queryset, search_term):
+        """索引能表示的词项走全文索引（所有词项都命中），索引表示不了的单个汉字再在索引结果中用LIKE筛选
+
+        索引没有结果即没有匹配的文章，不再退回LIKE全表扫描；只有单个汉字的查询才需要扫描。
+        """
+        indexed, characters = split_query_terms(search_term)
+        if not indexed and not characters:
+            return super().get_search_results(request, queryset, search_term)
+        if indexed:
+            queryset = queryset.filter(pk__in=matching_articles(indexed))
+        for character in characters:
+            queryset = queryset.filter(reduce(or_, (
+                Q(**{f'{field}__icontains': character}) for field in self.search_fields
+            )))
+        return queryset, False
+
     def save_model(self, request, obj, form, change):
         if obj.is_published:
             obj.full_clean()
         super().save_model(request, obj, form, change)
 
+    def _set_published(self, request, queryset, is_published):
+        # 一次校验、一条UPDATE；不满足发布条件的文章跳过并列出原因
+        results, _ = set_published(queryset.values_list('pk', flat=True), is_published, atomic=False)
+        errors = [result for result in results if result['status'] == 'error']
+        done = len(results) - len(errors)
+        self.message_user(request, f'已{"发布" if is_published else "取消发布"} {done} 篇文章')
+        for result in errors[:10]:
+            self.message_user(request, f'文章 {result["id"]}：{result["message"]}', messages.WARNING)
+
+    @admin.action(description='发布所选文章')
+    def publish_selected(self, request, queryset):
+        self._set_published(request, queryset, True)
+
+    @admin.action(description='取消发布所选文章')
+    def unpublish_selected(self, request, queryset):
+        self._set_published(request, queryset, False)
+
 @admin.register(MainCategory)
 class MainCategoryAdmin(admin.ModelAdmin):
-    list_display = ['name', 'order', 'is_enabled']
+    list_display = ['name', 'order', 'is_enabled', 'published_tutorial_count']
     list_filter = ['is_enabled']
     search_fields = ['name', 'description']
     prepopulated_fields = {'slug': ('name',)}
 
 @admin.register(SubCategory)
 class SubCategoryAdmin(admin.ModelAdmin):
-    list_display = ['name', 'parent', 'is_enabled']
+    list_display = ['name', 'parent', 'is_enabled', 'published_tutorial_count']
     list_filter = ['is_enabled', 'parent']
     search_fields = ['name', 'description']
     prepopulated_fields = {'slug': ('name',)}
@@ -51,3 +104,32 @@ class TagAdmin(admin.ModelAdmin):
     list_display = ['name']
     search_fields = ['name']
     prepopulated_fields = {'slug': ('name',)}
+
+class FunctionParameterInline(admin.TabularInline):
+    model = FunctionParameter
+    extra = 0
+
+@admin.register(FunctionEntry)
+class FunctionEntryAdmin(admin.ModelAdmin):
+    list_display = ['qualified_name', 'module', 'function_type', 'updated_at']
+    list_filter = ['function_type']
+    search_fields = ['qualified_name', 'description']
+    readonly_fields = ['updated_at']
+    inlines = [FunctionParameterInline]
+    show_full_result_count = False
+
+@admin.register(Library)
+class LibraryAdmin(admin.ModelAdmin):
+    list_display = ['name', 'key', 'order']
+    list_editable = ['order']
+
+class LibraryItemInline(admin.TabularInline):
+    model = LibraryItem
+    extra = 0
+
+@admin.register(LibraryModule)
+class LibraryModuleAdmin(admin.ModelAdmin):
+    list_display = ['name', 'library', 'description', 'order', 'updated_at']
+    list_filter = ['library']
+    readonly_fields = ['updated_at']
+    inlines = [LibraryItemInline]
@@ -0,0 +1,360 @@
+from django.core.exceptions import ValidationError
+from django.db import connection, models, transaction
+from django.db.models import Value
+from django.db.models.functions import Coalesce, Length, Substr
+from django.utils import timezone
+
+from .category_tree import invalidate_category_tree
+from .counters import recompute_tutorial_counts
+from .models import Article, SubCategory, Tag
+from .navigation import relink_category, unlink_articles
+from .page_dependencies import articles_page_paths
+from .search import index_rows, invalidate_collection_stats, remove_articles
+from .signals import bulk_article_writes, pages_changed
+
+# 单次请求最多的操作数
+MAX_OPERATIONS = 1000
+BATCH_SIZE = 200
+# 可写字段；创建时未给出的字段取模型缺省值
+WRITABLE_FIELDS = (
+    'title', 'subtitle', 'summary', 'read_time_minutes',
+    'content_html', 'content_code', 'code_language', 'is_published',
+)
+# 外键在批量预取时已校验，不逐行查询
+UNVALIDATED_FIELDS = ['category', 'prev_in_category', 'next_in_category']
+TEXT_FIELDS = {
+    name for name in WRITABLE_FIELDS if isinstance(Article._meta.get_field(name), (models.CharField, models.TextField))
+}
+# 草稿允许为空的必填字段（与单条保存一致，发布时才要求非空）
+DRAFT_BLANK_FIELDS = ('title', 'summary', 'content_html')
+SEARCH_FIELDS = {'title', 'summary', 'content_html'}
+# 发布校验只读出正文开头这么多字符
+CONTENT_HEAD_LENGTH = 1000
+
+
+def _error_message(error):
+    if not isinstance(error, ValidationError):
+        return str(error)
+    if hasattr(error, 'error_dict'):
+        return '; '.join(f'{field}: {" ".join(messages)}' for field, messages in error.message_dict.items())
+    return '; '.join(error.messages)
+
+
+def is_id(value):
+    """主键必须是整数：bool是int的子类，列表等不可哈希的值也不能参与集合查找"""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+class _Batch:
+    """一批文章写操作：先校验并在内存中构造实例，再在一个事务中批量写入"""
+
+    def __init__(self, operations, content_type=None):
+        self.operations = operations
+        self.content_type = content_type
+        self.results = [None] * len(operations)
+        self.creates = []
+        self.updates = []
+        self.deletes = []
+        self.update_fields = set()
+        self.tag_ids = {}
+        # 更新和删除前的(分类, 计入的分类)，用于维护计数器和前后篇
+        self.previous = {}
+        self._prefetch()
+
+    def _prefetch(self):
+        """一次查出所有操作涉及的文章、分类和标签"""
+        article_ids = set()
+        category_ids = set()
+        tag_names = set()
+        for operation in self.operations:
+            if not isinstance(operation, dict):
+                continue
+            if is_id(operation.get('id')):
+                article_ids.add(operation['id'])
+            data = operation.get('data')
+            if isinstance(data, dict):
+                if is_id(data.get('category_id')):
+                    category_ids.add(data['category_id'])
+                if isinstance(data.get('tags'), list):
+                    tag_names.update(name for name in data['tags'] if isinstance(name, str))
+        articles = Article.objects.select_related('category')
+        if self.content_type:
+            articles = articles.filter(content_type=self.content_type)
+        self.articles = articles.in_bulk(article_ids)
+        self.categories = SubCategory.objects.in_bulk(category_ids)
+        self.tags = dict(Tag.objects.filter(name__in=tag_names).values_list('name', 'pk'))
+
+    def prepare(self):
+        seen = set()
+        for index, operation in enumerate(self.operations):
+            kind = operation.get('op') if isinstance(operation, dict) else None
+            try:
+                if kind not in ('create', 'update', 'delete'):
+                    raise ValidationError('op必须是create、update或delete')
+                if kind != 'create':
+                    pk = operation.get('id')
+                    if not is_id(pk):
+                        raise ValidationError('id必须是整数')
+                    if pk in seen:
+                        raise ValidationError(f'同一批次中重复操作文章 {pk}')
+                    if pk not in self.articles:
+                        raise ValidationError(f'文章 {pk} 不存在')
+                    seen.add(pk)
+                getattr(self, f'_prepare_{kind}')(index, operation)
+            except (ValidationError, TypeError, ValueError) as e:
+                self.results[index] = {'index': index, 'op': kind, 'status': 'error', 'message': _error_message(e)}
+        return not self.errors
+
+    @property
+    def errors(self):
+        return [result for result in self.results if result and result['status'] == 'error']
+
+    def _apply_data(self, article, data, creating):
+        if not isinstance(data, dict):
+            raise ValidationError('data必须是对象')
+        fields = set()
+        for name in WRITABLE_FIELDS:
+            if name in data:
+                value = data[name]
+                # 文本字段的to_python会把任意对象转成字符串，JSON中的数字、列表等直接拒绝
+                if name in TEXT_FIELDS and value is not None and not isinstance(value, str):
+                    raise ValidationError({name: ['必须是字符串']})
+                setattr(article, name, value)
+                fields.add(name)
+        if 'content_type' in data and not self.content_type:
+            if data['content_type'] not in Article.ContentType.values:
+                raise ValidationError(f'无效的内容类型 {data["content_type"]}')
+            article.content_type = data['content_type']
+            fields.add('content_type')
+        if 'category_id' in data:
+            category_id = data['category_id']
+            if category_id is not None and (not is_id(category_id) or category_id not in self.categories):
+                raise ValidationError(f'分类 {category_id} 不存在')
+            article.category = self.categories.get(category_id)
+            fields.add('category')
+        if 'tags' in data:
+            if not isinstance(data['tags'], list):
+                raise ValidationError('tags必须是列表')
+            # 与单条接口一致：不存在的标签忽略
+            self.tag_ids[id(article)] = {
+                self.tags[name] for name in data['tags'] if isinstance(name, str) and name in self.tags
+            }
+        if creating and not article.title:
+            raise ValidationError('title不能为空')
+        # 每一项都按字段定义校验并转换类型，类型错误只作为该项的错误，不会在批量写入时中断整个请求
+        exclude = list(UNVALIDATED_FIELDS)
+        if not article.is_published:
+            exclude += [name for name in DRAFT_BLANK_FIELDS if getattr(article, name) == '']
+        article.clean_fields(exclude=exclude)
+        if article.is_published:
+            article.clean()
+        if article.compile_content():
+            fields.update(Article.compiled_fields)
+        return fields
+
+    def _prepare_create(self, index, operation):
+        article = Article(content_type=self.content_type or Article.ContentType.TUTORIAL)
+        self._apply_data(article, operation.get('data', {}), creating=True)
+        self.creates.append((index, article))
+
+    def _prepare_update(self, index, operation):
+        article = self.articles[operation['id']]
+        self.previous[article.pk] = (article.category_id, article.counted_category_id)
+        try:
+            self.update_fields |= self._apply_data(article, operation.get('data', {}), creating=False)
+        except (ValidationError, TypeError, ValueError):
+            del self.previous[article.pk]
+            raise
+        self.updates.append((index, article))
+
+    def _prepare_delete(self, index, operation):
+        article = self.articles[operation['id']]
+        self.previous[article.pk] = (article.category_id, article.counted_category_id)
+        self.deletes.append((index, article))
+
+    def apply(self):
+        """在一个事务中执行全部已通过校验的操作，并按批次维护派生数据"""
+        with transaction.atomic(), bulk_article_writes():
+            delete_ids = [article.pk for _, article in self.deletes]
+            if delete_ids:
+                remove_articles(delete_ids)
+                Article.objects.filter(pk__in=delete_ids).delete()
+
+            created = [article for _, article in self.creates]
+            if created:
+                if connection.features.can_return_rows_from_bulk_insert:
+                    Article.objects.bulk_create(created, batch_size=BATCH_SIZE)
+                else:
+                    # 后端不能回填主键时逐条插入（信号已暂停，派生数据仍按批次维护）
+                    for article in created:
+                        article.save(force_insert=True)
+
+            updated = [article for _, article in self.updates]
+            if updated:
+                now = timezone.now()
+                for article in updated:
+                    article.updated_at = now
+                Article.objects.bulk_update(updated, sorted(self.update_fields | {'updated_at'}), batch_size=BATCH_SIZE)
+
+            self._write_tags(created + updated)
+            self._refresh_derived(created, updated, delete_ids)
+
+        for index, article in self.creates + self.updates:
+            self.results[index] = {'index': index, 'op': self.operations[index]['op'], 'status': 'success', 'id': article.pk}
+        for index, article in self.deletes:
+            self.results[index] = {'index': index, 'op': 'delete', 'status': 'success', 'id': self.operations[index]['id']}
+
+    def _write_tags(self, articles):
+        """整体替换给出了tags的文章的标签：一条DELETE加一次批量INSERT"""
+        through = Article.tags.through
+        targets = [(article, self.tag_ids[id(article)]) for article in articles if id(article) in self.tag_ids]
+        if not targets:
+            return
+        through.objects.filter(article_id__in=[article.pk for article, _ in targets]).delete()
+        through.objects.bulk_create(
+            [through(article_id=article.pk, tag_id=tag_id) for article, tag_ids in targets for tag_id in tag_ids],
+            batch_size=BATCH_SIZE,
+        )
+
+    def _refresh_derived(self, created, updated, delete_ids):
+        previous_counted = {counted for _, counted in self.previous.values() if counted}
+        current_counted = {article.counted_category_id for article in created + updated if article.counted_category_id}
+        sidebar_changed = any(
+            self.previous.get(article.pk, (None, None))[1] != article.counted_category_id for article in created + updated
+        ) or any(self.previous[pk][1] for pk in delete_ids)
+
+        reindexed = created + [article for article in updated if self.update_fields & SEARCH_FIELDS]
+        if reindexed:
+            index_rows([(article.pk, article.title, article.summary, article.content_html) for article in reindexed])
+
+        category_ids = {category for category, _ in self.previous.values()}
+        category_ids.update(article.category_id for article in created + updated)
+        refresh_derived_state(
+            [article.pk for article in created + updated] + delete_ids,
+            category_ids,
+            previous_counted | current_counted,
+            uncounted_ids=[article.pk for article in updated if article.counted_category_id is None],
+            sidebar_changed=sidebar_changed,
+        )
+
+
+def refresh_derived_state(article_ids, category_ids, counted_categories, uncounted_ids=(), sidebar_changed=False):
+    """批量写入后维护计数器、前后篇、分类树和页面缓存：每批只做一次，查询次数只与涉及的分类数有关
+
+    counted_categories为写入前后计入已发布教程数的子分类，uncounted_ids为不再属于任何链的文章。
+    """
+    if counted_categories:
+        recompute_tutorial_counts(counted_categories)
+        for category_id in counted_categories:
+            relink_category(category_id)
+    if uncounted_ids:
+        unlink_articles(pk__in=uncounted_ids)
+    transaction.on_commit(invalidate_category_tree)
+    transaction.on_commit(invalidate_collection_stats)
+    pages_changed(articles_page_paths(article_ids, category_ids, sidebar_changed))
+
+
+def _skip_remaining(results, message='批次中有校验失败的操作，未执行'):
+    for index, result in enumerate(results):
+        if result is None:
+            results[index] = {'index': index, 'status': 'skipped', 'message': message}
+
+
+def apply_article_operations(operations, content_type=None, atomic=True):
+    """批量执行文章的创建、更新、删除操作，返回(逐项结果, 是否已写入)
+
+    operations中每项为 {"op": "create", "data": {...}}、{"op": "update", "id": 1, "data": {...}}
+    或 {"op": "delete", "id": 1}。data中的category_id为null时清空分类，tags整体替换文章的标签。
+    content_type给出时只能操作该类型的文章。atomic为True时只要有一项校验失败就全部不执行，
+    否则跳过失败的项执行其余操作；写入本身总在一个事务中完成。
+    """
+    batch = _Batch(operations, content_type)
+    if not batch.prepare() and (atomic or len(batch.errors) == len(operations)):
+        _skip_remaining(batch.results)
+        for result in batch.results:
+            # 校验失败的项已带op（可能不是对象），跳过的项都是合法的操作
+            if 'op' not in result:
+                result['op'] = operations[result['index']]['op']
+        return batch.results, False
+    batch.apply()
+    return batch.results, True
+
+
+def _publish_errors(row):
+    """与Article.clean相同的发布前提（空白的判断同样用str.strip()），基于查询取出的列判断"""
+    errors = []
+    if not (row['title'] or '').strip():
+        errors.append('发布时文章标题不能为空')
+    if row['category_id'] is None:
+        errors.append('发布时必须选择文章分类')
+    if not (row['summary'] or '').strip():
+        errors.append('发布时文章摘要不能为空')
+    if row['content_blank']:
+        errors.append('发布时文章内容不能为空')
+    return errors
+
+
+def _publish_rows(articles):
+    """发布校验需要的列；正文只取开头一段，开头全是空白的长正文（极少见）再单独读出全文"""
+    rows = {
+        row['pk']: row for row in articles.annotate(
+            content_head=Substr(Coalesce('content_html', Value('')), 1, CONTENT_HEAD_LENGTH),
+            content_length=Length(Coalesce('content_html', Value(''))),
+        ).values('pk', 'title', 'summary', 'category_id', 'content_type', 'is_published',
+                 'content_head', 'content_length')
+    }
+    for row in rows.values():
+        row['content_blank'] = not row.pop('content_head').strip()
+    suspects = [pk for pk, row in rows.items() if row['content_blank'] and row['content_length'] > CONTENT_HEAD_LENGTH]
+    for pk, content in Article.objects.filter(pk__in=suspects).values_list('pk', 'content_html'):
+        rows[pk]['content_blank'] = not content.strip()
+    return rows
+
+
+def set_published(article_ids, is_published, content_type=None, atomic=True):
+    """批量发布或取消发布，返回(逐项结果, 是否已写入)
+
+    发布前提用一次查询校验（正文只读出开头一段），状态有变化的行用一条UPDATE写入，
+    计数器、前后篇和缓存按批次维护一次。atomic为True时只要有一篇不满足发布条件就全部不执行。
+    """
+    article_ids = list(dict.fromkeys(article_ids))
+    articles = Article.objects.filter(pk__in=article_ids)
+    if content_type:
+        articles = articles.filter(content_type=content_type)
+    rows = _publish_rows(articles)
+
+    results = [None] * len(article_ids)
+    changed = []
+    for index, pk in enumerate(article_ids):
+        row = rows.get(pk)
+        errors = [f'文章 {pk} 不存在'] if row is None else (_publish_errors(row) if is_published else [])
+        if errors:
+            results[index] = {'index': index, 'id': pk, 'status': 'error', 'message': '; '.join(errors)}
+        elif row['is_published'] != is_published:
+            changed.append(row)
+
+    if any(results) and (atomic or all(results)):
+        _skip_remaining(results)
+        for result in results:
+            result.setdefault('id', article_ids[result['index']])
+        return results, False
+
+    if changed:
+        with transaction.atomic():
+            Article.objects.filter(pk__in=[row['pk'] for row in changed]).update(
+                is_published=is_published, updated_at=timezone.now())
+            counted = {
+                row['category_id'] for row in changed
+                if row['content_type'] == Article.ContentType.TUTORIAL and row['category_id']
+            }
+            refresh_derived_state(
+                [row['pk'] for row in changed],
+                {row['category_id'] for row in changed},
+                counted,
+                uncounted_ids=[] if is_published else [row['pk'] for row in changed],
+                sidebar_changed=bool(counted),
+            )
+    for index, pk in enumerate(article_ids):
+        if results[index] is None:
+            results[index] = {'index': index, 'id': pk, 'status': 'success'}
+    return results, True
@@ -0,0 +1,88 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+
+from .models import MainCategory, SubCategory
+from .page_cache import state_cache
+
+CATEGORY_TREE_CACHE_KEY = 'pythonfun:category_tree'
+# 导航栏、分类侧栏片段缓存的版本号，分类树变化时递增
+NAVIGATION_VERSION_KEY = 'pythonfun:navigation_version'
+
+
+def _cache_timeout():
+    # 信号只能清理当前进程可见的缓存，超时作为多进程本地缓存下的兜底
+    return getattr(settings, 'PYTHONFUN_CATEGORY_TREE_TIMEOUT', 300)
+
+
+def build_category_tree():
+    """从数据库构建分类树（两条查询，计数取自子分类计数器），返回可直接缓存的纯数据结构"""
+    main_categories = list(
+        MainCategory.objects.filter(is_enabled=True)
+        .order_by('order', 'id')
+        .values('id', 'name', 'slug', 'icon')
+    )
+    sub_categories = (
+        SubCategory.objects.filter(is_enabled=True)
+        .order_by('id')
+        .values('id', 'parent_id', 'name', 'slug', 'icon', article_count=F('published_tutorial_count'))
+    )
+    subs_by_parent = {}
+    for sub in sub_categories:
+        subs_by_parent.setdefault(sub['parent_id'], []).append(sub)
+    return [{
+        'main_category': main,
+        'sub_categories': subs_by_parent.get(main['id'], []),
+    } for main in main_categories]
+
+
+def get_category_tree():
+    """获取分类树快照，缓存未命中时重建"""
+    tree = cache.get(CATEGORY_TREE_CACHE_KEY)
+    if tree is None:
+        tree = build_category_tree()
+        cache.set(CATEGORY_TREE_CACHE_KEY, tree, _cache_timeout())
+    return tree
+
+
+def build_admin_category_tree():
+    """后台选择器和分类管理使用的完整分类树：包含未启用的分类，两条查询"""
+    main_categories = list(
+        MainCategory.objects.order_by('order', 'id')
+        .values('id', 'name', 'slug', 'order', 'icon', 'is_enabled', article_count=F('published_tutorial_count'))
+    )
+    sub_categories = (
+        SubCategory.objects.order_by('id')
+        .values('id', 'parent_id', 'name', 'slug', 'icon', 'is_enabled', article_count=F('published_tutorial_count'))
+    )
+    subs_by_parent = {}
+    for sub in sub_categories:
+        subs_by_parent.setdefault(sub['parent_id'], []).append(sub)
+    return [{**main, 'sub_categories': subs_by_parent.get(main['id'], [])} for main in main_categories]
+
+
+def navigation_version():
+    """当前的导航片段版本号
+
+    版本号丢失时以当前时间重新起算，不会与仍在缓存中的旧片段的版本号重合。
+    """
+    state = state_cache()
+    version = state.get(NAVIGATION_VERSION_KEY)
+    if version is None:
+        version = time.time_ns() // 1000
+        if not state.add(NAVIGATION_VERSION_KEY, version, None):
+            version = state.get(NAVIGATION_VERSION_KEY, version)
+    return version
+
+
+def invalidate_category_tree():
+    """使分类树缓存失效，并换一个新的导航片段版本号
+
+    文件缓存的incr不是跨进程的原子操作，两个worker同时递增会得到同一个版本号；
+    改为写入不小于当前时间（微秒）的新值，并发修改时各自写入的都是此前未用过的版本号。
+    """
+    cache.delete(CATEGORY_TREE_CACHE_KEY)
+    state = state_cache()
+    state.set(NAVIGATION_VERSION_KEY, max(time.time_ns() // 1000, state.get(NAVIGATION_VERSION_KEY, 0) + 1), None)
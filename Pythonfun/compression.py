@@ -0,0 +1,128 @@
+import gzip
+import secrets
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# 小于这个长度的响应压缩后反而可能变大
+MIN_LENGTH = 200
+COMPRESSIBLE_TYPES = ('text/', 'application/json', 'application/javascript', 'application/xml', 'image/svg+xml')
+
+# 压缩级别（见 benchmark_compression 命令的测量结果）：
+# 缓存页面每次变化只压缩一次，用最高级别换最小体积；其余响应每个请求都要压缩，用中等级别
+CACHED_LEVELS = {'br': 11, 'gzip': 9}
+DYNAMIC_LEVELS = {'br': 5, 'gzip': 6}
+# 与Django的GZipMiddleware相同：gzip头部文件名字段的随机长度上限（缓解BREACH）
+MAX_RANDOM_BYTES = 100
+
+
+def available_encodings():
+    """本机可用的编码，按优先顺序排列"""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def compress(content, encoding, level):
+    if encoding == 'br':
+        return brotli.compress(content, quality=level)
+    # mtime固定为0，相同内容得到相同字节
+    return gzip.compress(content, compresslevel=level, mtime=0)
+
+
+def compress_padded(content, level):
+    """gzip压缩并在头部加入随机长度的文件名（同django.utils.text.compress_string），压缩后的长度不再只取决于内容"""
+    compressed = gzip.compress(content, compresslevel=level, mtime=0)
+    header = bytearray(compressed[:10])
+    header[3] = gzip.FNAME
+    filename = secrets.token_bytes(secrets.randbelow(MAX_RANDOM_BYTES) + 1).replace(b'\x00', b'')
+    return bytes(header) + filename + b'\x00' + compressed[10:]
+
+
+def _levels(name, default):
+    return {**default, **getattr(settings, name, {})}
+
+
+def compress_variants(content):
+    """按缓存页面的压缩级别生成各个编码的内容 {编码: 字节}，供页面缓存一并保存"""
+    if len(content) < MIN_LENGTH:
+        return {}
+    levels = _levels('PYTHONFUN_CACHED_COMPRESSION_LEVELS', CACHED_LEVELS)
+    return {encoding: compress(content, encoding, levels[encoding]) for encoding in available_encodings()}
+
+
+def negotiate_encoding(request, encodings=None):
+    """根据Accept-Encoding从encodings（默认为本机可用的编码）中选择，客户端都不接受时返回None"""
+    accepted = {}
+    for part in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        coding, _, params = part.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if coding:
+            accepted[coding.strip().lower()] = quality
+    for encoding in encodings or available_encodings():
+        if accepted.get(encoding, accepted.get('*', 0.0)) > 0:
+            return encoding
+    return None
+
+
+def _compressible(response):
+    content_type = response.get('Content-Type', '').lower()
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def _is_html(response):
+    return response.get('Content-Type', '').lower().startswith('text/html')
+
+
+class CompressionMiddleware:
+    """按Accept-Encoding用brotli或gzip压缩响应
+
+    页面缓存在响应上附带了预先压缩好的内容（response.precompressed）时直接使用，
+    否则按中等级别现场压缩。流式响应和已带Content-Encoding的响应（如WhiteNoise的静态文件）不处理。
+    现场压缩的HTML可能回显查询参数（如搜索结果页），与GZipMiddleware一样只用带随机填充的gzip，
+    brotli没有可以填充的头部字段，不用于这类响应。缓存的页面不接受查询参数，不需要填充。
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if response.streaming or response.has_header('Content-Encoding') or not _compressible(response):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if len(response.content) < MIN_LENGTH:
+            return response
+        encoding = negotiate_encoding(request)
+        content = getattr(response, 'precompressed', {}).get(encoding)
+        html = _is_html(response)
+        if content is None and html:
+            encoding = negotiate_encoding(request, ('gzip',))
+        if encoding is None:
+            return response
+
+        if content is None:
+            level = _levels('PYTHONFUN_DYNAMIC_COMPRESSION_LEVELS', DYNAMIC_LEVELS)[encoding]
+            if html:
+                content = compress_padded(response.content, level)
+            else:
+                content = compress(response.content, encoding, level)
+            if len(content) >= len(response.content):
+                return response
+        response.content = content
+        response['Content-Length'] = str(len(content))
+        response['Content-Encoding'] = encoding
+        # 与Django的GZipMiddleware相同：压缩后的字节与原内容不同，强ETag改为弱ETag
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        return response
@@ -0,0 +1,138 @@
+import hashlib
+
+from django.db.models import Count, Max
+
+from .category_tree import build_admin_category_tree
+from .models import Article, RelatedArticle
+from .page_cache import request_role
+
+
+def _make_etag(*parts):
+    return hashlib.md5(repr(parts).encode('utf-8')).hexdigest()
+
+
+def _article_state(request, pk, **filters):
+    """每个请求只查一次文章的校验字段（ETag和Last-Modified共用）"""
+    memo = request.__dict__.setdefault('_pythonfun_article_state', {})
+    if pk not in memo:
+        memo[pk] = (
+            Article.objects.filter(pk=pk, **filters)
+            .values_list('updated_at', 'category_id', 'category__name', 'is_published')
+            .first()
+        )
+    return memo[pk]
+
+
+def _sibling_state(request, category_id):
+    """同分类已发布教程的聚合，用于相关教程列表"""
+    memo = request.__dict__.setdefault('_pythonfun_sibling_state', {})
+    if category_id not in memo:
+        memo[category_id] = Article.objects.filter(
+            category_id=category_id,
+            content_type=Article.ContentType.TUTORIAL,
+            is_published=True,
+        ).aggregate(latest=Max('updated_at'), total=Count('pk'))
+    return memo[category_id]
+
+
+def _related_state(request, pk):
+    """相关教程表每次重算都会插入新行，最大行ID即可作为版本"""
+    memo = request.__dict__.setdefault('_pythonfun_related_state', {})
+    if pk not in memo:
+        memo[pk] = RelatedArticle.objects.filter(article_id=pk).aggregate(version=Max('pk'))['version']
+    return memo[pk]
+
+
+# ========== 单篇文章 ==========
+
+def article_etag(request, pk):
+    state = _article_state(request, pk)
+    return _make_etag('article', pk, state) if state else None
+
+
+def article_last_modified(request, pk):
+    state = _article_state(request, pk)
+    return state[0] if state else None
+
+
+def course_etag(request, pk):
+    state = _article_state(request, pk, content_type=Article.ContentType.TUTORIAL)
+    return _make_etag('course', pk, state) if state else None
+
+
+def course_last_modified(request, pk):
+    state = _article_state(request, pk, content_type=Article.ContentType.TUTORIAL)
+    return state[0] if state else None
+
+
+# ========== 教程详情页 ==========
+
+def _tutorial_visible(request, state):
+    return state is not None and (state[3] or request_role(request) == 'staff')
+
+
+def tutorial_etag(request, pk):
+    state = _article_state(request, pk)
+    if not _tutorial_visible(request, state):
+        return None
+    siblings = _sibling_state(request, state[1])
+    return _make_etag('tutorial', pk, request_role(request), state, siblings['latest'], siblings['total'],
+                      _related_state(request, pk))
+
+
+def tutorial_last_modified(request, pk):
+    state = _article_state(request, pk)
+    if not _tutorial_visible(request, state):
+        return None
+    latest = _sibling_state(request, state[1])['latest']
+    return max(state[0], latest) if latest else state[0]
+
+
+# ========== 列表接口 ==========
+
+def _list_state(request, queryset):
+    memo = request.__dict__.setdefault('_pythonfun_list_state', {})
+    key = str(queryset.query)
+    if key not in memo:
+        memo[key] = queryset.order_by().aggregate(latest=Max('updated_at'), total=Count('pk'))
+    return memo[key]
+
+
+def _list_etag(name, queryset):
+    def etag_func(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return None
+        state = _list_state(request, queryset)
+        return _make_etag(name, state['latest'], state['total'])
+    return etag_func
+
+
+def _list_last_modified(queryset):
+    def last_modified_func(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return None
+        return _list_state(request, queryset)['latest']
+    return last_modified_func
+
+
+article_list_etag = _list_etag('articles', Article.objects.all())
+article_list_last_modified = _list_last_modified(Article.objects.all())
+course_list_etag = _list_etag('courses', Article.objects.filter(content_type=Article.ContentType.TUTORIAL))
+course_list_last_modified = _list_last_modified(Article.objects.filter(content_type=Article.ContentType.TUTORIAL))
+
+
+# ========== 分类树接口 ==========
+
+def category_tree_state(request):
+    """每个请求只从数据库构建一次后台分类树，返回(版本, 分类树)，ETag和响应共用
+
+    版本由分类树内容计算，不依赖进程内的缓存或计数器，各worker的结果一致。
+    """
+    if '_pythonfun_category_tree' not in request.__dict__:
+        tree = build_admin_category_tree()
+        request._pythonfun_category_tree = (_make_etag('category-tree', tree), tree)
+    return request._pythonfun_category_tree
+
+
+def category_tree_etag(request):
+    return category_tree_state(request)[0]
@@ -0,0 +1,202 @@
+import hashlib
+import math
+import re
+from dataclasses import dataclass, field
+from html import escape
+from html.parser import HTMLParser
+
+from django.utils.text import slugify
+
+# 编译规则变化时递增，所有文章的编译产物都会被视为过期
+PIPELINE_VERSION = 1
+
+ALLOWED_TAGS = {
+    'a', 'abbr', 'b', 'blockquote', 'br', 'caption', 'code', 'col', 'colgroup', 'dd', 'del', 'div', 'dl', 'dt',
+    'em', 'figcaption', 'figure', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'hr', 'i', 'img', 'ins', 'kbd', 'li', 'mark',
+    'ol', 'p', 'pre', 's', 'samp', 'small', 'span', 'strong', 'sub', 'sup', 'table', 'tbody', 'td', 'tfoot', 'th',
+    'thead', 'tr', 'u', 'ul',
+}
+# 连同内容一起丢弃的标签
+DROPPED_TAGS = {'script', 'style', 'iframe', 'object', 'form', 'button', 'textarea', 'select', 'noscript'}
+# 没有结束标签，只丢弃标签本身，不能计入drop_depth
+DROPPED_VOID_TAGS = {'embed', 'input'}
+VOID_TAGS = {'br', 'col', 'hr', 'img'}
+GLOBAL_ATTRIBUTES = {'class', 'id', 'style', 'title', 'lang', 'dir'}
+TAG_ATTRIBUTES = {
+    'a': {'href', 'target', 'rel', 'name'},
+    'img': {'src', 'alt', 'width', 'height'},
+    'td': {'colspan', 'rowspan'},
+    'th': {'colspan', 'rowspan', 'scope'},
+    'ol': {'start', 'type'},
+    'col': {'span'},
+    'colgroup': {'span'},
+}
+# 省略结束标签时，开始新标签会隐式关闭的标签
+IMPLIED_END_TAGS = {
+    'li': {'li'}, 'p': {'p'}, 'dt': {'dt', 'dd'}, 'dd': {'dt', 'dd'},
+    'tr': {'tr', 'td', 'th'}, 'td': {'td', 'th'}, 'th': {'td', 'th'},
+}
+URL_ATTRIBUTES = {'href', 'src'}
+TOC_HEADINGS = {'h2', 'h3'}
+
+_SAFE_URL_RE = re.compile(r'^(?:https?:|mailto:|#|/|\./|\.\./|[^:/?#]*(?:[/?#]|$))', re.IGNORECASE)
+_DATA_IMAGE_RE = re.compile(r'^data:image/(?:png|gif|jpe?g|webp);base64,', re.IGNORECASE)
+_UNSAFE_STYLE_RE = re.compile(r'expression\s*\(|javascript:|behavior\s*:|@import', re.IGNORECASE)
+_CJK_CHAR_RE = re.compile(r'[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]')
+_WORD_RE = re.compile(r'[A-Za-z0-9_]+')
+
+# 阅读速度：中文按字计，英文/代码按词计
+CJK_CHARS_PER_MINUTE = 300
+WORDS_PER_MINUTE = 200
+
+
+@dataclass
+class CompiledContent:
+    html: str
+    toc: list = field(default_factory=list)
+    word_count: int = 0
+    read_time_minutes: int = 1
+
+
+def content_hash(content_html):
+    """编译产物的版本：正文内容和编译规则版本共同决定"""
+    return hashlib.sha256(f'{PIPELINE_VERSION}:{content_html or ""}'.encode('utf-8')).hexdigest()
+
+
+def _safe_attribute(tag, name, value):
+    if name.startswith('on') or (name not in GLOBAL_ATTRIBUTES and name not in TAG_ATTRIBUTES.get(tag, ())):
+        return False
+    value = (value or '').strip()
+    if name in URL_ATTRIBUTES:
+        compact = re.sub(r'[\s\x00-\x1f]', '', value)
+        return bool(_SAFE_URL_RE.match(compact)) or (tag == 'img' and bool(_DATA_IMAGE_RE.match(compact)))
+    if name == 'style':
+        return not _UNSAFE_STYLE_RE.search(value)
+    return True
+
+
+class _Compiler(HTMLParser):
+    """白名单过滤HTML，同时给标题加锚点、给图片加懒加载并统计正文文字"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.out = []
+        self.stack = []
+        self.drop_depth = 0
+        self.heading = None
+        self.toc = []
+        self.used_ids = set()
+        self.text = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in DROPPED_VOID_TAGS:
+            return
+        if tag in DROPPED_TAGS:
+            self.drop_depth += 1
+            return
+        if self.drop_depth or tag not in ALLOWED_TAGS:
+            return
+        while self.stack and self.stack[-1] in IMPLIED_END_TAGS.get(tag, ()):
+            self._close(self.stack.pop())
+        attrs = [(name, value) for name, value in attrs if _safe_attribute(tag, name, value)]
+        names = {name for name, _ in attrs}
+        if tag == 'img':
+            if 'loading' not in names:
+                attrs.append(('loading', 'lazy'))
+            attrs.append(('decoding', 'async'))
+        if tag == 'a' and dict(attrs).get('target') == '_blank':
+            attrs = [(name, value) for name, value in attrs if name != 'rel'] + [('rel', 'noopener noreferrer')]
+        for name, value in attrs:
+            if name == 'id' and value:
+                self.used_ids.add(value)
+        rendered = ''.join(
+            f' {name}' if value is None else f' {name}="{escape(value, quote=True)}"' for name, value in attrs
+        )
+        if tag in TOC_HEADINGS and self.heading is None:
+            # 标题文字读完后才能生成锚点，先占位
+            self.heading = {'tag': tag, 'index': len(self.out), 'attrs': rendered,
+                            'id': dict(attrs).get('id'), 'text': []}
+            self.out.append('')
+        else:
+            self.out.append(f'<{tag}{rendered}>')
+        if tag not in VOID_TAGS:
+            self.stack.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS and self.stack and self.stack[-1] == tag:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag in DROPPED_TAGS:
+            self.drop_depth = max(0, self.drop_depth - 1)
+            return
+        if self.drop_depth or tag not in self.stack:
+            return
+        while self.stack:
+            open_tag = self.stack.pop()
+            self._close(open_tag)
+            if open_tag == tag:
+                break
+
+    def _close(self, tag):
+        heading = self.heading
+        if heading is not None and heading['tag'] == tag:
+            title = ''.join(heading['text']).strip()
+            if heading['id']:
+                anchor = heading['id']
+                self.out[heading['index']] = f'<{tag}{heading["attrs"]}>'
+            else:
+                anchor = self._unique_id(slugify(title, allow_unicode=True) or 'section')
+                self.out[heading['index']] = f'<{tag} id="{anchor}"{heading["attrs"]}>'
+            if title:
+                self.toc.append({'level': int(tag[1]), 'id': anchor, 'title': title})
+            self.heading = None
+        self.out.append(f'</{tag}>')
+
+    def _unique_id(self, base):
+        anchor, n = base, 2
+        while anchor in self.used_ids:
+            anchor = f'{base}-{n}'
+            n += 1
+        self.used_ids.add(anchor)
+        return anchor
+
+    def handle_data(self, data):
+        if self.drop_depth:
+            return
+        if self.heading is not None:
+            self.heading['text'].append(data)
+        self.text.append(data)
+        self.out.append(escape(data, quote=False))
+
+    def close(self):
+        super().close()
+        while self.stack:
+            self._close(self.stack.pop())
+
+
+def compile_content(content_html):
+    """把编辑器保存的HTML编译为可直接输出的HTML及目录、字数、阅读时间"""
+    compiler = _Compiler()
+    compiler.feed(content_html or '')
+    compiler.close()
+    text = ' '.join(compiler.text)
+    cjk_chars = len(_CJK_CHAR_RE.findall(text))
+    words = len(_WORD_RE.findall(text))
+    minutes = cjk_chars / CJK_CHARS_PER_MINUTE + words / WORDS_PER_MINUTE
+    return CompiledContent(
+        html=''.join(compiler.out),
+        toc=compiler.toc,
+        word_count=cjk_chars + words,
+        read_time_minutes=max(1, math.ceil(minutes)),
+    )
+
+
+def compile_batch(items):
+    """编译一批(主键, 正文)，供进程池调用"""
+    results = []
+    for pk, content_html in items:
+        compiled = compile_content(content_html)
+        results.append((pk, content_hash(content_html), compiled))
+    return results
@@ -0,0 +1,62 @@
+from django.db.models import Count, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+from .models import MainCategory, SubCategory, Article
+
+
+def shift_tutorial_count(category_id, delta):
+    """调整子分类及其主分类的已发布教程数"""
+    if not category_id or not delta:
+        return
+    SubCategory.objects.filter(pk=category_id).update(
+        published_tutorial_count=F('published_tutorial_count') + delta
+    )
+    MainCategory.objects.filter(subcategories__pk=category_id).update(
+        published_tutorial_count=F('published_tutorial_count') + delta
+    )
+
+
+def move_tutorial_count(old_category_id, new_category_id):
+    """文章计数归属从旧分类移到新分类"""
+    if old_category_id == new_category_id:
+        return
+    shift_tutorial_count(old_category_id, -1)
+    shift_tutorial_count(new_category_id, 1)
+
+
+def recompute_tutorial_counts(sub_category_ids=None):
+    """按文章表批量重算分类计数器，返回(子分类数, 主分类数)
+
+    给出sub_category_ids时只重算这些子分类及其主分类。
+    """
+    article_counts = (
+        Article.objects.filter(
+            category=OuterRef('pk'),
+            content_type=Article.ContentType.TUTORIAL,
+            is_published=True,
+        )
+        .order_by()
+        .values('category')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    sub_categories = SubCategory.objects.all()
+    main_categories = MainCategory.objects.all()
+    if sub_category_ids is not None:
+        sub_categories = sub_categories.filter(pk__in=sub_category_ids)
+        main_categories = main_categories.filter(
+            pk__in=SubCategory.objects.filter(pk__in=sub_category_ids).values('parent_id'))
+    sub_updated = sub_categories.update(
+        published_tutorial_count=Coalesce(Subquery(article_counts), Value(0))
+    )
+    sub_totals = (
+        SubCategory.objects.filter(parent=OuterRef('pk'))
+        .order_by()
+        .values('parent')
+        .annotate(total=Sum('published_tutorial_count'))
+        .values('total')
+    )
+    main_updated = main_categories.update(
+        published_tutorial_count=Coalesce(Subquery(sub_totals), Value(0))
+    )
+    return sub_updated, main_updated
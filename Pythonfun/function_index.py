@@ -0,0 +1,291 @@
+import bisect
+import functools
+import threading
+import time
+from array import array
+
+from django.conf import settings
+from django.db.models import Count, Max, Sum
+from django.utils import timezone
+
+from .models import FunctionEntry, FunctionModuleState
+
+# 描述只取首行参与子串匹配，避免整段文档常驻内存
+DESCRIPTION_PREFIX_LENGTH = 200
+# 翻页时同一查询会重复执行，缓存最近的查询结果
+SEARCH_CACHE_SIZE = 128
+
+
+def _prefix_range(keys, prefix):
+    """有序数组中以prefix开头的区间"""
+    start = bisect.bisect_left(keys, prefix)
+    end = bisect.bisect_left(keys, prefix + '\U0010ffff', start)
+    return start, end
+
+
+class FunctionIndex:
+    """函数目录的内存索引：有序数组做前缀匹配，拼接字符串做子串匹配
+
+    匹配结果按 函数名相同 > 函数名前缀 > 完整名称前缀 > 完整名称子串 > 描述子串 排列，
+    同一档内按完整名称排序。
+    """
+
+    def __init__(self, rows, version=None):
+        # rows: (主键, 完整名称, 函数名称, 描述)，按完整名称排序
+        rows = sorted(rows, key=lambda row: row[1].lower())
+        self.version = version
+        self.ids = [row[0] for row in rows]
+
+        names = sorted((row[2].lower(), position) for position, row in enumerate(rows))
+        self.name_keys = [name for name, _ in names]
+        self.name_positions = [position for _, position in names]
+        self.qualified_keys = [row[1].lower() for row in rows]
+
+        self.qualified_blob, self.qualified_starts = self._blob(self.qualified_keys)
+        self.description_blob, self.description_starts = self._blob(
+            (row[3] or '').split('\n', 1)[0][:DESCRIPTION_PREFIX_LENGTH].lower() for row in rows
+        )
+        self._cached_search = functools.lru_cache(maxsize=SEARCH_CACHE_SIZE)(self._search)
+
+    @staticmethod
+    def _blob(texts):
+        """把文本用换行拼成一个字符串，并记录每段的起始偏移"""
+        starts = []
+        offset = 0
+        parts = []
+        for text in texts:
+            text = text.replace('\n', ' ')
+            starts.append(offset)
+            parts.append(text)
+            offset += len(text) + 1
+        return '\n'.join(parts), starts
+
+    @staticmethod
+    def _substring_positions(blob, starts, term):
+        positions = []
+        found = blob.find(term)
+        while found != -1:
+            position = bisect.bisect_right(starts, found) - 1
+            positions.append(position)
+            # 同一条目只记一次，直接跳到下一条目
+            next_start = starts[position + 1] if position + 1 < len(starts) else len(blob)
+            found = blob.find(term, next_start)
+        return positions
+
+    def __len__(self):
+        return len(self.ids)
+
+    def search(self, query):
+        """返回按相关度排列的函数主键"""
+        return self._cached_search(query.strip().lower().replace('\n', ' '))
+
+    def _search(self, term):
+        if not term:
+            return tuple(self.ids)
+
+        start, end = _prefix_range(self.name_keys, term)
+        exact = sorted(position for key, position in zip(self.name_keys[start:end], self.name_positions[start:end])
+                       if key == term)
+        name_prefix = sorted(self.name_positions[start:end])
+        qualified_start, qualified_end = _prefix_range(self.qualified_keys, term)
+        tiers = [
+            exact,
+            name_prefix,
+            range(qualified_start, qualified_end),
+            self._substring_positions(self.qualified_blob, self.qualified_starts, term),
+            self._substring_positions(self.description_blob, self.description_starts, term),
+        ]
+
+        seen = set()
+        result = []
+        for tier in tiers:
+            for position in tier:
+                if position not in seen:
+                    seen.add(position)
+                    result.append(self.ids[position])
+        return tuple(result)
+
+
+class FunctionSuggestIndex:
+    """按完整名称前缀补全的紧凑索引
+
+    键为小写的完整名称及其各级后缀（os.path.join、path.join、join），排序后拼接成一个bytes，
+    偏移和所属函数存在array中。Python对象的个数与函数数量无关，preload_app时fork出的工作进程
+    共享这些内存页，不会因为引用计数的写入而各自复制一份。
+    """
+
+    def __init__(self, names, version=None):
+        self.version = version
+        names = sorted(set(names), key=lambda name: (name.lower(), name))
+        self.names, self.name_offsets = self._pack(name.encode('utf-8') for name in names)
+
+        full_keys = []
+        suffix_keys = []
+        for owner, name in enumerate(names):
+            full_keys.append((name.lower().encode('utf-8'), owner))
+            parts = name.lower().split('.')
+            for depth in range(1, len(parts)):
+                suffix_keys.append(('.'.join(parts[depth:]).encode('utf-8'), owner))
+        self.full = self._pack_keys(full_keys)
+        self.suffix = self._pack_keys(suffix_keys)
+
+    @staticmethod
+    def _pack(values):
+        blob = bytearray()
+        offsets = array('I', [0])
+        for value in values:
+            blob += value
+            offsets.append(len(blob))
+        return bytes(blob), offsets
+
+    def _pack_keys(self, keys):
+        keys.sort()
+        blob, offsets = self._pack(key for key, _ in keys)
+        return blob, offsets, array('I', (owner for _, owner in keys))
+
+    def __len__(self):
+        return len(self.name_offsets) - 1
+
+    def _name(self, owner):
+        return self.names[self.name_offsets[owner]:self.name_offsets[owner + 1]].decode('utf-8')
+
+    @staticmethod
+    def _range(keys, prefix):
+        blob, offsets, _ = keys
+
+        def key(i):
+            return blob[offsets[i]:offsets[i + 1]]
+
+        positions = range(len(offsets) - 1)
+        start = bisect.bisect_left(positions, prefix, key=key)
+        # 0xff不会出现在UTF-8编码中，大于所有以prefix开头的键
+        end = bisect.bisect_left(positions, prefix + b'\xff', lo=start, key=key)
+        return start, end
+
+    def suggest(self, prefix, limit=10):
+        """完整名称以prefix开头的排在前面，其次是某一级后缀以prefix开头的"""
+        prefix = prefix.strip().lower().encode('utf-8')
+        if not prefix:
+            return []
+        seen = set()
+        result = []
+        for keys in (self.full, self.suffix):
+            start, end = self._range(keys, prefix)
+            owners = keys[2]
+            for i in range(start, end):
+                owner = owners[i]
+                if owner not in seen:
+                    seen.add(owner)
+                    result.append(self._name(owner))
+                    if len(result) >= limit:
+                        return result
+        return result
+
+
+class _SharedIndex:
+    """进程内共享的索引
+
+    只在函数目录版本变化后重建（版本取自数据库，各进程看到的一致）；新索引建好后整体替换引用，
+    重建期间其他线程继续使用旧索引。
+    """
+
+    def __init__(self, build):
+        self._build = build
+        self._index = None
+        self._lock = threading.Lock()
+        self._checked_at = 0.0
+
+    def _current_version(self, index):
+        """索引过期时返回新的版本，否则返回None"""
+        now = time.monotonic()
+        # 每个请求都查询版本会拖慢补全，限制检查频率
+        if now - self._checked_at < getattr(settings, 'PYTHONFUN_FUNCTION_INDEX_CHECK_INTERVAL', 5):
+            return None
+        self._checked_at = now
+        version = function_index_version()
+        return version if version != index.version else None
+
+    def get(self):
+        index = self._index
+        if index is None:
+            with self._lock:
+                if self._index is None:
+                    # 先取版本再读数据，读取期间的修改会在下次检查时触发重建
+                    self._index = self._build(function_index_version())
+                return self._index
+        version = self._current_version(index)
+        if version is not None and self._lock.acquire(blocking=False):
+            try:
+                self._index = self._build(version)
+            finally:
+                self._lock.release()
+        return self._index
+
+    def expire(self):
+        """下次取用时立即检查版本号"""
+        self._checked_at = 0.0
+
+
+def _build_search_index(version):
+    rows = FunctionEntry.objects.values_list('pk', 'qualified_name', 'name', 'description').iterator(chunk_size=5000)
+    return FunctionIndex(rows, version=version)
+
+
+def _build_suggest_index(version):
+    names = FunctionEntry.objects.values_list('qualified_name', flat=True).iterator(chunk_size=5000)
+    return FunctionSuggestIndex(names, version=version)
+
+
+_search_index = _SharedIndex(_build_search_index)
+_suggest_index = _SharedIndex(_build_suggest_index)
+
+
+def get_function_index():
+    """当前进程的函数检索索引"""
+    return _search_index.get()
+
+
+def get_suggest_index():
+    """当前进程的函数名补全索引"""
+    return _suggest_index.get()
+
+
+def warm_function_indexes():
+    """预先建好索引；preload_app时在主进程调用，fork后各工作进程共享"""
+    get_function_index()
+    get_suggest_index()
+
+
+def function_index_version():
+    """函数目录的版本：各模块采集状态的最后更新时间、模块数和函数数"""
+    state = FunctionModuleState.objects.aggregate(
+        latest=Max('updated_at'), modules=Count('pk'), functions=Sum('function_count'))
+    return state['latest'], state['modules'], state['functions']
+
+
+def touch_function_modules(modules):
+    """采集之外修改了函数目录（如后台编辑）时刷新所属模块的采集状态，使版本随之变化"""
+    modules = set(modules)
+    FunctionModuleState.objects.filter(module__in=modules).update(updated_at=timezone.now())
+    existing = set(FunctionModuleState.objects.filter(module__in=modules).values_list('module', flat=True))
+    # 没有采集状态的模块补一条空指纹的记录，下次采集该模块时会被覆盖
+    FunctionModuleState.objects.bulk_create(
+        [FunctionModuleState(module=module, fingerprint='') for module in modules - existing],
+        ignore_conflicts=True,
+    )
+
+
+def invalidate_function_index():
+    """让当前进程下次查询时立即检查版本；其他进程按检查间隔发现版本变化后重建"""
+    _search_index.expire()
+    _suggest_index.expire()
+
+
+def search_functions(query, page=1, page_size=20):
+    """检索函数并分页，返回总数和当前页的函数（含参数）"""
+    ids = get_function_index().search(query)
+    start = (page - 1) * page_size
+    page_ids = ids[start:start + page_size]
+    entries = FunctionEntry.objects.filter(pk__in=page_ids).prefetch_related('parameters')
+    by_id = {entry.pk: entry for entry in entries}
+    return len(ids), [by_id[pk] for pk in page_ids if pk in by_id]
@@ -0,0 +1,204 @@
+import ast
+import hashlib
+import importlib
+import importlib.metadata
+import importlib.util
+import inspect
+import os
+import sys
+import textwrap
+from functools import lru_cache
+
+# 提取规则变化时递增，所有模块都会被视为过期
+INGEST_VERSION = 2
+SOURCE_MAX_LINES = 60
+DOC_MAX_LENGTH = 4000
+DEFAULT_MAX_LENGTH = 200
+
+# 导入时有副作用（打开浏览器、弹窗、打印）或只用于测试/开发工具的标准库模块
+EXCLUDED_MODULES = {
+    'antigravity', 'this', 'idlelib', 'tkinter', 'turtle', 'turtledemo', 'test', 'lib2to3',
+    'ensurepip', 'pydoc_data', 'venv', '__main__', '__future__', '__hello__', '__phello__',
+}
+
+# 实际实现在其他模块、但通常按这个名字使用的模块
+EXTRA_MODULES = ('os.path',)
+
+PARAMETER_KINDS = {
+    inspect.Parameter.POSITIONAL_ONLY: '仅位置参数',
+    inspect.Parameter.POSITIONAL_OR_KEYWORD: '普通参数',
+    inspect.Parameter.VAR_POSITIONAL: '可变参数',
+    inspect.Parameter.KEYWORD_ONLY: '仅关键字参数',
+    inspect.Parameter.VAR_KEYWORD: '可变关键字参数',
+}
+
+
+def default_module_names():
+    """默认采集的模块：公开的标准库顶层模块"""
+    return sorted(
+        [name for name in sys.stdlib_module_names if not name.startswith('_') and name not in EXCLUDED_MODULES]
+        + list(EXTRA_MODULES)
+    )
+
+
+@lru_cache(maxsize=None)
+def _distribution_versions():
+    versions = {}
+    for top_level, distributions in importlib.metadata.packages_distributions().items():
+        versions[top_level] = ','.join(
+            f'{name}=={importlib.metadata.version(name)}' for name in sorted(set(distributions))
+        )
+    return versions
+
+
+def module_fingerprint(module_name):
+    """模块的版本指纹：安装包版本、模块文件的修改时间和大小；找不到模块时返回None"""
+    try:
+        spec = importlib.util.find_spec(module_name)
+    except (ImportError, ValueError):
+        return None
+    if spec is None:
+        return None
+    origin = spec.origin or ''
+    parts = [str(INGEST_VERSION), module_name, origin, _distribution_versions().get(module_name.split('.')[0], '')]
+    if os.path.isfile(origin):
+        stat = os.stat(origin)
+        parts += [str(stat.st_mtime_ns), str(stat.st_size)]
+    else:
+        # 内置模块随解释器版本变化
+        parts.append(sys.version)
+    return hashlib.sha256('\x00'.join(parts).encode('utf-8')).hexdigest()
+
+
+def _format_annotation(annotation):
+    if annotation is inspect.Parameter.empty:
+        return ''
+    return inspect.formatannotation(annotation)
+
+
+def _source_locations(module):
+    """一次解析模块源码，返回源码行和各个类、函数的定义位置 {限定名: (起始行, 结束行)}
+
+    inspect.getsource 每取一个类都要重新解析整个文件，类多的模块会慢上百倍。
+    """
+    try:
+        source = inspect.getsource(module)
+    except (OSError, TypeError):
+        return [], {}
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return [], {}
+    locations = {}
+    containers = (ast.If, ast.Try, getattr(ast, 'TryStar', ast.Try), ast.With, ast.ExceptHandler)
+
+    def visit(node, prefix):
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
+                name = prefix + child.name
+                start = min([decorator.lineno for decorator in child.decorator_list] + [child.lineno])
+                locations.setdefault(name, (start, child.end_lineno))
+                if isinstance(child, ast.ClassDef):
+                    visit(child, f'{name}.')
+            elif isinstance(child, containers):
+                # 条件定义（if/try中的def）
+                visit(child, prefix)
+
+    visit(tree, '')
+    return source.splitlines(), locations
+
+
+def _source(sources, qualname, name, signature, function_type):
+    lines, locations = sources
+    location = locations.get(qualname)
+    if location:
+        start, end = location
+        snippet = lines[start - 1:end]
+        if len(snippet) > SOURCE_MAX_LINES:
+            snippet = snippet[:SOURCE_MAX_LINES] + ['    ...']
+        return textwrap.dedent('\n'.join(snippet))
+    keyword = 'class' if function_type == 'class' else 'def'
+    return f'{keyword} {name}{signature if signature is not None else "(...)"}: ...'
+
+
+def _entry(sources, qualname, qualified_name, name, module_name, obj, function_type, bound=False):
+    """单个函数/类/方法的记录；bound为True时去掉第一个参数（self）"""
+    try:
+        signature = inspect.signature(obj)
+    except (TypeError, ValueError):
+        signature = None
+    parameters = list(signature.parameters.values()) if signature is not None else []
+    if bound and parameters and parameters[0].kind in (
+            inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD):
+        parameters = parameters[1:]
+        signature = signature.replace(parameters=parameters)
+
+    parameter_rows = []
+    for parameter in parameters:
+        has_default = parameter.default is not inspect.Parameter.empty
+        parameter_rows.append({
+            'name': parameter.name,
+            'type': _format_annotation(parameter.annotation),
+            'kind': PARAMETER_KINDS[parameter.kind],
+            'has_default': has_default,
+            'default': repr(parameter.default)[:DEFAULT_MAX_LENGTH] if has_default else '',
+            'is_required': not has_default and parameter.kind not in (
+                inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD),
+            # 文档字符串没有统一的参数说明格式，留给后台补充
+            'description': '',
+        })
+    return {
+        'qualified_name': qualified_name,
+        'name': name,
+        'module': module_name,
+        'function_type': function_type,
+        'description': (inspect.getdoc(obj) or '')[:DOC_MAX_LENGTH],
+        'source': _source(sources, qualname, name, signature, function_type),
+        'returns': _format_annotation(signature.return_annotation) if signature is not None else '',
+        'parameters': parameter_rows,
+    }
+
+
+def extract_module(module, module_name=None):
+    """提取模块公开的函数、类及类的公开方法
+
+    只收录在模块中定义或列在 __all__ 中的对象，不含模块顺带导入的其他对象。
+    module_name 是调用方使用的模块名，例如 os.path 实际是 posixpath 模块。
+    """
+    module_name = module_name or module.__name__
+    exported = set(getattr(module, '__all__', ()))
+
+    def public(name, obj):
+        return getattr(obj, '__module__', None) == module.__name__ or name in exported
+
+    prefix = '' if module_name == 'builtins' else f'{module_name}.'
+    sources = _source_locations(module)
+    entries = []
+    for name, obj in sorted(vars(module).items()):
+        if name.startswith('_') or not public(name, obj):
+            continue
+        if inspect.isroutine(obj):
+            entries.append(_entry(sources, name, prefix + name, name, module_name, obj, 'function'))
+        elif inspect.isclass(obj):
+            entries.append(_entry(sources, name, prefix + name, name, module_name, obj, 'class'))
+            for method_name, raw in sorted(vars(obj).items()):
+                if method_name.startswith('_'):
+                    continue
+                if isinstance(raw, (staticmethod, classmethod)):
+                    method, bound = getattr(obj, method_name), False
+                elif inspect.isroutine(raw):
+                    method, bound = raw, True
+                else:
+                    continue
+                entries.append(_entry(sources, f'{name}.{method_name}', f'{prefix}{name}.{method_name}', method_name,
+                                      module_name, method, 'method', bound))
+    return entries
+
+
+def inspect_module(module_name):
+    """在进程池中导入并提取一个模块，返回(模块名, 记录列表, 错误信息)"""
+    try:
+        module = importlib.import_module(module_name)
+        return module_name, extract_module(module, module_name), None
+    except (Exception, SystemExit) as exc:
+        return module_name, [], f'{type(exc).__name__}: {exc}'
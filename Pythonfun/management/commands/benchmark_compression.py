@@ -0,0 +1,51 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from Pythonfun.compression import available_encodings, compress
+from Pythonfun.static_export import collect_pages, render_path
+
+LEVELS = {'gzip': (1, 4, 6, 9), 'br': (1, 4, 5, 6, 9, 11)}
+
+
+class Command(BaseCommand):
+    help = '在实际渲染的前台页面上对比brotli/gzip各压缩级别的压缩率和耗时'
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*', help='要测试的页面路径，默认全部可导出的前台页面')
+        parser.add_argument('--pages', type=int, default=20, help='未指定路径时最多测试的页面数')
+        parser.add_argument('--repeat', type=int, default=5, help='每个级别重复压缩的次数')
+
+    def handle(self, *args, **options):
+        paths = options['paths'] or list(collect_pages())[:options['pages']]
+        contents = []
+        for path in paths:
+            try:
+                contents.append(render_path(path))
+            except Exception as exc:
+                self.stderr.write(f'渲染 {path} 失败：{exc}')
+        if not contents:
+            raise CommandError('没有可测试的页面')
+        original = sum(map(len, contents))
+        self.stdout.write(f'{len(contents)} 个页面，原始大小合计 {original / 1024:.1f} KB')
+
+        for encoding in available_encodings():
+            for level in LEVELS[encoding]:
+                timings = []
+                compressed = 0
+                for content in contents:
+                    samples = []
+                    for _ in range(options['repeat']):
+                        t0 = time.perf_counter()
+                        result = compress(content, encoding, level)
+                        samples.append((time.perf_counter() - t0) * 1000)
+                    timings.append(statistics.median(samples))
+                    compressed += len(result)
+                self.stdout.write(
+                    f'{encoding:>4} 级别 {level:>2}: 压缩后 {compressed / 1024:.1f} KB '
+                    f'({compressed / original:.1%})  每页 平均 {statistics.mean(timings):.2f}ms  '
+                    f'最大 {max(timings):.2f}ms'
+                )
+        if 'br' not in available_encodings():
+            self.stdout.write(self.style.WARNING('未安装brotli，只测试了gzip'))
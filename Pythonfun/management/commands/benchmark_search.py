@@ -0,0 +1,94 @@
+import itertools
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from Pythonfun.models import Article
+from Pythonfun.search import index_rows, like_search, search_articles
+
+# 常用汉字，用于合成符合齐夫分布的中文词表
+CJK_CHARS = (
+    '的一是在不了有和人这中大为上个国我以要他时来用们生到作地于出就分对成会可主发年动同工也能下过子说产种面而方后多定'
+    '行学法所民得经十三之进着等部度家电力里如水化高自二理起小物现实加量都两体制机当使点从业本去把性好应开它合还因由其些'
+    '然前外天政四日那社义事平形相全表间样与关各重新线内数正心反你明看原又么利比或但质气第向道命此变条只没结解问意建月公'
+    '无系军很情者最立代想已通并提直题党程展五果料象员革位入常文总次品式活设及管特件长求老头基资边流路级少图山统接知较将'
+)
+CODE_WORDS = [
+    'list', 'dict', 'tuple', 'set', 'str', 'def', 'return', 'for', 'while', 'if', 'try', 'except', 'import',
+    'class', 'self', 'yield', 'async', 'await', 'lambda', 'os.path.join', 'json.dumps', 're.compile',
+    'open', 'print', 'range', 'enumerate', 'zip', 'sorted', 'requests.get', 'sqlite3.connect',
+]
+
+
+class _Corpus:
+    """按齐夫分布抽词的合成语料"""
+
+    def __init__(self, rng, vocabulary_size=5000):
+        self.rng = rng
+        self.words = list(dict.fromkeys(
+            ''.join(rng.choice(CJK_CHARS) for _ in range(rng.choice((2, 2, 3)))) for _ in range(vocabulary_size)
+        )) + CODE_WORDS
+        rng.shuffle(self.words)
+        self.cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(self.words))))
+
+    def sentence(self, length):
+        words = self.rng.choices(self.words, cum_weights=self.cum_weights, k=length)
+        return ''.join(word if word not in CODE_WORDS else f' {word} ' for word in words).strip()
+
+    def query(self):
+        # 查询词多为中低频词
+        return self.rng.choice(self.words[10:])
+
+
+class Command(BaseCommand):
+    help = '在合成语料上对比倒排索引检索与LIKE扫描的延迟（事务结束后回滚，不保留数据）'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--articles', type=int, default=100000, help='合成文章数')
+        parser.add_argument('--queries', type=int, default=50, help='查询次数')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        corpus = _Corpus(random.Random(options['seed']))
+        with transaction.atomic():
+            self._run(corpus, options['articles'], options['queries'])
+            transaction.set_rollback(True)
+
+    def _run(self, corpus, n_articles, n_queries):
+        started = time.perf_counter()
+        batch_size = 2000
+        for offset in range(0, n_articles, batch_size):
+            articles = Article.objects.bulk_create([
+                Article(
+                    title=corpus.sentence(4),
+                    summary=corpus.sentence(12),
+                    content_html=''.join(f'<p>{corpus.sentence(20)}</p>' for _ in range(5)),
+                    is_published=True,
+                )
+                for _ in range(min(batch_size, n_articles - offset))
+            ])
+            # 部分数据库后端bulk_create不回填主键，按主键倒序取回刚插入的行
+            if articles[0].pk is None:
+                articles = Article.objects.order_by('-pk')[:len(articles)]
+            index_rows([(a.pk, a.title, a.summary, a.content_html) for a in articles])
+        self.stdout.write(f'生成并索引 {n_articles} 篇文章用时 {time.perf_counter() - started:.1f}s')
+
+        queries = [corpus.query() for _ in range(n_queries)]
+        for name, func in (
+            ('倒排索引+BM25', lambda q: search_articles(q, 1, 10)),
+            ('LIKE扫描', lambda q: like_search(q, 1, 10)),
+        ):
+            timings = []
+            for query in queries:
+                t0 = time.perf_counter()
+                func(query)
+                timings.append((time.perf_counter() - t0) * 1000)
+            timings.sort()
+            self.stdout.write(
+                f'{name}: 平均 {statistics.mean(timings):.2f}ms  '
+                f'中位数 {statistics.median(timings):.2f}ms  '
+                f'P95 {timings[int(len(timings) * 0.95) - 1]:.2f}ms'
+            )
@@ -0,0 +1,115 @@
+import datetime
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.http import HttpResponse, JsonResponse as DjangoJsonResponse
+from django.utils import timezone
+
+from Pythonfun.models import Article, SubCategory, Tag
+from Pythonfun.serializers import ARTICLE_SCHEMA, COURSE_FIELDS, JsonResponse, orjson, stdlib_dumps
+
+# 教程列表读取的列（原实现defer正文，select_related分类）
+COLUMNS = [
+    'id', 'title', 'subtitle', 'summary', 'content_type', 'read_time_minutes', 'code_language',
+    'category_id', 'is_published', 'created_at', 'updated_at',
+]
+VALUE_COLUMNS = ['pk', 'id', 'title', 'subtitle', 'summary', 'read_time_minutes', 'is_published',
+                 'created_at', 'updated_at', 'category__name']
+
+
+def _legacy_course_data(course):
+    """改为声明式模式之前course_api逐行构造字典的写法"""
+    return {
+        'id': course.id,
+        'title': course.title,
+        'subtitle': course.subtitle,
+        'summary': course.summary,
+        'read_time_minutes': course.read_time_minutes,
+        'is_published': course.is_published,
+        'created_at': course.created_at.isoformat(),
+        'updated_at': course.updated_at.isoformat(),
+        'category_name': course.category.name if course.category else None,
+        'tags': [tag.name for tag in course.tags.all()]
+    }
+
+
+def _synthetic_rows(count):
+    """模拟数据库返回的行：(模型列元组, values()列元组, 分类, 标签名列表)"""
+    now = timezone.now()
+    rows = []
+    for i in range(count):
+        created = now - datetime.timedelta(minutes=i, microseconds=i)
+        category = (i % 40, f'子分类{i % 40}') if i % 10 else (None, None)
+        tags = [f'标签{j}' for j in range(i % 4)]
+        summary = f'第{i}篇教程的摘要，介绍Python中的常用写法。' * 3
+        model_row = (i, f'教程标题 {i}', f'副标题 {i}', summary, Article.ContentType.TUTORIAL, 5, 'python',
+                     category[0], bool(i % 3), created, now)
+        value_row = (i, i, f'教程标题 {i}', f'副标题 {i}', summary, 5, bool(i % 3), created, now, category[1])
+        rows.append((model_row, value_row, category, tags))
+    return rows
+
+
+def _legacy(rows):
+    """原实现：构造模型实例（含select_related的分类和预取的标签），逐行调用isoformat，标准库编码"""
+    courses = []
+    for model_row, _, category, tags in rows:
+        course = Article.from_db('default', COLUMNS, model_row)
+        course._state.fields_cache['category'] = (
+            SubCategory(id=category[0], name=category[1]) if category[0] is not None else None
+        )
+        prefetched = Tag.objects.none()
+        prefetched._result_cache = [Tag(name=name) for name in tags]
+        course._prefetched_objects_cache = {'tags': prefetched}
+        courses.append(course)
+    return DjangoJsonResponse({'items': [_legacy_course_data(course) for course in courses]}).content
+
+
+def _schema_rows(rows):
+    values = [dict(zip(VALUE_COLUMNS, value_row)) for _, value_row, _, _ in rows]
+    related = {'tags': {value_row[0]: tags for _, value_row, _, tags in rows if tags}}
+    return ARTICLE_SCHEMA.build(values, COURSE_FIELDS, related)
+
+
+def _schema_stdlib(rows):
+    return HttpResponse(stdlib_dumps({'items': _schema_rows(rows)}), content_type='application/json').content
+
+
+def _schema_fast(rows):
+    return JsonResponse({'items': _schema_rows(rows)}).content
+
+
+class Command(BaseCommand):
+    help = '对比教程列表接口原有序列化方式与声明式模式+快速编码器的吞吐量（不含SQL执行时间）'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='10,1000,50000', help='每个响应的行数，逗号分隔')
+        parser.add_argument('--repeat', type=int, default=5, help='每种实现重复的次数')
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options['sizes'].split(',') if size.strip()]
+        candidates = [('原实现', _legacy), ('模式+标准库', _schema_stdlib)]
+        if orjson is not None:
+            candidates.append(('模式+orjson', _schema_fast))
+        else:
+            self.stdout.write(self.style.WARNING('未安装orjson，只测试标准库编码'))
+
+        for size in sizes:
+            rows = _synthetic_rows(size)
+            if len({json.dumps(json.loads(func(rows)), sort_keys=True) for _, func in candidates}) != 1:
+                raise CommandError('各实现的输出不一致')
+            baseline = None
+            for name, func in candidates:
+                samples = []
+                for _ in range(options['repeat']):
+                    t0 = time.perf_counter()
+                    content = func(rows)
+                    samples.append(time.perf_counter() - t0)
+                median = statistics.median(samples)
+                if baseline is None:
+                    baseline = median
+                self.stdout.write(
+                    f'{size:>6} 行 {name:<8}: {median * 1000:9.2f}ms  {size / median:>10,.0f} 行/秒  '
+                    f'{len(content) / 1024:8.1f} KB  x{baseline / median:.1f}'
+                )
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from Pythonfun.related import build_related_articles
+from Pythonfun.static_export import regenerate_for_command
+
+
+class Command(BaseCommand):
+    help = '按TF-IDF相似度计算已发布文章的相关教程（默认只重算文本有变化的文章）'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top-k', type=int, default=5, help='每篇文章保留的相关教程数')
+        parser.add_argument('--full', action='store_true', help='重新计算全部文章')
+
+    def handle(self, *args, **options):
+        stats = build_related_articles(top_k=options['top_k'], full=options['full'])
+        self.stdout.write(self.style.SUCCESS(
+            f"已发布文章 {stats['articles']} 篇：重新计算 {stats['rescored']}，移除 {stats['removed']}"
+        ))
+        if stats['paths']:
+            regenerate_for_command(self, stats['paths'])
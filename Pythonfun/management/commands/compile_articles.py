@@ -0,0 +1,68 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from Pythonfun.content_pipeline import compile_batch, content_hash
+from Pythonfun.models import Article
+from Pythonfun.page_cache import purge_pages
+from Pythonfun.page_dependencies import sidebar_page_paths, tutorial_page_path
+from Pythonfun.static_export import regenerate_for_command
+
+
+class Command(BaseCommand):
+    help = '重新编译正文或编译规则版本有变化的文章（多进程并行）'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='重新编译全部文章')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='编译进程数')
+        parser.add_argument('--batch-size', type=int, default=200, help='每批编译和写回的文章数')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        batches = []
+        batch = []
+        rows = Article.objects.order_by('pk').values_list('pk', 'content_html', 'compiled_hash')
+        for pk, content_html, compiled_hash in rows.iterator(chunk_size=batch_size):
+            if options['force'] or compiled_hash != content_hash(content_html):
+                batch.append((pk, content_html))
+                if len(batch) >= batch_size:
+                    batches.append(batch)
+                    batch = []
+        if batch:
+            batches.append(batch)
+        if not batches:
+            self.stdout.write(self.style.SUCCESS('所有文章的编译产物都是最新的'))
+            return
+
+        compiled_ids = []
+        with ProcessPoolExecutor(max_workers=max(1, options['workers'])) as pool:
+            for results in pool.map(compile_batch, batches):
+                compiled_ids += self._write(results)
+
+        # 首页和分类页直接展示文章正文，一并清理
+        paths = sidebar_page_paths() + [tutorial_page_path(pk) for pk in compiled_ids]
+        paths = [path for path in paths if path]
+        purge_pages(paths)
+        self.stdout.write(self.style.SUCCESS(f'已重新编译 {len(compiled_ids)} 篇文章'))
+        regenerate_for_command(self, paths)
+
+    def _write(self, results):
+        now = timezone.now()
+        articles = []
+        for pk, digest, compiled in results:
+            articles.append(Article(
+                pk=pk,
+                compiled_html=compiled.html,
+                toc=compiled.toc,
+                word_count=compiled.word_count,
+                read_time_minutes=compiled.read_time_minutes,
+                compiled_hash=digest,
+                # 输出内容变了，刷新更新时间使ETag失效
+                updated_at=now,
+            ))
+        with transaction.atomic():
+            Article.objects.bulk_update(articles, list(Article.compiled_fields) + ['updated_at'])
+        return [article.pk for article in articles]
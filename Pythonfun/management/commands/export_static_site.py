@@ -0,0 +1,28 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from Pythonfun import static_export
+
+
+class Command(BaseCommand):
+    help = '把首页、子分类页、已发布教程和导航栏页面预渲染为静态HTML（增量导出）'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default=None, help='输出目录，默认为 PYTHONFUN_STATIC_EXPORT_DIR 或 BASE_DIR/static_site')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='渲染进程数')
+        parser.add_argument('--force', action='store_true', help='忽略导出清单，重新生成所有页面')
+
+    def handle(self, *args, **options):
+        output_dir = options['output'] or static_export.default_output_dir()
+        result = static_export.regenerate(output_dir, workers=options['workers'], force=options['force'])
+
+        for path, error in result.failed.items():
+            self.stderr.write(f'导出失败 {path}: {error}')
+        unchanged = result.total - len(result.rendered) - len(result.failed)
+        self.stdout.write(self.style.SUCCESS(
+            f'共 {result.total} 个页面：重新生成 {len(result.rendered)}，'
+            f'未变化 {unchanged}，删除 {len(result.removed)}，失败 {len(result.failed)}'
+        ))
+        if result.failed:
+            raise CommandError(f'{len(result.failed)} 个页面导出失败')
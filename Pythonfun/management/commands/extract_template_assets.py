@@ -0,0 +1,91 @@
+import re
+import textwrap
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# 只提取不带属性的内联块；带src的外部脚本、json_script等保持原样
+BLOCK_RE = re.compile(r'<(style|script)>(.*?)</\1>', re.S)
+TEMPLATE_SYNTAX_RE = re.compile(r'\{[{%#]')
+LOAD_STATIC = '{% load static %}'
+ASSET_PREFIX = 'pythonfun'
+EXTENSIONS = {'style': 'css', 'script': 'js'}
+
+
+def _asset_name(template_name, tag, index):
+    stem = template_name[:-len('.html')] if template_name.endswith('.html') else template_name
+    suffix = f'-{index}' if index > 1 else ''
+    return f'{ASSET_PREFIX}/{stem}{suffix}.{EXTENSIONS[tag]}'
+
+
+def _reference(tag, name):
+    if tag == 'style':
+        return f'<link rel="stylesheet" href="{{% static \'{name}\' %}}">'
+    return f'<script src="{{% static \'{name}\' %}}"></script>'
+
+
+def extract(source, template_name):
+    """把模板中的内联<style>/<script>块替换为{% static %}引用
+
+    返回(新模板, {静态文件名: 内容}, 跳过的块数)；含模板语法的块需要渲染，保持内联。
+    """
+    assets = {}
+    counters = {'style': 0, 'script': 0}
+    skipped = 0
+
+    def replace(match):
+        nonlocal skipped
+        tag, body = match.group(1), match.group(2)
+        if TEMPLATE_SYNTAX_RE.search(body) or not body.strip():
+            skipped += 1
+            return match.group(0)
+        counters[tag] += 1
+        name = _asset_name(template_name, tag, counters[tag])
+        assets[name] = textwrap.dedent(body).strip('\n') + '\n'
+        return _reference(tag, name)
+
+    result = BLOCK_RE.sub(replace, source)
+    if assets and LOAD_STATIC not in result:
+        # {% extends %}必须是模板中的第一个标签
+        extends = re.match(r'\s*\{% extends .*?%\}\n?', result)
+        position = extends.end() if extends else 0
+        result = f'{result[:position]}{LOAD_STATIC}\n{result[position:]}'
+    return result, assets, skipped
+
+
+class Command(BaseCommand):
+    help = '把模板中的内联CSS/JS提取为静态文件，由collectstatic加上内容哈希后长期缓存'
+
+    def add_arguments(self, parser):
+        parser.add_argument('templates', nargs='*', help='模板名称（相对模板目录），默认全部模板')
+        parser.add_argument('--dry-run', action='store_true', help='只列出会提取的内容，不写文件')
+
+    def handle(self, *args, **options):
+        template_dir = Path(settings.TEMPLATES[0]['DIRS'][0])
+        static_dir = Path(settings.STATICFILES_DIRS[0])
+        if options['templates']:
+            paths = [template_dir / name for name in options['templates']]
+        else:
+            paths = sorted(template_dir.rglob('*.html'))
+
+        for path in paths:
+            if not path.is_file():
+                raise CommandError(f'找不到模板 {path}')
+            template_name = path.relative_to(template_dir).as_posix()
+            source = path.read_text(encoding='utf-8')
+            result, assets, skipped = extract(source, template_name)
+            if skipped:
+                self.stderr.write(f'{template_name}: {skipped} 个块含模板语法，保持内联')
+            if not assets:
+                continue
+            for name, content in assets.items():
+                target = static_dir / name
+                if target.exists() and target.read_text(encoding='utf-8') != content:
+                    raise CommandError(f'{target} 已存在且内容不同')
+                self.stdout.write(f'{template_name} -> {name} ({len(content.encode("utf-8")) / 1024:.1f} KB)')
+                if not options['dry_run']:
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    target.write_text(content, encoding='utf-8')
+            if not options['dry_run']:
+                path.write_text(result, encoding='utf-8')
@@ -0,0 +1,138 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models.constants import OnConflict
+from django.utils import timezone
+
+from Pythonfun.function_index import invalidate_function_index
+from Pythonfun.function_ingest import default_module_names, inspect_module, module_fingerprint
+from Pythonfun.models import FunctionEntry, FunctionModuleState, FunctionParameter
+
+ENTRY_FIELDS = ('name', 'module', 'function_type', 'description', 'source', 'returns')
+PARAMETER_FIELDS = ('name', 'type', 'kind', 'has_default', 'default', 'is_required', 'description')
+
+
+def _clip(model, field_name, value):
+    max_length = model._meta.get_field(field_name).max_length
+    return value[:max_length] if max_length else value
+
+
+def _insert_sql(model, names, unique_fields=(), update_fields=()):
+    """INSERT语句；给出unique_fields时冲突则更新update_fields（由数据库后端生成upsert子句）"""
+    meta = model._meta
+    quote = connection.ops.quote_name
+    columns = [meta.get_field(name).column for name in names]
+    sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+        quote(meta.db_table), ', '.join(map(quote, columns)), ', '.join(['%s'] * len(columns)))
+    if unique_fields:
+        sql += ' ' + connection.ops.on_conflict_suffix_sql(
+            [meta.get_field(name) for name in names],
+            OnConflict.UPDATE,
+            [meta.get_field(name).column for name in update_fields],
+            [meta.get_field(name).column for name in unique_fields],
+        )
+    return sql
+
+
+def _execute_rows(sql, rows, batch_size):
+    """函数和参数都是成千上万行，直接executemany写入，省去逐行构造模型实例的开销"""
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), batch_size):
+            cursor.executemany(sql, rows[start:start + batch_size])
+
+
+class Command(BaseCommand):
+    help = '用inspect采集模块中的函数、参数和文档写入函数目录（多进程并行，按模块增量）'
+
+    def add_arguments(self, parser):
+        parser.add_argument('modules', nargs='*', help='要采集的模块，默认全部公开的标准库模块')
+        parser.add_argument('--force', action='store_true', help='忽略版本指纹，重新采集全部模块')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='采集进程数')
+        parser.add_argument('--batch-size', type=int, default=1000, help='每批写入的记录数')
+
+    def handle(self, *args, **options):
+        stored = dict(FunctionModuleState.objects.values_list('module', 'fingerprint'))
+        fingerprints = {}
+        for module_name in options['modules'] or default_module_names():
+            fingerprint = module_fingerprint(module_name)
+            if fingerprint is None:
+                self.stderr.write(f'找不到模块 {module_name}，已跳过')
+            elif options['force'] or stored.get(module_name) != fingerprint:
+                fingerprints[module_name] = fingerprint
+        if not fingerprints:
+            self.stdout.write(self.style.SUCCESS('所有模块的函数目录都是最新的'))
+            return
+
+        modules = functions = 0
+        pending = {}
+        try:
+            # 模块在子进程中导入，导入的副作用不会影响当前进程
+            with ProcessPoolExecutor(max_workers=max(1, options['workers'])) as pool:
+                for module_name, entries, error in pool.map(inspect_module, fingerprints, chunksize=4):
+                    if error:
+                        self.stderr.write(f'采集模块 {module_name} 失败：{error}')
+                        continue
+                    pending[module_name] = entries
+                    # 攒够一批再写，减少事务和语句数
+                    if sum(map(len, pending.values())) >= options['batch_size']:
+                        functions += self._write(pending, fingerprints, options['batch_size'])
+                        modules += len(pending)
+                        pending = {}
+            if pending:
+                functions += self._write(pending, fingerprints, options['batch_size'])
+                modules += len(pending)
+        finally:
+            if modules:
+                invalidate_function_index()
+        self.stdout.write(self.style.SUCCESS(f'已采集 {modules} 个模块，共 {functions} 个函数'))
+
+    def _write(self, module_entries, fingerprints, batch_size):
+        """用upsert写入一批模块的函数，替换其参数并删除模块中已不存在的函数"""
+        entries = {}
+        counts = {}
+        for module_name, module_entries_list in module_entries.items():
+            module_entries_list = {
+                _clip(FunctionEntry, 'qualified_name', entry['qualified_name']): entry for entry in module_entries_list
+            }
+            counts[module_name] = len(module_entries_list)
+            entries.update(module_entries_list)
+        now = connection.ops.adapt_datetimefield_value(timezone.now())
+        with transaction.atomic():
+            _execute_rows(
+                _insert_sql(FunctionEntry, ('qualified_name',) + ENTRY_FIELDS + ('updated_at',),
+                            unique_fields=['qualified_name'], update_fields=ENTRY_FIELDS + ('updated_at',)),
+                [
+                    (qualified_name, *(_clip(FunctionEntry, field, entry[field]) for field in ENTRY_FIELDS), now)
+                    for qualified_name, entry in entries.items()
+                ],
+                batch_size,
+            )
+            ids = dict(FunctionEntry.objects.filter(module__in=module_entries).values_list('qualified_name', 'pk'))
+            removed = [pk for qualified_name, pk in ids.items() if qualified_name not in entries]
+            for start in range(0, len(removed), batch_size):
+                FunctionEntry.objects.filter(pk__in=removed[start:start + batch_size]).delete()
+
+            FunctionParameter.objects.filter(function__module__in=module_entries).delete()
+            _execute_rows(
+                _insert_sql(FunctionParameter, ('function', 'position') + PARAMETER_FIELDS),
+                [
+                    (ids[qualified_name], position,
+                     *(_clip(FunctionParameter, field, parameter[field]) for field in PARAMETER_FIELDS))
+                    for qualified_name, entry in entries.items()
+                    for position, parameter in enumerate(entry['parameters'])
+                ],
+                batch_size,
+            )
+
+            FunctionModuleState.objects.bulk_create(
+                [
+                    FunctionModuleState(module=module_name, fingerprint=fingerprints[module_name], function_count=count)
+                    for module_name, count in counts.items()
+                ],
+                update_conflicts=True,
+                unique_fields=['module'],
+                update_fields=['fingerprint', 'function_count', 'updated_at'],
+            )
+        return len(entries)
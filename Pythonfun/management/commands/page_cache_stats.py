@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from Pythonfun.page_cache import get_page_cache_stats, reset_page_cache_stats
+
+
+class Command(BaseCommand):
+    help = '查看前台页面缓存的命中统计'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help='输出后清零统计')
+
+    def handle(self, *args, **options):
+        stats = get_page_cache_stats()
+        self.stdout.write(
+            f"命中: {stats['hits']}  未命中: {stats['misses']}  命中率: {stats['hit_ratio']:.2%}"
+        )
+        if options['reset']:
+            reset_page_cache_stats()
+            self.stdout.write(self.style.SUCCESS('统计已清零'))
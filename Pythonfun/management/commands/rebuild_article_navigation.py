@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from Pythonfun.navigation import rebuild_navigation
+
+
+class Command(BaseCommand):
+    help = '重建子分类内已发布教程的前后篇指针'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            updated = rebuild_navigation()
+        self.stdout.write(self.style.SUCCESS(f'已更新 {updated} 篇文章的前后篇指针'))
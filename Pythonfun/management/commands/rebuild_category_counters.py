@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from Pythonfun.category_tree import invalidate_category_tree
+from Pythonfun.counters import recompute_tutorial_counts
+
+
+class Command(BaseCommand):
+    help = '按文章表重算主分类和子分类的已发布教程数'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            sub_updated, main_updated = recompute_tutorial_counts()
+        invalidate_category_tree()
+        self.stdout.write(self.style.SUCCESS(
+            f'已重算 {sub_updated} 个子分类、{main_updated} 个主分类的计数'
+        ))
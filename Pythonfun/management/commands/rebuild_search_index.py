@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from Pythonfun.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = '重建已发布文章的全文索引'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='每批索引的文章数')
+
+    def handle(self, *args, **options):
+        total = rebuild_index(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'已为 {total} 篇文章建立索引'))
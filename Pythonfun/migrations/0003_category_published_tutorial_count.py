@@ -0,0 +1,42 @@
+# Generated by Django 5.0.7 on 2026-10-18 19:46
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def populate_counts(apps, schema_editor):
+    MainCategory = apps.get_model('Pythonfun', 'MainCategory')
+    SubCategory = apps.get_model('Pythonfun', 'SubCategory')
+    Article = apps.get_model('Pythonfun', 'Article')
+    article_counts = (
+        Article.objects.filter(category=OuterRef('pk'), content_type='TU', is_published=True)
+        .order_by().values('category').annotate(total=Count('pk')).values('total')
+    )
+    SubCategory.objects.update(published_tutorial_count=Coalesce(Subquery(article_counts), Value(0)))
+    sub_totals = (
+        SubCategory.objects.filter(parent=OuterRef('pk'))
+        .order_by().values('parent').annotate(total=Sum('published_tutorial_count')).values('total')
+    )
+    MainCategory.objects.update(published_tutorial_count=Coalesce(Subquery(sub_totals), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Pythonfun', '0002_article_is_published'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='maincategory',
+            name='published_tutorial_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='已发布教程数'),
+        ),
+        migrations.AddField(
+            model_name='subcategory',
+            name='published_tutorial_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='已发布教程数'),
+        ),
+        migrations.RunPython(populate_counts, migrations.RunPython.noop),
+    ]
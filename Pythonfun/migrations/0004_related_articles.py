@@ -0,0 +1,41 @@
+# Generated by Django 5.0.7 on 2026-10-18 19:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Pythonfun', '0003_category_published_tutorial_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedArticlesState',
+            fields=[
+                ('article', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to='Pythonfun.article', verbose_name='文章')),
+                ('text_hash', models.CharField(max_length=40, verbose_name='文本指纹')),
+            ],
+            options={
+                'verbose_name': '相关文章计算状态',
+                'verbose_name_plural': '相关文章计算状态',
+            },
+        ),
+        migrations.CreateModel(
+            name='RelatedArticle',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField(verbose_name='排名')),
+                ('score', models.FloatField(verbose_name='相似度')),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_entries', to='Pythonfun.article', verbose_name='文章')),
+                ('related', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='Pythonfun.article', verbose_name='相关文章')),
+            ],
+            options={
+                'verbose_name': '相关文章',
+                'verbose_name_plural': '相关文章',
+                'ordering': ['article', 'rank'],
+                'unique_together': {('article', 'rank')},
+            },
+        ),
+    ]
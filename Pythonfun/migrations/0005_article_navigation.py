@@ -0,0 +1,46 @@
+# Generated by Django 5.0.7 on 2026-10-18 19:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def link_categories(apps, schema_editor):
+    Article = apps.get_model('Pythonfun', 'Article')
+    chains = {}
+    for pk, category_id in (
+        Article.objects.filter(content_type='TU', is_published=True)
+        .exclude(category=None)
+        .order_by('created_at', 'pk')
+        .values_list('pk', 'category_id')
+    ):
+        chains.setdefault(category_id, []).append(pk)
+    changed = []
+    for chain in chains.values():
+        for i, pk in enumerate(chain):
+            changed.append(Article(
+                pk=pk,
+                prev_in_category_id=chain[i - 1] if i > 0 else None,
+                next_in_category_id=chain[i + 1] if i + 1 < len(chain) else None,
+            ))
+    Article.objects.bulk_update(changed, ['prev_in_category', 'next_in_category'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Pythonfun', '0004_related_articles'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='next_in_category',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='Pythonfun.article', verbose_name='下一篇'),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='prev_in_category',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='Pythonfun.article', verbose_name='上一篇'),
+        ),
+        migrations.RunPython(link_categories, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.0.7 on 2026-10-18 19:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Pythonfun', '0005_article_navigation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='compiled_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=64, verbose_name='编译指纹'),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='compiled_html',
+            field=models.TextField(blank=True, default='', editable=False, verbose_name='编译后内容'),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='toc',
+            field=models.JSONField(blank=True, default=list, editable=False, verbose_name='目录'),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='字数'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.0.7 on 2026-10-18 19:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Pythonfun', '0006_article_compiled_content'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('article', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='Pythonfun.article', verbose_name='文章')),
+                ('length', models.PositiveIntegerField(verbose_name='词项数')),
+                ('text_hash', models.CharField(max_length=40, verbose_name='文本指纹')),
+            ],
+            options={
+                'verbose_name': '检索文档',
+                'verbose_name_plural': '检索文档',
+            },
+        ),
+        migrations.CreateModel(
+            name='SearchPosting',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64, verbose_name='词项')),
+                ('tf', models.PositiveIntegerField(verbose_name='词频')),
+                ('doc_length', models.PositiveIntegerField(verbose_name='文档长度')),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='Pythonfun.article', verbose_name='文章')),
+            ],
+            options={
+                'verbose_name': '倒排索引',
+                'verbose_name_plural': '倒排索引',
+                'unique_together': {('term', 'article')},
+            },
+        ),
+    ]
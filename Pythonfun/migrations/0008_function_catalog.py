@@ -0,0 +1,54 @@
+# Generated by Django 5.0.7 on 2026-10-18 20:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Pythonfun', '0007_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FunctionEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('qualified_name', models.CharField(max_length=255, unique=True, verbose_name='完整名称')),
+                ('name', models.CharField(max_length=100, verbose_name='函数名称')),
+                ('module', models.CharField(db_index=True, max_length=150, verbose_name='所属模块')),
+                ('function_type', models.CharField(choices=[('function', '函数'), ('method', '方法'), ('class', '类')], default='function', max_length=10, verbose_name='函数类型')),
+                ('description', models.TextField(blank=True, default='', verbose_name='描述')),
+                ('source', models.TextField(blank=True, default='', verbose_name='源码定义')),
+                ('returns', models.TextField(blank=True, default='', verbose_name='返回值说明')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='更新时间')),
+            ],
+            options={
+                'verbose_name': '函数',
+                'verbose_name_plural': '函数',
+                'ordering': ['qualified_name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='FunctionParameter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveSmallIntegerField(verbose_name='参数位置')),
+                ('name', models.CharField(max_length=100, verbose_name='参数名称')),
+                ('type', models.CharField(blank=True, default='', max_length=200, verbose_name='参数类型')),
+                ('kind', models.CharField(blank=True, default='', max_length=50, verbose_name='结构类型')),
+                ('has_default', models.BooleanField(default=False, verbose_name='是否有默认值')),
+                ('default', models.TextField(blank=True, default='', verbose_name='默认值')),
+                ('is_required', models.BooleanField(default=True, verbose_name='参数是否必填')),
+                ('description', models.TextField(blank=True, default='', verbose_name='描述')),
+                ('function', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='parameters', to='Pythonfun.functionentry', verbose_name='所属函数')),
+            ],
+            options={
+                'verbose_name': '函数参数',
+                'verbose_name_plural': '函数参数',
+                'ordering': ['function', 'position'],
+                'unique_together': {('function', 'position')},
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.0.7 on 2026-10-18 20:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Pythonfun', '0008_function_catalog'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FunctionModuleState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('module', models.CharField(max_length=150, unique=True, verbose_name='模块')),
+                ('fingerprint', models.CharField(max_length=64, verbose_name='版本指纹')),
+                ('function_count', models.PositiveIntegerField(default=0, verbose_name='函数数')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='更新时间')),
+            ],
+            options={
+                'verbose_name': '函数采集状态',
+                'verbose_name_plural': '函数采集状态',
+            },
+        ),
+    ]
@@ -0,0 +1,106 @@
+# Generated by Django 5.0.7 on 2026-10-18 20:14
+
+import json
+from pathlib import Path
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# 原先内联在 templates/front/函数库.html 脚本中的数据
+DATA_FILE = Path(__file__).resolve().parent / 'data' / 'function_library.json'
+
+
+def load_library(apps, schema_editor):
+    Library = apps.get_model('Pythonfun', 'Library')
+    LibraryModule = apps.get_model('Pythonfun', 'LibraryModule')
+    LibraryItem = apps.get_model('Pythonfun', 'LibraryItem')
+    with open(DATA_FILE, encoding='utf-8') as f:
+        libraries = json.load(f)
+    items = []
+    for library_order, data in enumerate(libraries):
+        library = Library.objects.create(key=data['key'], name=data['name'], order=library_order)
+        for module_order, module_data in enumerate(data['modules']):
+            module = LibraryModule.objects.create(
+                library=library, name=module_data['name'], description=module_data['description'], order=module_order)
+            items += [
+                LibraryItem(
+                    module=module,
+                    position=position,
+                    kind=item['kind'],
+                    class_name=item['class_name'],
+                    name=item['name'],
+                    operation=item['operation'],
+                    semantic=item['semantic'],
+                    input_structure=item['input'],
+                    output_structure=item['output'],
+                )
+                for position, item in enumerate(module_data['items'])
+            ]
+    LibraryItem.objects.bulk_create(items, batch_size=500)
+
+
+def unload_library(apps, schema_editor):
+    apps.get_model('Pythonfun', 'Library').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Pythonfun', '0009_function_module_state'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Library',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.SlugField(unique=True, verbose_name='标识')),
+                ('name', models.CharField(max_length=100, verbose_name='库名称')),
+                ('order', models.PositiveIntegerField(default=0, verbose_name='排序权重')),
+            ],
+            options={
+                'verbose_name': '库',
+                'verbose_name_plural': '库',
+                'ordering': ['order', 'id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='LibraryModule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, verbose_name='模块名称')),
+                ('description', models.CharField(blank=True, default='', max_length=200, verbose_name='描述')),
+                ('order', models.PositiveIntegerField(default=0, verbose_name='排序权重')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='更新时间')),
+                ('library', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='modules', to='Pythonfun.library', verbose_name='所属库')),
+            ],
+            options={
+                'verbose_name': '库模块',
+                'verbose_name_plural': '库模块',
+                'ordering': ['library', 'order', 'id'],
+                'unique_together': {('library', 'name')},
+            },
+        ),
+        migrations.CreateModel(
+            name='LibraryItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveIntegerField(verbose_name='排序位置')),
+                ('kind', models.CharField(choices=[('class', '类'), ('function', '函数'), ('method', '方法'), ('attribute', '属性')], max_length=10, verbose_name='类型')),
+                ('class_name', models.CharField(blank=True, default='', help_text='方法和属性所属的类', max_length=200, verbose_name='类名')),
+                ('name', models.CharField(max_length=200, verbose_name='名称')),
+                ('operation', models.CharField(blank=True, default='', max_length=20, verbose_name='操作类型')),
+                ('semantic', models.TextField(blank=True, default='', verbose_name='语义')),
+                ('input_structure', models.CharField(blank=True, default='', max_length=200, verbose_name='输入数据结构')),
+                ('output_structure', models.CharField(blank=True, default='', max_length=200, verbose_name='输出数据结构')),
+                ('module', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='items', to='Pythonfun.librarymodule', verbose_name='所属模块')),
+            ],
+            options={
+                'verbose_name': '库条目',
+                'verbose_name_plural': '库条目',
+                'ordering': ['module', 'position'],
+                'unique_together': {('module', 'position')},
+            },
+        ),
+        migrations.RunPython(load_library, unload_library),
+    ]
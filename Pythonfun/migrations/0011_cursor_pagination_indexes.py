@@ -0,0 +1,21 @@
+# Generated by Django 5.0.7 on 2026-10-18 20:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Pythonfun', '0010_function_library'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['content_type', '-created_at', '-id'], name='article_type_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='maincategory',
+            index=models.Index(fields=['order', 'id'], name='maincategory_order_idx'),
+        ),
+    ]
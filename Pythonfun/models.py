@@ -1,8 +1,10 @@
-from django.db import models
+from django.db import models, transaction
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
 from django.utils.text import slugify
 
+from .content_pipeline import compile_content, content_hash
+
 class Tag(models.Model):
     """文章标签模型"""
     name = models.CharField(_("标签名称"), max_length=50, unique=True)
@@ -15,6 +17,15 @@ class Tag(models.Model):
     def __str__(self):
         return self.name
 
+def _save_without_derived_fields(instance, kwargs):
+    """更新已有记录时跳过派生字段（计数器、前后篇指针等），它们只通过查询集更新维护，避免用内存中的旧值覆盖"""
+    if not instance._state.adding and kwargs.get('update_fields') is None:
+        kwargs['update_fields'] = [
+            field.name for field in instance._meta.concrete_fields
+            if not field.primary_key and field.name not in instance.derived_fields
+        ]
+    return kwargs
+
 class MainCategory(models.Model):
     """主分类模型"""
     name = models.CharField(_("主分类名称"), max_length=100, unique=True)
@@ -23,11 +34,20 @@ class MainCategory(models.Model):
     is_enabled = models.BooleanField(_("是否启用"), default=True)
     icon = models.CharField(_("图标类名"), max_length=50, blank=True, null=True, help_text=_("例如：fas fa-book"))
     description = models.TextField(_("描述"), blank=True, null=True)
+    published_tutorial_count = models.PositiveIntegerField(_("已发布教程数"), default=0, editable=False)
+
+    derived_fields = ('published_tutorial_count',)
 
     class Meta:
         verbose_name = _("主分类")
         verbose_name_plural = verbose_name
         ordering = ['order', 'id']
+        indexes = [
+            models.Index(fields=['order', 'id'], name='maincategory_order_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **_save_without_derived_fields(self, kwargs))
 
     def __str__(self):
         return self.name
@@ -40,6 +60,9 @@ class SubCategory(models.Model):
     is_enabled = models.BooleanField(_("是否启用"), default=True)
     icon = models.CharField(_("图标类名"), max_length=50, blank=True, null=True)
     description = models.TextField(_("描述"), blank=True, null=True)
+    published_tutorial_count = models.PositiveIntegerField(_("已发布教程数"), default=0, editable=False)
+
+    derived_fields = ('published_tutorial_count',)
 
     class Meta:
         verbose_name = _("子分类")
@@ -50,7 +73,9 @@ class SubCategory(models.Model):
     def save(self, *args, **kwargs):
         if not self.slug and self.name:
             self.slug = slugify(self.name, allow_unicode=True)
-        super().save(*args, **kwargs)
+        # 计数器在信号中随保存一起更新，需在同一事务内完成
+        with transaction.atomic():
+            super().save(*args, **_save_without_derived_fields(self, kwargs))
 
     def __str__(self):
         return f"{self.parent.name} -> {self.name}"
@@ -79,10 +104,27 @@ class Article(models.Model):
     created_at = models.DateTimeField(_("创建时间"), auto_now_add=True)
     updated_at = models.DateTimeField(_("更新时间"), auto_now=True)
 
+    # 同一子分类内已发布教程按创建时间排列的前后篇
+    prev_in_category = models.ForeignKey('self', on_delete=models.SET_NULL, null=True, blank=True, editable=False, related_name='+', verbose_name=_("上一篇"))
+    next_in_category = models.ForeignKey('self', on_delete=models.SET_NULL, null=True, blank=True, editable=False, related_name='+', verbose_name=_("下一篇"))
+
+    # 保存时由正文编译生成，前台直接输出
+    compiled_html = models.TextField(_("编译后内容"), blank=True, default='', editable=False)
+    toc = models.JSONField(_("目录"), blank=True, default=list, editable=False)
+    word_count = models.PositiveIntegerField(_("字数"), default=0, editable=False)
+    compiled_hash = models.CharField(_("编译指纹"), max_length=64, blank=True, default='', editable=False)
+
+    derived_fields = ('prev_in_category', 'next_in_category')
+    compiled_fields = ('compiled_html', 'toc', 'word_count', 'read_time_minutes', 'compiled_hash')
+
     class Meta:
         verbose_name = _("文章")
         verbose_name_plural = verbose_name
         ordering = ['-created_at']
+        indexes = [
+            # 教程列表按(created_at, id)键集分页
+            models.Index(fields=['content_type', '-created_at', '-id'], name='article_type_created_idx'),
+        ]
 
     def clean(self):
         """模型验证"""
@@ -97,10 +139,206 @@ class Article(models.Model):
                 raise ValidationError(_('发布时文章内容不能为空'))
             
     def save(self, *args, **kwargs):
-        """保存前的验证"""
+        """保存前的验证和正文编译"""
         if self.is_published:
             self.full_clean()
-        super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'content_html' in update_fields:
+            if self.compile_content() and update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | set(self.compiled_fields)
+        # 计数器在信号中随保存一起更新，需在同一事务内完成
+        with transaction.atomic():
+            super().save(*args, **_save_without_derived_fields(self, kwargs))
+
+    def compile_content(self, force=False):
+        """由正文生成编译产物；正文和编译规则都没变时跳过，返回是否重新编译"""
+        digest = content_hash(self.content_html)
+        if not force and digest == self.compiled_hash:
+            return False
+        compiled = compile_content(self.content_html)
+        self.compiled_html = compiled.html
+        self.toc = compiled.toc
+        self.word_count = compiled.word_count
+        self.read_time_minutes = compiled.read_time_minutes
+        self.compiled_hash = digest
+        return True
+
+    @property
+    def counted_category_id(self):
+        """计入分类已发布教程数的分类ID，不计入时为None"""
+        if self.is_published and self.content_type == self.ContentType.TUTORIAL:
+            return self.category_id
+        return None
+
+    def __str__(self):
+        return self.title
+
+class RelatedArticle(models.Model):
+    """相关文章，由 build_related_articles 命令按TF-IDF相似度离线计算"""
+    article = models.ForeignKey(Article, on_delete=models.CASCADE, related_name='related_entries', verbose_name=_("文章"))
+    related = models.ForeignKey(Article, on_delete=models.CASCADE, related_name='+', verbose_name=_("相关文章"))
+    rank = models.PositiveSmallIntegerField(_("排名"))
+    score = models.FloatField(_("相似度"))
+
+    class Meta:
+        verbose_name = _("相关文章")
+        verbose_name_plural = verbose_name
+        unique_together = ('article', 'rank')
+        ordering = ['article', 'rank']
+
+    def __str__(self):
+        return f"{self.article_id} -> {self.related_id}"
+
+class RelatedArticlesState(models.Model):
+    """相关文章计算时的文本指纹，用于增量计算"""
+    article = models.OneToOneField(Article, on_delete=models.CASCADE, primary_key=True, related_name='+', verbose_name=_("文章"))
+    text_hash = models.CharField(_("文本指纹"), max_length=40)
+
+    class Meta:
+        verbose_name = _("相关文章计算状态")
+        verbose_name_plural = verbose_name
+
+class SearchDocument(models.Model):
+    """已建立全文索引的文章及其文本指纹"""
+    article = models.OneToOneField(Article, on_delete=models.CASCADE, primary_key=True, related_name='search_document', verbose_name=_("文章"))
+    length = models.PositiveIntegerField(_("词项数"))
+    text_hash = models.CharField(_("文本指纹"), max_length=40)
+
+    class Meta:
+        verbose_name = _("检索文档")
+        verbose_name_plural = verbose_name
+
+class SearchPosting(models.Model):
+    """倒排索引：词项在文章中出现的次数"""
+    term = models.CharField(_("词项"), max_length=64)
+    article = models.ForeignKey(Article, on_delete=models.CASCADE, related_name='+', verbose_name=_("文章"))
+    tf = models.PositiveIntegerField(_("词频"))
+    # 冗余文档长度，BM25打分时无需再关联检索文档表
+    doc_length = models.PositiveIntegerField(_("文档长度"))
+
+    class Meta:
+        verbose_name = _("倒排索引")
+        verbose_name_plural = verbose_name
+        unique_together = ('term', 'article')
+
+class FunctionEntry(models.Model):
+    """函数查询页面中的函数（字段对应页面上的 完整名称、函数名称、所属模块 等）"""
+    class FunctionType(models.TextChoices):
+        FUNCTION = 'function', _('函数')
+        METHOD = 'method', _('方法')
+        CLASS = 'class', _('类')
+
+    qualified_name = models.CharField(_("完整名称"), max_length=255, unique=True)
+    name = models.CharField(_("函数名称"), max_length=100)
+    module = models.CharField(_("所属模块"), max_length=150, db_index=True)
+    function_type = models.CharField(_("函数类型"), max_length=10, choices=FunctionType.choices, default=FunctionType.FUNCTION)
+    description = models.TextField(_("描述"), blank=True, default='')
+    source = models.TextField(_("源码定义"), blank=True, default='')
+    returns = models.TextField(_("返回值说明"), blank=True, default='')
+    updated_at = models.DateTimeField(_("更新时间"), auto_now=True)
+
+    class Meta:
+        verbose_name = _("函数")
+        verbose_name_plural = verbose_name
+        ordering = ['qualified_name']
 
     def __str__(self):
-        return self.title
\ No newline at end of file
+        return self.qualified_name
+
+class FunctionParameter(models.Model):
+    """函数参数"""
+    function = models.ForeignKey(FunctionEntry, on_delete=models.CASCADE, related_name='parameters', verbose_name=_("所属函数"))
+    position = models.PositiveSmallIntegerField(_("参数位置"))
+    name = models.CharField(_("参数名称"), max_length=100)
+    type = models.CharField(_("参数类型"), max_length=200, blank=True, default='')
+    kind = models.CharField(_("结构类型"), max_length=50, blank=True, default='')
+    has_default = models.BooleanField(_("是否有默认值"), default=False)
+    default = models.TextField(_("默认值"), blank=True, default='')
+    is_required = models.BooleanField(_("参数是否必填"), default=True)
+    description = models.TextField(_("描述"), blank=True, default='')
+
+    class Meta:
+        verbose_name = _("函数参数")
+        verbose_name_plural = verbose_name
+        unique_together = ('function', 'position')
+        ordering = ['function', 'position']
+
+    def __str__(self):
+        return f"{self.function_id}.{self.name}"
+
+class FunctionModuleState(models.Model):
+    """函数目录按模块采集时的版本指纹，用于增量采集"""
+    module = models.CharField(_("模块"), max_length=150, unique=True)
+    fingerprint = models.CharField(_("版本指纹"), max_length=64)
+    function_count = models.PositiveIntegerField(_("函数数"), default=0)
+    updated_at = models.DateTimeField(_("更新时间"), auto_now=True)
+
+    class Meta:
+        verbose_name = _("函数采集状态")
+        verbose_name_plural = verbose_name
+
+    def __str__(self):
+        return self.module
+
+class Library(models.Model):
+    """函数库页面中的库（Python内置库、Pandas 库等）"""
+    key = models.SlugField(_("标识"), max_length=50, unique=True)
+    name = models.CharField(_("库名称"), max_length=100)
+    order = models.PositiveIntegerField(_("排序权重"), default=0)
+
+    class Meta:
+        verbose_name = _("库")
+        verbose_name_plural = verbose_name
+        ordering = ['order', 'id']
+
+    def __str__(self):
+        return self.name
+
+class LibraryModule(models.Model):
+    """函数库页面中的模块，页面按模块分节加载"""
+    library = models.ForeignKey(Library, on_delete=models.CASCADE, related_name='modules', verbose_name=_("所属库"))
+    name = models.CharField(_("模块名称"), max_length=100)
+    description = models.CharField(_("描述"), max_length=200, blank=True, default='')
+    order = models.PositiveIntegerField(_("排序权重"), default=0)
+    updated_at = models.DateTimeField(_("更新时间"), auto_now=True)
+
+    class Meta:
+        verbose_name = _("库模块")
+        verbose_name_plural = verbose_name
+        unique_together = ('library', 'name')
+        ordering = ['library', 'order', 'id']
+
+    @property
+    def version(self):
+        """内容版本，作为分节数据URL的一部分，内容变化后URL随之变化"""
+        return format(int(self.updated_at.timestamp() * 1000), 'x')
+
+    def __str__(self):
+        return f"{self.library.name} -> {self.name}"
+
+class LibraryItem(models.Model):
+    """模块中的类、函数、方法或属性，对应函数库表格中的一行"""
+    class Kind(models.TextChoices):
+        CLASS = 'class', _('类')
+        FUNCTION = 'function', _('函数')
+        METHOD = 'method', _('方法')
+        ATTRIBUTE = 'attribute', _('属性')
+
+    module = models.ForeignKey(LibraryModule, on_delete=models.CASCADE, related_name='items', verbose_name=_("所属模块"))
+    position = models.PositiveIntegerField(_("排序位置"))
+    kind = models.CharField(_("类型"), max_length=10, choices=Kind.choices)
+    class_name = models.CharField(_("类名"), max_length=200, blank=True, default='', help_text=_("方法和属性所属的类"))
+    name = models.CharField(_("名称"), max_length=200)
+    operation = models.CharField(_("操作类型"), max_length=20, blank=True, default='')
+    semantic = models.TextField(_("语义"), blank=True, default='')
+    input_structure = models.CharField(_("输入数据结构"), max_length=200, blank=True, default='')
+    output_structure = models.CharField(_("输出数据结构"), max_length=200, blank=True, default='')
+
+    class Meta:
+        verbose_name = _("库条目")
+        verbose_name_plural = verbose_name
+        unique_together = ('module', 'position')
+        ordering = ['module', 'position']
+
+    def __str__(self):
+        return self.name
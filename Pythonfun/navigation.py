@@ -0,0 +1,46 @@
+from .models import Article
+
+
+def relink_category(category_id):
+    """重新串联子分类内已发布教程的前后篇指针，只更新有变化的行"""
+    if not category_id:
+        return 0
+    chain = list(
+        Article.objects.filter(
+            category_id=category_id,
+            content_type=Article.ContentType.TUTORIAL,
+            is_published=True,
+        )
+        .order_by('created_at', 'pk')
+        .values_list('pk', 'prev_in_category_id', 'next_in_category_id')
+    )
+    changed = []
+    for i, (pk, prev_id, next_id) in enumerate(chain):
+        want_prev = chain[i - 1][0] if i > 0 else None
+        want_next = chain[i + 1][0] if i + 1 < len(chain) else None
+        if (prev_id, next_id) != (want_prev, want_next):
+            changed.append(Article(pk=pk, prev_in_category_id=want_prev, next_in_category_id=want_next))
+    Article.objects.bulk_update(changed, ['prev_in_category', 'next_in_category'], batch_size=500)
+    return len(changed)
+
+
+def unlink_articles(**filters):
+    """清空不在任何链中的文章的前后篇指针"""
+    return Article.objects.filter(**filters).exclude(
+        prev_in_category=None, next_in_category=None
+    ).update(prev_in_category=None, next_in_category=None)
+
+
+def rebuild_navigation():
+    """重建所有子分类的前后篇指针，返回更新的行数"""
+    updated = unlink_articles(is_published=False)
+    updated += unlink_articles(category=None)
+    updated += unlink_articles(content_type__in=[
+        choice for choice in Article.ContentType.values if choice != Article.ContentType.TUTORIAL
+    ])
+    category_ids = Article.objects.filter(
+        content_type=Article.ContentType.TUTORIAL, is_published=True
+    ).exclude(category=None).values_list('category_id', flat=True).distinct()
+    for category_id in list(category_ids):
+        updated += relink_category(category_id)
+    return updated
@@ -0,0 +1,114 @@
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.encoding import iri_to_uri
+
+from .compression import compress_variants
+
+PAGE_CACHE_PREFIX = 'pythonfun:page'
+PAGE_CACHE_ROLES = ('anon', 'staff')
+PAGE_CACHE_STATS_KEYS = {
+    'hit': 'pythonfun:page_stats:hit',
+    'miss': 'pythonfun:page_stats:miss',
+}
+# 存放版本号、统计等少量状态的缓存别名，未配置时使用默认缓存
+STATE_CACHE_ALIAS = 'pythonfun_state'
+
+
+def state_cache():
+    """不随页面缓存条目一起被淘汰的状态缓存"""
+    return caches[STATE_CACHE_ALIAS] if STATE_CACHE_ALIAS in settings.CACHES else cache
+
+
+def _cache_timeout():
+    return getattr(settings, 'PYTHONFUN_PAGE_CACHE_TIMEOUT', 600)
+
+
+def _compression_enabled():
+    return 'Pythonfun.compression.CompressionMiddleware' in settings.MIDDLEWARE
+
+
+def request_role(request):
+    """按访问者身份区分缓存：管理员能看到未发布教程"""
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated and user.is_staff:
+        return 'staff'
+    return 'anon'
+
+
+def page_cache_key(path, role):
+    # 统一成URI形式，使request.path与reverse()的结果对应同一个键
+    digest = hashlib.md5(iri_to_uri(path).encode('utf-8')).hexdigest()
+    return f'{PAGE_CACHE_PREFIX}:{role}:{digest}'
+
+
+def _record(outcome):
+    key = PAGE_CACHE_STATS_KEYS[outcome]
+    stats = state_cache()
+    try:
+        stats.incr(key)
+    except ValueError:
+        stats.add(key, 0, None)
+        stats.incr(key)
+
+
+def get_page_cache_stats():
+    """返回页面缓存命中统计
+
+    文件缓存的incr是先读后写，不是跨进程的原子操作，多个worker同时计数时会少计，统计值是近似值。
+    """
+    stats = state_cache()
+    hits = stats.get(PAGE_CACHE_STATS_KEYS['hit'], 0)
+    misses = stats.get(PAGE_CACHE_STATS_KEYS['miss'], 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': hits / total if total else 0.0,
+    }
+
+
+def reset_page_cache_stats():
+    state_cache().delete_many(PAGE_CACHE_STATS_KEYS.values())
+
+
+def cache_front_page(view_func):
+    """前台页面整页缓存，按路径和访问者身份分别缓存"""
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD') or request.GET:
+            return view_func(request, *args, **kwargs)
+        key = page_cache_key(request.path, request_role(request))
+        entry = cache.get(key)
+        if entry is not None:
+            _record('hit')
+            response = HttpResponse(entry['content'], content_type=entry['content_type'])
+            response.precompressed = entry.get('encoded', {})
+            response['X-Page-Cache'] = 'HIT'
+        else:
+            _record('miss')
+            response = view_func(request, *args, **kwargs)
+            if response.status_code == 200 and not response.streaming and not response.cookies:
+                # 压缩结果随页面一起缓存，每个页面每次变化只压缩一次
+                encoded = compress_variants(response.content) if _compression_enabled() else {}
+                cache.set(key, {
+                    'content': response.content,
+                    'content_type': response['Content-Type'],
+                    'encoded': encoded,
+                }, _cache_timeout())
+                response.precompressed = encoded
+            response['X-Page-Cache'] = 'MISS'
+        patch_vary_headers(response, ['Cookie'])
+        return response
+    return wrapper
+
+
+def purge_pages(paths):
+    """按路径清理所有身份下的页面缓存"""
+    keys = [page_cache_key(path, role) for path in set(paths) for role in PAGE_CACHE_ROLES]
+    if keys:
+        cache.delete_many(keys)
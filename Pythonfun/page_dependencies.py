@@ -0,0 +1,69 @@
+# 页面依赖关系：文章、子分类、主分类变化时受影响的前台页面路径，
+# 页面缓存清理和静态页面增量重建共用
+from django.urls import NoReverseMatch, reverse
+
+from .models import SubCategory, Article, RelatedArticle
+
+
+def _reverse(name, *args):
+    try:
+        return reverse(f'Pythonfun:{name}', args=args)
+    except NoReverseMatch:
+        # 前台路由未挂载时不会产生缓存，也无需清理
+        return None
+
+
+def index_page_path():
+    return _reverse('index')
+
+
+def category_page_path(slug):
+    return _reverse('category', slug) if slug else None
+
+
+def tutorial_page_path(pk):
+    return _reverse('tutorial_detail', pk)
+
+
+def function_library_page_path():
+    return _reverse('function_library')
+
+
+def sidebar_page_paths():
+    """所有渲染分类侧栏的页面：首页和全部子分类页"""
+    slugs = SubCategory.objects.exclude(slug='').values_list('slug', flat=True)
+    return [index_page_path()] + [category_page_path(slug) for slug in slugs]
+
+
+def article_page_paths(article_id, category_ids, sidebar_changed=False):
+    """文章变化影响的页面：文章本身、所在分类页、同分类教程和把它列为相关教程的教程、首页
+
+    sidebar_changed表示分类的已发布教程数有变化，此时所有侧栏页面都受影响。
+    """
+    return articles_page_paths([article_id], category_ids, sidebar_changed)
+
+
+def articles_page_paths(article_ids, category_ids, sidebar_changed=False):
+    """一批文章变化影响的页面，查询次数与文章数无关"""
+    category_ids = [pk for pk in category_ids if pk]
+    article_ids = list(article_ids)
+    paths = [index_page_path()] + [tutorial_page_path(pk) for pk in article_ids]
+    # 相关教程可以跨分类
+    referrer_ids = RelatedArticle.objects.filter(related_id__in=article_ids).values_list('article_id', flat=True)
+    paths += [tutorial_page_path(pk) for pk in referrer_ids]
+    if sidebar_changed:
+        paths += sidebar_page_paths()
+    if category_ids:
+        slugs = SubCategory.objects.filter(pk__in=category_ids).values_list('slug', flat=True)
+        paths += [category_page_path(slug) for slug in slugs]
+        sibling_ids = Article.objects.filter(category_id__in=category_ids).values_list('pk', flat=True)
+        paths += [tutorial_page_path(pk) for pk in sibling_ids]
+    return list(dict.fromkeys(path for path in paths if path))
+
+
+def category_page_paths(sub_category_ids, old_slugs=()):
+    """分类变化影响的页面：所有侧栏页面、旧别名的分类页和该分类下的教程"""
+    paths = sidebar_page_paths() + [category_page_path(slug) for slug in old_slugs]
+    article_ids = Article.objects.filter(category_id__in=sub_category_ids).values_list('pk', flat=True)
+    paths += [tutorial_page_path(pk) for pk in article_ids]
+    return [path for path in paths if path]
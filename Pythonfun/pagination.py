@@ -0,0 +1,90 @@
+import base64
+import binascii
+import json
+
+from django.db.models import Q
+
+# 游标模式每页最多返回的条数
+MAX_PAGE_SIZE = 100
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def _sort_fields(ordering):
+    return [(name.lstrip('-'), name.startswith('-')) for name in ordering]
+
+
+def encode_cursor(values, backwards=False):
+    """把排序字段的值编码为不透明的游标"""
+    payload = json.dumps({'v': values, 'b': backwards}, default=str, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, model, ordering):
+    """解析游标，返回(排序字段的值, 是否向前翻页)；游标无效时抛出InvalidCursor"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        values, backwards = payload['v'], bool(payload['b'])
+    except (binascii.Error, ValueError, TypeError, KeyError) as exc:
+        raise InvalidCursor('无效的游标') from exc
+    fields = _sort_fields(ordering)
+    if not isinstance(values, list) or len(values) != len(fields):
+        raise InvalidCursor('无效的游标')
+    try:
+        values = [model._meta.get_field(name).to_python(value) for (name, _), value in zip(fields, values)]
+    except Exception as exc:
+        raise InvalidCursor('无效的游标') from exc
+    return values, backwards
+
+
+def _after(fields, values, backwards):
+    """排在给定位置之后（backwards为True时为之前）的行：(a, b) > (x, y) 展开为 a > x OR (a = x AND b > y)"""
+    condition = Q()
+    for depth, (name, descending) in enumerate(fields):
+        greater = descending == backwards
+        step = Q(**{f'{name}__{"gt" if greater else "lt"}': values[depth]})
+        for index, (previous, _) in enumerate(fields[:depth]):
+            step &= Q(**{previous: values[index]})
+        condition |= step
+    return condition
+
+
+def cursor_paginate(queryset, ordering, cursor=None, page_size=10, with_total=False):
+    """按排序字段做键集分页，不使用OFFSET，任意深度的翻页开销相同
+
+    ordering的最后一个字段必须唯一（通常是id）。返回
+    {'items': 当前页的行, 'next_cursor': ..., 'prev_cursor': ..., 'total_items': 仅with_total时计算}。
+    """
+    fields = _sort_fields(ordering)
+    total = queryset.order_by().count() if with_total else None
+    backwards = False
+    if cursor:
+        values, backwards = decode_cursor(cursor, queryset.model, ordering)
+        queryset = queryset.filter(_after(fields, values, backwards))
+    if backwards:
+        queryset = queryset.order_by(*[name if descending else f'-{name}' for name, descending in fields])
+    else:
+        queryset = queryset.order_by(*ordering)
+
+    rows = list(queryset[:page_size + 1])
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if backwards:
+        rows.reverse()
+
+    def position(row):
+        return [row[name] if isinstance(row, dict) else getattr(row, name) for name, _ in fields]
+
+    # 向后翻页时，有更多行意味着还有下一页；从游标位置开始时必然有上一页，反之亦然
+    has_next = has_more if not backwards else bool(cursor)
+    has_prev = has_more if backwards else bool(cursor)
+    page = {
+        'items': rows,
+        'next_cursor': encode_cursor(position(rows[-1])) if rows and has_next else None,
+        'prev_cursor': encode_cursor(position(rows[0]), backwards=True) if rows and has_prev else None,
+    }
+    if with_total:
+        page['total_items'] = total
+    return page
@@ -0,0 +1,158 @@
+import hashlib
+import math
+from collections import Counter
+
+import numpy as np
+from django.db import transaction
+
+from .models import Article, RelatedArticle, RelatedArticlesState
+from .page_cache import purge_pages
+from .page_dependencies import tutorial_page_path
+from .tokenizer import html_to_text, tokenize
+
+
+class TfidfIndex:
+    """稀疏TF-IDF矩阵，同时保存按行(CSR)和按列(CSC)两种布局，行向量已做L2归一化"""
+
+    def __init__(self, documents, max_df=0.5):
+        counters = [Counter(tokenize(text)) for text in documents]
+        n_docs = len(counters)
+        df = Counter()
+        for counter in counters:
+            df.update(counter.keys())
+        # 只出现在一篇文章里的词对相似度没有贡献；过于常见的词区分度低且会拖慢计算
+        max_count = max(2, int(max_df * n_docs)) if n_docs >= 10 else n_docs
+        vocabulary = {term: i for i, term in enumerate(
+            term for term, count in df.items() if 2 <= count <= max_count)}
+        idf = np.array([
+            math.log((1 + n_docs) / (1 + df[term])) + 1 for term in vocabulary
+        ], dtype=np.float32)
+
+        indptr = [0]
+        indices = []
+        tf = []
+        for counter in counters:
+            for term, count in counter.items():
+                term_id = vocabulary.get(term)
+                if term_id is not None:
+                    indices.append(term_id)
+                    tf.append(count)
+            indptr.append(len(indices))
+
+        self.n_docs = n_docs
+        self.indptr = np.array(indptr, dtype=np.int64)
+        self.indices = np.array(indices, dtype=np.int64)
+        data = (1 + np.log(np.array(tf, dtype=np.float32))) * idf[self.indices]
+        row_of_nnz = np.repeat(np.arange(n_docs), np.diff(self.indptr))
+        norms = np.sqrt(np.bincount(row_of_nnz, weights=data * data, minlength=n_docs))
+        norms[norms == 0] = 1
+        self.data = (data / norms[row_of_nnz]).astype(np.float32)
+
+        order = np.argsort(self.indices, kind='stable')
+        self.col_rows = row_of_nnz[order]
+        self.col_data = self.data[order]
+        self.colptr = np.concatenate([[0], np.cumsum(np.bincount(self.indices, minlength=len(vocabulary)))])
+
+    def similarities(self, row):
+        """第row篇文章与所有文章的余弦相似度，只遍历它所含词项的倒排列表"""
+        start, end = self.indptr[row], self.indptr[row + 1]
+        terms = self.indices[start:end]
+        weights = self.data[start:end]
+        starts = self.colptr[terms]
+        lengths = self.colptr[terms + 1] - starts
+        total = int(lengths.sum())
+        if not total:
+            return np.zeros(self.n_docs, dtype=np.float64)
+        offsets = np.cumsum(lengths) - lengths
+        positions = np.arange(total) + np.repeat(starts - offsets, lengths)
+        contributions = np.repeat(weights, lengths) * self.col_data[positions]
+        return np.bincount(self.col_rows[positions], weights=contributions, minlength=self.n_docs)
+
+
+def _text_hash(title, summary, content_html):
+    return hashlib.sha1('\x00'.join([title or '', summary or '', content_html or '']).encode('utf-8')).hexdigest()
+
+
+def _top_related(index, row, candidate_mask, top_k):
+    scores = index.similarities(row)
+    scores[row] = 0
+    scores[~candidate_mask] = 0
+    if top_k < len(scores):
+        best = np.argpartition(-scores, top_k)[:top_k]
+    else:
+        best = np.arange(len(scores))
+    best = best[np.argsort(-scores[best], kind='stable')]
+    return scores, [(int(i), float(scores[i])) for i in best if scores[i] > 0]
+
+
+def build_related_articles(top_k=5, full=False):
+    """计算已发布文章的相关教程并写入相关文章表
+
+    只重新计算文本有变化的文章，以及相关列表可能因此改变的文章
+    （列表中含有变化/下线/已删除的文章，或与变化文章的相似度超过列表中的最低分）。
+    返回的paths为相关教程列表有变化的页面，静态页面由调用方重建。
+    """
+    rows = list(
+        Article.objects.filter(is_published=True)
+        .order_by('pk')
+        .values_list('pk', 'content_type', 'title', 'summary', 'content_html')
+    )
+    ids = [row[0] for row in rows]
+    position = {pk: i for i, pk in enumerate(ids)}
+    hashes = {row[0]: _text_hash(*row[2:]) for row in rows}
+
+    stored_hashes = dict(RelatedArticlesState.objects.values_list('article_id', 'text_hash'))
+    current_lists = {}
+    # 被删除的文章会级联删掉其他列表中的对应行，留下排名空缺，这些列表也需要重算
+    gapped = set()
+    for article_id, related_id, rank, score in RelatedArticle.objects.order_by('article', 'rank').values_list(
+            'article_id', 'related_id', 'rank', 'score'):
+        entries = current_lists.setdefault(article_id, [])
+        if rank != len(entries):
+            gapped.add(article_id)
+        entries.append((related_id, score))
+
+    dirty = set(ids) if full else {pk for pk in ids if stored_hashes.get(pk) != hashes[pk]}
+    removed = set(stored_hashes) - set(ids)
+    gapped &= set(ids)
+    if not dirty and not removed and not gapped:
+        return {'articles': len(ids), 'rescored': 0, 'removed': 0, 'paths': []}
+
+    index = TfidfIndex(
+        [f"{title} {summary} {html_to_text(content_html)}" for _, _, title, summary, content_html in rows]
+    )
+    candidate_mask = np.array([row[1] == Article.ContentType.TUTORIAL for row in rows], dtype=bool)
+
+    results = {}
+    rescore = gapped | {pk for pk, entries in current_lists.items()
+                        if pk in position and any(related in dirty or related in removed for related, _ in entries)}
+    for pk in dirty:
+        scores, results[pk] = _top_related(index, position[pk], candidate_mask, top_k)
+        if not candidate_mask[position[pk]]:
+            continue
+        # 相似度对称：变化文章可能挤进其他文章的相关列表
+        for i in np.flatnonzero(scores > 0):
+            other = ids[i]
+            entries = current_lists.get(other, [])
+            if len(entries) < top_k or scores[i] > entries[-1][1]:
+                rescore.add(other)
+    for pk in rescore - dirty:
+        _, results[pk] = _top_related(index, position[pk], candidate_mask, top_k)
+
+    with transaction.atomic():
+        RelatedArticle.objects.filter(article_id__in=set(results) | removed).delete()
+        RelatedArticle.objects.bulk_create([
+            RelatedArticle(article_id=pk, related_id=ids[i], rank=rank, score=score)
+            for pk, entries in results.items()
+            for rank, (i, score) in enumerate(entries)
+        ], batch_size=1000)
+        RelatedArticlesState.objects.filter(article_id__in=removed).delete()
+        RelatedArticlesState.objects.bulk_create(
+            [RelatedArticlesState(article_id=pk, text_hash=hashes[pk]) for pk in dirty],
+            update_conflicts=True, unique_fields=['article'], update_fields=['text_hash'],
+            batch_size=1000,
+        )
+        paths = [path for path in map(tutorial_page_path, results) if path]
+        transaction.on_commit(lambda: purge_pages(paths))
+
+    return {'articles': len(ids), 'rescored': len(results), 'removed': len(removed), 'paths': paths}
@@ -0,0 +1,201 @@
+import hashlib
+import heapq
+import math
+from collections import Counter, defaultdict
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Avg, Count, Q
+
+from .models import Article, SearchDocument, SearchPosting
+from .tokenizer import html_to_text, tokenize
+
+# BM25参数
+K1 = 1.2
+B = 0.75
+# 标题中的词项按多次出现计入，提高标题命中的权重
+TITLE_WEIGHT = 3
+MAX_TERM_LENGTH = 64
+MAX_QUERY_TERMS = 32
+SEARCH_STATS_CACHE_KEY = 'pythonfun:search_stats'
+
+
+def _text_hash(title, summary, content_html):
+    return hashlib.sha1('\x00'.join([title or '', summary or '', content_html or '']).encode('utf-8')).hexdigest()
+
+
+def document_terms(title, summary, content_html):
+    """文章的词项及词频"""
+    terms = Counter(tokenize(title))
+    for term in terms:
+        terms[term] *= TITLE_WEIGHT
+    terms.update(tokenize(summary))
+    terms.update(tokenize(html_to_text(content_html)))
+    return Counter({term[:MAX_TERM_LENGTH]: tf for term, tf in terms.items()})
+
+
+def query_terms(query):
+    return list(dict.fromkeys(term[:MAX_TERM_LENGTH] for term in tokenize(query)))[:MAX_QUERY_TERMS]
+
+
+def invalidate_collection_stats():
+    """统计只包含已发布文章：索引或发布状态变化后清除"""
+    cache.delete(SEARCH_STATS_CACHE_KEY)
+
+
+def index_rows(rows, batch_size=2000):
+    """为(主键, 标题, 摘要, 正文)批量建立索引，替换这些文章原有的索引"""
+    documents = []
+    postings = []
+    for pk, title, summary, content_html in rows:
+        terms = document_terms(title, summary, content_html)
+        length = sum(terms.values())
+        documents.append(SearchDocument(article_id=pk, length=length, text_hash=_text_hash(title, summary, content_html)))
+        postings.extend((term, pk, tf, length) for term, tf in terms.items())
+    ids = [document.article_id for document in documents]
+    with transaction.atomic():
+        SearchPosting.objects.filter(article_id__in=ids).delete()
+        SearchDocument.objects.filter(article_id__in=ids).delete()
+        SearchDocument.objects.bulk_create(documents, batch_size=batch_size)
+        _insert_postings(postings, batch_size)
+    invalidate_collection_stats()
+    return len(documents)
+
+
+def _insert_postings(postings, batch_size):
+    """倒排记录数量是文章数的上百倍，直接executemany写入，省去逐行构造模型实例的开销"""
+    meta = SearchPosting._meta
+    quote = connection.ops.quote_name
+    columns = ', '.join(quote(meta.get_field(name).column) for name in ('term', 'article', 'tf', 'doc_length'))
+    sql = f'INSERT INTO {quote(meta.db_table)} ({columns}) VALUES (%s, %s, %s, %s)'
+    with connection.cursor() as cursor:
+        for start in range(0, len(postings), batch_size):
+            cursor.executemany(sql, postings[start:start + batch_size])
+
+
+def index_article(article):
+    """增量更新单篇文章的索引，文本未变时跳过
+
+    草稿也建立索引供后台检索，前台检索时再过滤已发布文章。
+    """
+    text_hash = _text_hash(article.title, article.summary, article.content_html)
+    if SearchDocument.objects.filter(article_id=article.pk, text_hash=text_hash).exists():
+        # 文本未变但发布状态可能变了，参与统计的文档随之变化
+        invalidate_collection_stats()
+        return
+    index_rows([(article.pk, article.title, article.summary, article.content_html)])
+
+
+def remove_article(article_id):
+    remove_articles([article_id])
+
+
+def remove_articles(article_ids):
+    SearchPosting.objects.filter(article_id__in=article_ids).delete()
+    if SearchDocument.objects.filter(article_id__in=article_ids).delete()[0]:
+        invalidate_collection_stats()
+
+
+def rebuild_index(batch_size=500):
+    """重建全部文章的索引"""
+    with transaction.atomic():
+        SearchPosting.objects.all().delete()
+        SearchDocument.objects.all().delete()
+        total = 0
+        batch = []
+        rows = Article.objects.order_by('pk').values_list(
+            'pk', 'title', 'summary', 'content_html')
+        for row in rows.iterator(chunk_size=batch_size):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                total += index_rows(batch)
+                batch = []
+        if batch:
+            total += index_rows(batch)
+    return total
+
+
+def collection_stats():
+    """已发布文章的文档总数和平均长度（BM25需要），缓存到下次索引或发布状态变化
+
+    与rank()中的文档频率取自同一文档集合，草稿不参与IDF计算。
+    """
+    stats = cache.get(SEARCH_STATS_CACHE_KEY)
+    if stats is None:
+        stats = SearchDocument.objects.filter(article__is_published=True).aggregate(
+            total=Count('pk'), avg_length=Avg('length'))
+        stats['avg_length'] = stats['avg_length'] or 1.0
+        cache.set(SEARCH_STATS_CACHE_KEY, stats, 300)
+    return stats
+
+
+def rank(query, limit):
+    """按BM25打分，返回(命中总数, 得分最高的limit篇[(文章ID, 得分)])"""
+    terms = query_terms(query)
+    if not terms:
+        return 0, []
+    stats = collection_stats()
+    n_docs, avg_length = stats['total'], stats['avg_length']
+
+    postings_by_term = defaultdict(list)
+    postings = SearchPosting.objects.filter(term__in=terms, article__is_published=True)
+    for term, article_id, tf, doc_length in postings.values_list('term', 'article_id', 'tf', 'doc_length'):
+        postings_by_term[term].append((article_id, tf, doc_length))
+
+    scores = defaultdict(float)
+    for term, postings in postings_by_term.items():
+        df = len(postings)
+        idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+        for article_id, tf, doc_length in postings:
+            norm = K1 * (1 - B + B * doc_length / avg_length)
+            scores[article_id] += idf * tf * (K1 + 1) / (tf + norm)
+    top = heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], item[0]))
+    return len(scores), top
+
+
+def search_articles(query, page=1, page_size=10):
+    """检索已发布文章并分页，返回总数和当前页的文章（附得分）"""
+    start = (page - 1) * page_size
+    total, ranked = rank(query, start + page_size)
+    page_hits = ranked[start:]
+    articles = Article.objects.filter(pk__in=[pk for pk, _ in page_hits]).select_related('category').only(
+        'id', 'title', 'subtitle', 'summary', 'updated_at', 'category__name', 'category__slug')
+    by_id = {article.pk: article for article in articles}
+    results = []
+    for pk, score in page_hits:
+        article = by_id.get(pk)
+        if article is not None:
+            article.score = score
+            results.append(article)
+    return total, results
+
+
+def split_query_terms(query):
+    """把查询词项分为(索引能表示的词项, 单个汉字)
+
+    正文中连续的汉字按二元组索引，单个汉字的查询词项命不中，只能用LIKE匹配。
+    """
+    indexed, characters = [], []
+    for term in query_terms(query):
+        (characters if len(term) == 1 and not term.isascii() else indexed).append(term)
+    return indexed, characters
+
+
+def matching_articles(terms):
+    """包含全部词项的文章ID子查询"""
+    return (
+        SearchPosting.objects.filter(term__in=terms)
+        .values('article_id')
+        .annotate(matched=Count('term'))
+        .filter(matched=len(terms))
+        .values('article_id')
+    )
+
+
+def like_search(query, page=1, page_size=10):
+    """未建索引时的LIKE全表扫描（与后台changelist相同：计数加取一页），仅作为基准对照"""
+    queryset = Article.objects.filter(is_published=True).filter(
+        Q(title__icontains=query) | Q(summary__icontains=query) | Q(content_html__icontains=query)
+    )
+    start = (page - 1) * page_size
+    return queryset.count(), list(queryset.values_list('pk', flat=True)[start:start + page_size])
@@ -0,0 +1,199 @@
+import datetime
+import decimal
+import json
+import uuid
+
+from django.http import HttpResponse
+from django.utils.functional import Promise
+
+from .models import Article, MainCategory, SubCategory
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(value):
+    """orjson和标准库都不能直接编码的类型；日期时间的格式与isoformat()一致"""
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (decimal.Decimal, uuid.UUID, Promise)):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def stdlib_dumps(data):
+    return json.dumps(data, default=_default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def dumps(data):
+    """编码为UTF-8的JSON字节；安装了orjson时使用orjson，否则退回标准库"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, default=_default)
+        except TypeError:
+            # orjson只支持64位以内的整数，其余情况交给标准库（真正无法编码的对象仍会抛出TypeError）
+            pass
+    return stdlib_dumps(data)
+
+
+class JsonResponse(HttpResponse):
+    """与django.http.JsonResponse用法相同，改用dumps编码
+
+    safe参数只为兼容原有调用保留：列表也可以直接编码。
+    """
+
+    def __init__(self, data, safe=True, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(content=dumps(data), **kwargs)
+
+
+class Many:
+    """多对多字段：按主键再查一次关联表，得到每行的值列表"""
+
+    def __init__(self, lookup):
+        self.lookup = lookup
+
+
+class Schema:
+    """声明式序列化模式：{输出字段: values()查找路径 | (查找路径, 转换函数) | Many(查找路径)}
+
+    直接读取values()的结果，不构造模型实例；日期时间等交给编码器处理，不逐行调用isoformat()。
+    """
+
+    def __init__(self, model, **fields):
+        self.model = model
+        self.fields = {}
+        for name, spec in fields.items():
+            if isinstance(spec, str):
+                spec = (spec, None)
+            self.fields[name] = spec
+
+    def check(self, names):
+        """返回不在模式中的字段名"""
+        return [name for name in names if name not in self.fields]
+
+    def _names(self, names):
+        return list(self.fields) if names is None else names
+
+    def select(self, queryset, names=None, extra=()):
+        """只读取所需列的values()查询集；extra为分页排序等额外需要的列"""
+        columns = {'pk'}
+        for name in self._names(names):
+            spec = self.fields[name]
+            if not isinstance(spec, Many):
+                columns.add(spec[0])
+        columns.update(extra)
+        return queryset.values(*columns)
+
+    def fetch_many(self, rows, names=None):
+        """多对多字段每个一条查询，返回{字段: {主键: [值]}}"""
+        pks = [row['pk'] for row in rows]
+        related = {}
+        for name in self._names(names):
+            spec = self.fields[name]
+            if not isinstance(spec, Many):
+                continue
+            values = related[name] = {}
+            if not pks:
+                continue
+            pairs = (
+                self.model._base_manager.filter(pk__in=pks, **{f'{spec.lookup}__isnull': False})
+                .order_by('pk', spec.lookup)
+                .values_list('pk', spec.lookup)
+            )
+            for pk, value in pairs:
+                values.setdefault(pk, []).append(value)
+        return related
+
+    def build(self, rows, names=None, related=None):
+        """由values()行和fetch_many的结果生成输出字典"""
+        related = related or {}
+        plan = []
+        for name in self._names(names):
+            spec = self.fields[name]
+            if isinstance(spec, Many):
+                plan.append((name, None, None, related.get(name, {})))
+            else:
+                plan.append((name, spec[0], spec[1], None))
+        result = []
+        for row in rows:
+            item = {}
+            for name, column, convert, many in plan:
+                if many is not None:
+                    item[name] = many.get(row['pk'], [])
+                elif convert is None:
+                    item[name] = row[column]
+                else:
+                    item[name] = convert(row[column])
+            result.append(item)
+        return result
+
+    def render(self, rows, names=None):
+        rows = list(rows)
+        return self.build(rows, names, self.fetch_many(rows, names))
+
+    def serialize(self, queryset, names=None):
+        return self.render(self.select(queryset, names), names)
+
+
+# ========== 各模型的模式 ==========
+
+MAIN_CATEGORY_SCHEMA = Schema(
+    MainCategory,
+    id='id',
+    name='name',
+    slug='slug',
+    order='order',
+    is_enabled='is_enabled',
+)
+
+SUB_CATEGORY_SCHEMA = Schema(
+    SubCategory,
+    id='id',
+    name='name',
+    slug='slug',
+    parent_id='parent_id',
+    parent_name='parent__name',
+    is_enabled='is_enabled',
+)
+
+# 文章列表可选的字段（article_api的fields参数），不含正文
+ARTICLE_SCHEMA = Schema(
+    Article,
+    id='id',
+    title='title',
+    subtitle='subtitle',
+    summary='summary',
+    read_time_minutes='read_time_minutes',
+    is_published='is_published',
+    created_at='created_at',
+    updated_at='updated_at',
+    category_name='category__name',
+    tags=Many('tags__name'),
+)
+
+# 文章、教程详情接口：在列表字段之外包含正文
+ARTICLE_DETAIL_SCHEMA = Schema(
+    Article,
+    **ARTICLE_SCHEMA.fields,
+    content_html='content_html',
+    content_code='content_code',
+    code_language='code_language',
+    category_id='category_id',
+)
+
+ARTICLE_DETAIL_FIELDS = [
+    'id', 'title', 'subtitle', 'summary', 'read_time_minutes', 'content_html', 'content_code',
+    'code_language', 'category_id', 'tags',
+]
+
+COURSE_DETAIL_FIELDS = ARTICLE_DETAIL_FIELDS + ['category_name', 'is_published']
+
+COURSE_FIELDS = [
+    'id', 'title', 'subtitle', 'summary', 'read_time_minutes', 'is_published',
+    'created_at', 'updated_at', 'category_name', 'tags',
+]
@@ -0,0 +1,348 @@
+import threading
+from contextlib import contextmanager
+
+from django.db import transaction
+from django.db.models import F, Subquery
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete, m2m_changed
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import MainCategory, SubCategory, Article, Tag, FunctionEntry, Library, LibraryModule, LibraryItem
+from .category_tree import invalidate_category_tree
+from .function_index import invalidate_function_index, touch_function_modules
+from .counters import move_tutorial_count, shift_tutorial_count
+from .navigation import relink_category, unlink_articles
+from .search import index_article, remove_article
+from .page_cache import purge_pages
+from .page_dependencies import article_page_paths, category_page_paths, function_library_page_path
+from .static_export import schedule_regeneration
+
+_bulk_state = threading.local()
+
+
+@contextmanager
+def bulk_article_writes():
+    """批量写入文章期间跳过逐行的文章信号处理，计数器、前后篇、索引和页面缓存由调用方按批次统一维护"""
+    previous = getattr(_bulk_state, 'active', False)
+    _bulk_state.active = True
+    try:
+        yield
+    finally:
+        _bulk_state.active = previous
+
+
+def _in_bulk_write():
+    return getattr(_bulk_state, 'active', False)
+
+
+@receiver(post_save, sender=MainCategory)
+@receiver(post_delete, sender=MainCategory)
+@receiver(post_save, sender=SubCategory)
+@receiver(post_delete, sender=SubCategory)
+@receiver(post_delete, sender=Article)
+def category_tree_changed(sender, **kwargs):
+    """分类变化或文章删除时清理分类树缓存"""
+    if sender is Article and _in_bulk_write():
+        return
+    invalidate_category_tree()
+
+
+# 影响导航（分类树、侧栏和前后篇标题）的文章字段
+TREE_FIELDS = ('category_id', 'is_published', 'content_type', 'title')
+
+
+@receiver(post_save, sender=Article)
+def article_tree_changed(sender, instance, created=False, raw=False, **kwargs):
+    """只有新建文章或导航相关字段变化时才清理分类树缓存，正文修改不影响导航版本"""
+    if _in_bulk_write():
+        return
+    previous = getattr(instance, '_previous_tree_state', None)
+    if created or raw or previous is None:
+        invalidate_category_tree()
+        return
+    if previous != tuple(getattr(instance, name) for name in TREE_FIELDS):
+        invalidate_category_tree()
+
+
+# ========== 已发布教程计数器 ==========
+
+@receiver(pre_save, sender=Article)
+def remember_article_state(sender, instance, raw=False, **kwargs):
+    """保存前从数据库读取文章原先的分类、原先计入的分类和导航相关字段"""
+    if _in_bulk_write():
+        return
+    instance._previous_category_id = None
+    instance._previous_counted_category_id = None
+    instance._previous_tree_state = None
+    if raw or instance.pk is None:
+        return
+    previous = (
+        Article.objects.select_for_update()
+        .filter(pk=instance.pk)
+        .values_list(*TREE_FIELDS)
+        .first()
+    )
+    if previous:
+        instance._previous_tree_state = previous
+        instance._previous_category_id = previous[0]
+        if previous[1] and previous[2] == Article.ContentType.TUTORIAL:
+            instance._previous_counted_category_id = previous[0]
+
+
+@receiver(post_save, sender=Article)
+def update_article_counters(sender, instance, raw=False, **kwargs):
+    if raw or _in_bulk_write():
+        return
+    move_tutorial_count(
+        getattr(instance, '_previous_counted_category_id', None),
+        instance.counted_category_id,
+    )
+
+
+@receiver(post_delete, sender=Article)
+def release_article_counter(sender, instance, **kwargs):
+    if _in_bulk_write():
+        return
+    shift_tutorial_count(instance.counted_category_id, -1)
+
+
+@receiver(pre_save, sender=SubCategory)
+def remember_sub_category_state(sender, instance, raw=False, **kwargs):
+    instance._previous_parent_id = None
+    instance._previous_slug = None
+    instance._previous_name = None
+    if raw or instance.pk is None:
+        return
+    previous = SubCategory.objects.filter(pk=instance.pk).values_list('parent_id', 'slug', 'name').first()
+    if previous:
+        instance._previous_parent_id, instance._previous_slug, instance._previous_name = previous
+
+
+@receiver(post_save, sender=SubCategory)
+def move_sub_category_counter(sender, instance, raw=False, **kwargs):
+    """子分类换了主分类时，把它的计数从旧主分类转到新主分类"""
+    previous_parent_id = getattr(instance, '_previous_parent_id', None)
+    if raw or previous_parent_id is None or previous_parent_id == instance.parent_id:
+        return
+    sub_count = Subquery(
+        SubCategory.objects.filter(pk=instance.pk).values('published_tutorial_count')
+    )
+    MainCategory.objects.filter(pk=previous_parent_id).update(
+        published_tutorial_count=F('published_tutorial_count') - sub_count
+    )
+    MainCategory.objects.filter(pk=instance.parent_id).update(
+        published_tutorial_count=F('published_tutorial_count') + sub_count
+    )
+
+
+@receiver(pre_delete, sender=SubCategory)
+def release_sub_category_counter(sender, instance, **kwargs):
+    """子分类删除后其文章的分类会被置空，先从主分类中扣除它的计数"""
+    sub_count = Subquery(
+        SubCategory.objects.filter(pk=instance.pk).values('published_tutorial_count')
+    )
+    MainCategory.objects.filter(pk=instance.parent_id).update(
+        published_tutorial_count=F('published_tutorial_count') - sub_count
+    )
+
+
+# ========== 前后篇指针 ==========
+
+@receiver(post_save, sender=Article)
+def update_article_navigation(sender, instance, raw=False, **kwargs):
+    """发布、取消发布或移动分类时重新串联受影响的子分类"""
+    if raw or _in_bulk_write():
+        return
+    previous_category_id = getattr(instance, '_previous_counted_category_id', None)
+    category_id = instance.counted_category_id
+    if previous_category_id == category_id:
+        return
+    if category_id is None:
+        unlink_articles(pk=instance.pk)
+    relink_category(previous_category_id)
+    relink_category(category_id)
+
+
+@receiver(post_delete, sender=Article)
+def release_article_navigation(sender, instance, **kwargs):
+    if _in_bulk_write():
+        return
+    relink_category(instance.counted_category_id)
+
+
+@receiver(pre_delete, sender=SubCategory)
+def release_sub_category_navigation(sender, instance, **kwargs):
+    # 子分类删除后文章的分类会被置空，不再属于任何链
+    unlink_articles(category=instance)
+
+
+# ========== 全文索引 ==========
+
+@receiver(post_save, sender=Article)
+def update_search_index(sender, instance, raw=False, **kwargs):
+    if raw or _in_bulk_write():
+        return
+    index_article(instance)
+
+
+@receiver(post_delete, sender=Article)
+def release_search_index(sender, instance, **kwargs):
+    if _in_bulk_write():
+        return
+    remove_article(instance.pk)
+
+
+# ========== 页面缓存清理与静态页面重建 ==========
+
+def pages_changed(paths):
+    # 事务提交后再处理，避免并发请求把旧内容重新写回缓存
+    def on_commit():
+        purge_pages(paths)
+        schedule_regeneration(paths)
+    transaction.on_commit(on_commit)
+
+
+@receiver(post_save, sender=Article)
+def purge_article_pages(sender, instance, raw=False, **kwargs):
+    if raw or _in_bulk_write():
+        return
+    category_ids = {getattr(instance, '_previous_category_id', None), instance.category_id}
+    sidebar_changed = getattr(instance, '_previous_counted_category_id', None) != instance.counted_category_id
+    pages_changed(article_page_paths(instance.pk, category_ids, sidebar_changed))
+
+
+@receiver(post_delete, sender=Article)
+def purge_deleted_article_pages(sender, instance, **kwargs):
+    if _in_bulk_write():
+        return
+    sidebar_changed = instance.counted_category_id is not None
+    pages_changed(article_page_paths(instance.pk, [instance.category_id], sidebar_changed))
+
+
+@receiver(post_save, sender=SubCategory)
+def purge_sub_category_pages(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    old_slugs = [getattr(instance, '_previous_slug', None)]
+    pages_changed(category_page_paths([instance.pk], old_slugs=[s for s in old_slugs if s]))
+
+
+@receiver(pre_delete, sender=SubCategory)
+def purge_deleted_sub_category_pages(sender, instance, **kwargs):
+    # 删除前收集路径：删除后文章的分类会被置空
+    pages_changed(category_page_paths([instance.pk], old_slugs=[instance.slug]))
+
+
+@receiver(post_save, sender=MainCategory)
+def purge_main_category_pages(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    sub_ids = list(instance.subcategories.values_list('pk', flat=True))
+    pages_changed(category_page_paths(sub_ids))
+
+
+@receiver(pre_delete, sender=MainCategory)
+def purge_deleted_main_category_pages(sender, instance, **kwargs):
+    sub_ids = list(instance.subcategories.values_list('pk', flat=True))
+    pages_changed(category_page_paths(sub_ids))
+
+
+# ========== 标签、分类变化刷新文章更新时间 ==========
+# 文章的ETag/Last-Modified取自updated_at，标签变化和分类改名不会经过Article.save，需要单独刷新
+
+def _touch_articles(article_ids):
+    article_ids = list(article_ids)
+    if not article_ids:
+        return
+    Article.objects.filter(pk__in=article_ids).update(updated_at=timezone.now())
+    paths = []
+    for pk, category_id in Article.objects.filter(pk__in=article_ids).values_list('pk', 'category_id'):
+        paths += article_page_paths(pk, [category_id])
+    pages_changed(paths)
+
+
+@receiver(m2m_changed, sender=Article.tags.through)
+def touch_articles_on_tags_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if _in_bulk_write():
+        return
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if not reverse:
+        # pre_clear时pk_set为空，但文章本身同样需要刷新
+        _touch_articles([instance.pk])
+    elif action == 'pre_clear':
+        _touch_articles(instance.article_set.values_list('pk', flat=True))
+    else:
+        _touch_articles(pk_set or [])
+
+
+@receiver(post_save, sender=Tag)
+@receiver(pre_delete, sender=Tag)
+def touch_articles_on_tag_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    _touch_articles(instance.article_set.values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=SubCategory)
+def touch_articles_on_sub_category_renamed(sender, instance, raw=False, **kwargs):
+    """文章接口和教程页输出分类名称及其主分类名称"""
+    if raw or getattr(instance, '_previous_name', None) is None:
+        return
+    if instance._previous_name != instance.name or instance._previous_parent_id != instance.parent_id:
+        _touch_articles(instance.article_set.values_list('pk', flat=True))
+
+
+@receiver(pre_save, sender=MainCategory)
+def remember_main_category_name(sender, instance, raw=False, **kwargs):
+    instance._previous_name = None
+    if raw or instance.pk is None:
+        return
+    instance._previous_name = MainCategory.objects.filter(pk=instance.pk).values_list('name', flat=True).first()
+
+
+@receiver(post_save, sender=MainCategory)
+def touch_articles_on_main_category_renamed(sender, instance, raw=False, **kwargs):
+    previous_name = getattr(instance, '_previous_name', None)
+    if raw or previous_name is None or previous_name == instance.name:
+        return
+    _touch_articles(Article.objects.filter(category__parent=instance).values_list('pk', flat=True))
+
+
+# ========== 函数查询索引 ==========
+
+@receiver(post_save, sender=FunctionEntry)
+@receiver(post_delete, sender=FunctionEntry)
+def invalidate_function_index_on_change(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    touch_function_modules([instance.module])
+    transaction.on_commit(invalidate_function_index)
+
+
+# ========== 函数库页面 ==========
+
+def _library_page_changed():
+    path = function_library_page_path()
+    if path:
+        pages_changed([path])
+
+
+@receiver(post_save, sender=LibraryItem)
+@receiver(post_delete, sender=LibraryItem)
+def touch_library_module(sender, instance, raw=False, **kwargs):
+    """条目变化时刷新所属模块的更新时间，分节数据的URL版本随之变化"""
+    if raw:
+        return
+    LibraryModule.objects.filter(pk=instance.module_id).update(updated_at=timezone.now())
+    _library_page_changed()
+
+
+@receiver(post_save, sender=Library)
+@receiver(post_delete, sender=Library)
+@receiver(post_save, sender=LibraryModule)
+@receiver(post_delete, sender=LibraryModule)
+def purge_library_page(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    _library_page_changed()
@@ -0,0 +1,337 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from inspect import unwrap
+from pathlib import Path
+from urllib.parse import unquote
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpRequest
+from django.urls import resolve, reverse
+
+from .models import MainCategory, SubCategory, Article, RelatedArticle, Library, LibraryModule
+
+try:
+    import fcntl
+except ImportError:
+    # Windows没有fcntl，改用msvcrt的文件锁
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = '.export-manifest.json'
+LOCK_NAME = '.export.lock'
+NAVIGATION_PAGES = ('function_library', 'function_query', 'data_structure', 'statement', 'project')
+
+
+def default_output_dir():
+    return getattr(settings, 'PYTHONFUN_STATIC_EXPORT_DIR', os.path.join(settings.BASE_DIR, 'static_site'))
+
+
+def _fingerprint(*parts):
+    return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+
+
+def _scan_templates():
+    """模板目录和静态文件目录的指纹：任何模板变化都会导致全部页面重新生成
+
+    页面通过{% static %}引用带内容哈希的文件名，静态文件变化同样会改变页面内容。
+    """
+    entries = []
+    directories = [(directory, '*.html') for engine in settings.TEMPLATES for directory in engine.get('DIRS', [])]
+    directories += [(directory, '*') for directory in getattr(settings, 'STATICFILES_DIRS', [])]
+    for directory, pattern in directories:
+        for path in sorted(Path(directory).rglob(pattern)):
+            if path.is_file():
+                stat = path.stat()
+                entries.append((str(path.relative_to(directory)), stat.st_mtime_ns, stat.st_size))
+    return _fingerprint(entries)
+
+
+_templates_state = None
+
+
+def _templates_fingerprint(refresh=False):
+    """模板和静态文件只随部署变化：完整导出时重新扫描，发布后的增量重建沿用本进程上次的结果"""
+    global _templates_state
+    if refresh or _templates_state is None:
+        _templates_state = _scan_templates()
+    return _templates_state
+
+
+def collect_pages(refresh_templates=True):
+    """列出所有需要导出的页面及其指纹，返回 {路径: 指纹}
+
+    指纹由分类、文章的少量字段计算，查询不读取文章正文。
+    """
+    templates = _templates_fingerprint(refresh_templates)
+    main_rows = list(MainCategory.objects.order_by('pk').values_list('pk', 'name', 'slug', 'order', 'is_enabled', 'icon'))
+    sub_rows = list(SubCategory.objects.order_by('pk').values_list(
+        'pk', 'parent_id', 'name', 'slug', 'is_enabled', 'icon', 'published_tutorial_count'))
+    # 侧栏依赖计数，教程页只依赖分类名称等字段
+    sidebar_state = _fingerprint(main_rows, sub_rows)
+    category_names = _fingerprint(main_rows, [row[:-1] for row in sub_rows])
+    tutorials = list(
+        Article.objects.filter(content_type=Article.ContentType.TUTORIAL, is_published=True)
+        .order_by('created_at', 'pk')
+        .values_list('pk', 'category_id', 'updated_at', 'title', 'prev_in_category_id', 'next_in_category_id')
+    )
+
+    # 页面中的前后篇和相关教程链接显示标题，这些教程改名或更新时页面同样需要重新生成
+    links = {pk: (pk, title, updated_at) for pk, _, updated_at, title, _, _ in tutorials}
+    neighbours = {pk: (links.get(prev_id), links.get(next_id)) for pk, _, _, _, prev_id, next_id in tutorials}
+    related = {}
+    for article_id, related_id, score in RelatedArticle.objects.order_by('article', 'rank').values_list(
+            'article_id', 'related_id', 'score'):
+        related.setdefault(article_id, []).append((links.get(related_id), score))
+
+    first_in_category = {}
+    siblings = {}
+    for pk, category_id, updated_at, *_ in tutorials:
+        first_in_category.setdefault(category_id, (pk, updated_at, neighbours[pk]))
+        siblings.setdefault(category_id, []).append((pk, updated_at))
+
+    pages = {}
+    first = (tutorials[0][0], tutorials[0][2], neighbours[tutorials[0][0]]) if tutorials else None
+    pages[reverse('Pythonfun:index')] = _fingerprint(templates, sidebar_state, first)
+    for sub_id, slug in SubCategory.objects.exclude(slug='').values_list('pk', 'slug'):
+        pages[reverse('Pythonfun:category', args=[slug])] = _fingerprint(
+            templates, sidebar_state, first_in_category.get(sub_id))
+    for pk, category_id, updated_at, *_ in tutorials:
+        pages[reverse('Pythonfun:tutorial_detail', args=[pk])] = _fingerprint(
+            templates, category_names, pk, updated_at, neighbours[pk], siblings.get(category_id), related.get(pk))
+    for name in NAVIGATION_PAGES:
+        pages[reverse(f'Pythonfun:{name}')] = templates
+    # 函数库页面输出模块列表和第一个模块的内容
+    libraries = list(Library.objects.order_by('pk').values_list('pk', 'key', 'name', 'order'))
+    library_modules = list(LibraryModule.objects.order_by('pk').values_list(
+        'pk', 'library_id', 'name', 'description', 'order', 'updated_at'))
+    pages[reverse('Pythonfun:function_library')] = _fingerprint(templates, libraries, library_modules)
+    return pages
+
+
+def output_file(output_dir, path):
+    """URL路径对应的文件：/a/b/ -> a/b/index.html，可直接由WhiteNoise或Vercel静态托管"""
+    relative = unquote(path).strip('/')
+    return Path(output_dir, relative, 'index.html')
+
+
+def _write_atomic(target, content):
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=target.parent, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as tmp:
+            tmp.write(content)
+        os.replace(tmp_path, target)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def render_path(path):
+    """以匿名访客身份调用视图（绕过页面缓存和条件请求），返回HTML字节"""
+    from django.contrib.auth.models import AnonymousUser
+
+    request = HttpRequest()
+    request.method = 'GET'
+    request.path = request.path_info = path
+    request.META = {'SERVER_NAME': 'localhost', 'SERVER_PORT': '80', 'REQUEST_METHOD': 'GET'}
+    request.user = AnonymousUser()
+    match = resolve(path)
+    response = unwrap(match.func)(request, *match.args, **match.kwargs)
+    if response.status_code != 200:
+        raise ValueError(f'{path} 返回状态码 {response.status_code}')
+    return response.content
+
+
+def export_page(output_dir, path):
+    """渲染并写入单个页面，供进程池调用，返回(路径, 错误信息)"""
+    try:
+        _write_atomic(output_file(output_dir, path), render_path(path))
+    except Exception as e:
+        return path, str(e)
+    return path, None
+
+
+def init_worker(settings_module):
+    """进程池初始化：spawn方式启动时需要重新初始化Django"""
+    import django
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    django.setup()
+
+
+def load_manifest(output_dir):
+    try:
+        with open(Path(output_dir, MANIFEST_NAME), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(output_dir, manifest):
+    content = json.dumps(manifest, ensure_ascii=False, indent=2, sort_keys=True).encode('utf-8')
+    _write_atomic(Path(output_dir, MANIFEST_NAME), content)
+
+
+def remove_page(output_dir, path):
+    target = output_file(output_dir, path)
+    try:
+        target.unlink()
+    except FileNotFoundError:
+        return
+    # 清理空目录，直到导出根目录
+    root = Path(output_dir).resolve()
+    parent = target.parent.resolve()
+    while parent != root and not any(parent.iterdir()):
+        parent.rmdir()
+        parent = parent.parent
+
+
+# ========== 增量导出 ==========
+
+@dataclass
+class ExportResult:
+    total: int = 0
+    rendered: list = field(default_factory=list)
+    removed: list = field(default_factory=list)
+    failed: dict = field(default_factory=dict)
+
+
+@contextmanager
+def _export_lock(output_dir):
+    """多个进程（导出命令、各gunicorn worker的后台重建）串行读写导出清单"""
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    with open(Path(output_dir, LOCK_NAME), 'w') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        else:
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+            else:
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _render_pages(output_dir, paths, workers):
+    if workers <= 1 or len(paths) <= 1:
+        results = [export_page(output_dir, path) for path in paths]
+    else:
+        # 子进程不能复用父进程的数据库连接
+        connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=init_worker,
+            initargs=(os.environ.get('DJANGO_SETTINGS_MODULE', 'mysite.settings'),),
+        ) as pool:
+            results = list(pool.map(export_page, [output_dir] * len(paths), paths, chunksize=8))
+    return {path: error for path, error in results if error}
+
+
+def regenerate(output_dir, paths=None, workers=1, force=False):
+    """按指纹增量导出
+
+    paths为None时检查全部页面；否则只处理给定路径（来自页面依赖关系），
+    其中已不存在的页面（如取消发布的教程）会被删除。
+    """
+    with _export_lock(output_dir):
+        manifest = load_manifest(output_dir)
+        pages = collect_pages(refresh_templates=paths is None)
+        candidates = list(pages) if paths is None else [path for path in set(paths) if path in pages]
+        stale = manifest if paths is None else set(paths)
+
+        result = ExportResult(total=len(pages))
+        changed = [path for path in candidates
+                   if force or manifest.get(path) != pages[path]
+                   or not output_file(output_dir, path).exists()]
+        result.failed = _render_pages(output_dir, changed, workers)
+        result.rendered = [path for path in changed if path not in result.failed]
+        result.removed = [path for path in stale if path not in pages]
+
+        for path in result.removed:
+            remove_page(output_dir, path)
+            manifest.pop(path, None)
+        for path in changed:
+            # 失败的页面不写入清单，下次导出时会重试
+            if path in result.failed:
+                manifest.pop(path, None)
+            else:
+                manifest[path] = pages[path]
+        save_manifest(output_dir, manifest)
+    return result
+
+
+# ========== 发布后的后台重建 ==========
+
+_pending_paths = set()
+_pending_lock = threading.Lock()
+_worker_thread = None
+
+
+def regeneration_enabled():
+    return getattr(settings, 'PYTHONFUN_STATIC_EXPORT_ON_CHANGE', False)
+
+
+def schedule_regeneration(paths):
+    """把受影响的页面加入后台重建队列；短时间内的多次修改合并为一次重建"""
+    global _worker_thread
+    if not regeneration_enabled():
+        return
+    with _pending_lock:
+        _pending_paths.update(path for path in paths if path)
+        if _worker_thread is None or not _worker_thread.is_alive():
+            _worker_thread = threading.Thread(
+                target=_regeneration_loop, name='static-regeneration', daemon=True)
+            _worker_thread.start()
+
+
+def regenerate_now(paths):
+    """在当前线程重建给定页面，供管理命令使用：后台重建线程是守护线程，命令退出时会被直接终止
+
+    未开启发布后重建时返回None。
+    """
+    if not regeneration_enabled():
+        return None
+    return regenerate(default_output_dir(), [path for path in paths if path])
+
+
+def regenerate_for_command(command, paths):
+    """管理命令修改数据后同步重建受影响的页面，结果写到命令的输出"""
+    result = regenerate_now(paths)
+    if result is None:
+        command.stdout.write('未开启发布后自动重建，如需更新静态页面请运行 export_static_site')
+        return
+    for path, error in result.failed.items():
+        command.stderr.write(f'静态页面重建失败 {path}: {error}')
+    command.stdout.write(f'已重建 {len(result.rendered)} 个静态页面')
+
+
+def _regeneration_loop():
+    try:
+        while True:
+            time.sleep(getattr(settings, 'PYTHONFUN_STATIC_EXPORT_DEBOUNCE', 0.5))
+            with _pending_lock:
+                if not _pending_paths:
+                    return
+                paths = set(_pending_paths)
+                _pending_paths.clear()
+            try:
+                result = regenerate(default_output_dir(), paths)
+            except Exception:
+                logger.exception('静态页面重建失败')
+                continue
+            for path, error in result.failed.items():
+                logger.error('静态页面重建失败 %s: %s', path, error)
+    finally:
+        connections.close_all()
@@ -0,0 +1,42 @@
+import logging
+import os
+
+from django.template import TemplateSyntaxError, engines
+from django.template.backends.django import DjangoTemplates
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_EXTENSIONS = ('.html', '.txt', '.xml')
+
+
+def _template_names(engine):
+    """引擎各个加载器的模板目录下的全部模板名称"""
+    names = set()
+    for loader in engine.template_loaders:
+        for directory in loader.get_dirs():
+            directory = str(directory)
+            for root, _, files in os.walk(directory):
+                for filename in files:
+                    if filename.endswith(TEMPLATE_EXTENSIONS):
+                        path = os.path.relpath(os.path.join(root, filename), directory)
+                        names.add(path.replace(os.sep, '/'))
+    return sorted(names)
+
+
+def warm_templates():
+    """预先编译全部模板，存入缓存加载器；返回编译的模板数
+
+    preload_app时在主进程调用，fork后各工作进程共享编译好的节点树，首个请求不再付解析开销。
+    """
+    count = 0
+    for backend in engines.all():
+        if not isinstance(backend, DjangoTemplates):
+            continue
+        for name in _template_names(backend.engine):
+            try:
+                backend.engine.get_template(name)
+            except TemplateSyntaxError as exc:
+                logger.warning('模板 %s 编译失败: %s', name, exc)
+            else:
+                count += 1
+    return count
@@ -0,0 +1,16 @@
+from django import template
+from django.conf import settings
+
+from Pythonfun.category_tree import navigation_version
+
+register = template.Library()
+
+
+@register.simple_tag
+def navigation_fragment():
+    """导航栏和分类侧栏片段缓存的版本号与超时，供 {% cache %} 使用"""
+    return {
+        'version': navigation_version(),
+        # 版本号存在本地缓存时其他进程看不到递增，超时作为兜底
+        'timeout': getattr(settings, 'PYTHONFUN_NAVIGATION_FRAGMENT_TIMEOUT', 300),
+    }
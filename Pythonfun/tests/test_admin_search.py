@@ -0,0 +1,44 @@
+from django.contrib import admin
+from django.test import RequestFactory
+
+from Pythonfun.admin import ArticleAdmin
+from Pythonfun.models import Article
+from Pythonfun.search import split_query_terms
+
+from .utils import PythonfunTestCase, make_category, make_tutorial
+
+
+class AdminArticleSearchTests(PythonfunTestCase):
+    def setUp(self):
+        super().setUp()
+        category = make_category('正则')
+        self.match = make_tutorial(category, '正则表达式', content_html='<p>re模块 匹配 分组</p>')
+        self.draft = make_tutorial(category, '正则草稿', is_published=False, content_html='<p>re模块 替换</p>')
+        self.other = make_tutorial(category, '字符串方法', content_html='<p>split 分组</p>')
+        self.model_admin = ArticleAdmin(Article, admin.site)
+
+    def search(self, term):
+        request = RequestFactory().get('/', {'q': term})
+        queryset, _ = self.model_admin.get_search_results(request, Article.objects.all(), term)
+        return set(queryset.values_list('pk', flat=True))
+
+    def test_indexed_search_includes_drafts(self):
+        self.assertEqual(self.search('re模块'), {self.match.pk, self.draft.pk})
+
+    def test_all_terms_must_match(self):
+        self.assertEqual(self.search('re模块 分组'), {self.match.pk})
+
+    def test_single_characters_are_matched_with_like(self):
+        # 单个汉字不构成二元词项，索引表示不了，用LIKE匹配
+        self.assertEqual(self.search('达'), {self.match.pk})
+        self.assertEqual(self.search('分组 达'), {self.match.pk})
+
+    def test_index_misses_do_not_fall_back_to_like(self):
+        # 索引按整词匹配英文，单词的一部分和索引中没有的词都不再退回LIKE扫描
+        self.assertEqual(self.search('plit'), set())
+        with self.assertNumQueries(1):
+            self.assertEqual(self.search('不存在的词'), set())
+
+    def test_query_terms_are_split_by_representability(self):
+        self.assertEqual(split_query_terms('re模块 达 x'), (['re', '模块', 'x'], ['达']))
+        self.assertEqual(split_query_terms('  '), ([], []))
@@ -0,0 +1,49 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from Pythonfun.models import Tag
+from Pythonfun.pagination import MAX_PAGE_SIZE
+
+from .utils import PythonfunTestCase, make_category, make_tutorial
+
+
+class ArticleListApiTests(PythonfunTestCase):
+    def setUp(self):
+        super().setUp()
+        self.category = make_category('函数')
+        self.tags = [Tag.objects.create(name=f'标签{i}', slug=f'tag-{i}') for i in range(3)]
+        self.add_articles(5)
+
+    def add_articles(self, count):
+        for i in range(count):
+            article = make_tutorial(self.category, f'函数教程{i}')
+            article.tags.set(self.tags[:i % 4])
+
+    def count_queries(self, params):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get('/api/articles/', params).status_code, 200)
+        return len(queries)
+
+    def test_query_count_does_not_grow_with_page(self):
+        params = {'page_size': 50}
+        small = self.count_queries(params)
+        self.add_articles(20)
+        self.assertEqual(self.count_queries(params), small)
+
+    def test_sparse_fieldset(self):
+        data = self.client.get('/api/articles/', {'fields': 'id,title,tags', 'page_size': 2}).json()
+        self.assertEqual(len(data['items']), 2)
+        self.assertEqual(set(data['items'][0]), {'id', 'title', 'tags'})
+        self.assertEqual(data['total_items'], 5)
+        self.assertEqual(data['total_pages'], 3)
+
+    def test_body_is_never_listed(self):
+        data = self.client.get('/api/articles/').json()
+        self.assertNotIn('content_html', data['items'][0])
+        self.assertEqual(self.client.get('/api/articles/', {'fields': 'content_html'}).status_code, 400)
+
+    def test_page_size_is_clamped(self):
+        self.add_articles(MAX_PAGE_SIZE)
+        data = self.client.get('/api/articles/', {'page_size': MAX_PAGE_SIZE * 10}).json()
+        self.assertEqual(len(data['items']), MAX_PAGE_SIZE)
+        self.assertEqual(len(self.client.get('/api/articles/', {'page_size': 'x'}).json()['items']), 20)
@@ -0,0 +1,143 @@
+import json
+
+from django.core.exceptions import ValidationError
+
+from Pythonfun.bulk import CONTENT_HEAD_LENGTH, apply_article_operations, set_published
+from Pythonfun.models import Article, SubCategory
+
+from .utils import PythonfunTestCase, make_category, make_tutorial
+
+
+class BulkOperationTests(PythonfunTestCase):
+    def setUp(self):
+        super().setUp()
+        self.category = make_category('循环')
+        self.tutorial = make_tutorial(self.category, 'for循环')
+
+    def post(self, operations, **extra):
+        return self.client.post('/api/courses/bulk/', json.dumps({'operations': operations, **extra}),
+                                content_type='application/json')
+
+    def test_create_update_delete(self):
+        other = make_tutorial(self.category, 'while循环')
+        response = self.post([
+            {'op': 'create', 'data': {'title': '循环嵌套', 'summary': '摘要', 'content_html': '<p>正文</p>',
+                                      'category_id': self.category.pk, 'is_published': True}},
+            {'op': 'update', 'id': self.tutorial.pk, 'data': {'title': 'for循环详解'}},
+            {'op': 'delete', 'id': other.pk},
+        ])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Article.objects.get(pk=self.tutorial.pk).title, 'for循环详解')
+        self.assertFalse(Article.objects.filter(pk=other.pk).exists())
+        self.assertEqual(SubCategory.objects.get(pk=self.category.pk).published_tutorial_count, 2)
+
+    def test_invalid_ids_are_item_errors(self):
+        for bad in ([1], {'pk': 1}, True, '1', None):
+            response = self.post([{'op': 'update', 'id': bad, 'data': {'title': 'x'}}])
+            self.assertEqual(response.status_code, 400, bad)
+            self.assertEqual(response.json()['results'][0]['status'], 'error')
+
+    def test_invalid_category_and_tags_are_item_errors(self):
+        results, applied = apply_article_operations([
+            {'op': 'update', 'id': self.tutorial.pk, 'data': {'category_id': [1]}},
+        ])
+        self.assertFalse(applied)
+        self.assertEqual(results[0]['status'], 'error')
+        results, applied = apply_article_operations([
+            {'op': 'update', 'id': self.tutorial.pk, 'data': {'tags': [['a'], {'b': 1}]}},
+        ])
+        self.assertTrue(applied)
+
+    def test_invalid_field_values_are_item_errors(self):
+        response = self.post([
+            {'op': 'update', 'id': self.tutorial.pk, 'data': {'read_time_minutes': 'abc'}},
+            {'op': 'create', 'data': {'title': '循环', 'content_html': ['<p>x</p>']}},
+            {'op': 'create', 'data': {'title': 'x' * 300}},
+            {'op': 'create', 'data': {'title': 5, 'summary': '摘要'}},
+            {'op': 'create', 'data': {'title': '循环', 'read_time_minutes': '8'}},
+        ], atomic=False)
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual([result['status'] for result in results], ['error', 'error', 'error', 'error', 'success'])
+        self.assertIn('read_time_minutes', results[0]['message'])
+        self.assertEqual(Article.objects.get(pk=self.tutorial.pk).read_time_minutes, self.tutorial.read_time_minutes)
+        self.assertIn('title', results[3]['message'])
+
+    def test_drafts_may_leave_required_text_empty(self):
+        results, applied = apply_article_operations([
+            {'op': 'create', 'data': {'title': '草稿'}},
+        ])
+        self.assertTrue(applied, results)
+
+    def test_malformed_operations_do_not_crash(self):
+        response = self.post([{'id': self.tutorial.pk}, ['update'], {'op': 'delete', 'id': self.tutorial.pk}])
+        self.assertEqual(response.status_code, 400)
+        statuses = [result['status'] for result in response.json()['results']]
+        self.assertEqual(statuses, ['error', 'error', 'skipped'])
+        self.assertTrue(Article.objects.filter(pk=self.tutorial.pk).exists())
+
+    def test_non_atomic_applies_valid_items(self):
+        response = self.post([
+            {'op': 'update', 'id': 999999, 'data': {'title': 'x'}},
+            {'op': 'update', 'id': self.tutorial.pk, 'data': {'title': '循环语句'}},
+        ], atomic=False)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Article.objects.get(pk=self.tutorial.pk).title, '循环语句')
+
+
+class BulkPublishTests(PythonfunTestCase):
+    def setUp(self):
+        super().setUp()
+        self.category = make_category('异常')
+        self.draft = make_tutorial(self.category, 'try语句', is_published=False)
+
+    def publish(self, *articles):
+        return set_published([article.pk for article in articles], True)
+
+    def test_publish_updates_counters(self):
+        results, applied = self.publish(self.draft)
+        self.assertTrue(applied)
+        self.assertEqual(results[0]['status'], 'success')
+        self.assertTrue(Article.objects.get(pk=self.draft.pk).is_published)
+        self.assertEqual(SubCategory.objects.get(pk=self.category.pk).published_tutorial_count, 1)
+
+    def test_blank_rules_match_model_clean(self):
+        # 全角空格等Unicode空白：数据库的TRIM不会去掉，str.strip()会
+        blank_summary = make_tutorial(self.category, '摘要为空', is_published=False, summary='　\n')
+        blank_content = make_tutorial(self.category, '正文为空', is_published=False,
+                                      content_html='　' * (CONTENT_HEAD_LENGTH + 10))
+        for article, message in ((blank_summary, '摘要'), (blank_content, '内容')):
+            article.is_published = True
+            with self.assertRaises(ValidationError):
+                article.clean()
+            results, applied = self.publish(article)
+            self.assertFalse(applied)
+            self.assertIn(message, results[0]['message'])
+
+    def test_long_content_with_leading_whitespace(self):
+        article = make_tutorial(self.category, '缩进', is_published=False,
+                                content_html=' ' * (CONTENT_HEAD_LENGTH + 10) + '<p>正文</p>')
+        results, applied = self.publish(article)
+        self.assertTrue(applied)
+
+    def test_atomic_batch_is_all_or_nothing(self):
+        blank = make_tutorial(self.category, '空摘要', is_published=False, summary=' ')
+        results, applied = self.publish(self.draft, blank)
+        self.assertFalse(applied)
+        self.assertEqual([result['status'] for result in results], ['skipped', 'error'])
+        self.assertFalse(Article.objects.get(pk=self.draft.pk).is_published)
+
+    def test_publish_api_rejects_bad_requests(self):
+        published = make_tutorial(self.category, 'raise语句')
+        for body in ('{"ids": [', '[1]', json.dumps({'ids': [True], 'is_published': False}),
+                     json.dumps({'ids': [published.pk], 'is_published': 'no'})):
+            with self.subTest(body=body):
+                response = self.client.post('/api/courses/bulk/publish/', body, content_type='application/json')
+                self.assertEqual(response.status_code, 400)
+        self.assertTrue(Article.objects.get(pk=published.pk).is_published)
+
+    def test_publish_api(self):
+        response = self.client.post('/api/courses/bulk/publish/', json.dumps({'ids': [self.draft.pk], 'is_published': True}),
+                                    content_type='application/json')
+        self.assertIs(response.json()['applied'], True)
+        self.assertTrue(Article.objects.get(pk=self.draft.pk).is_published)
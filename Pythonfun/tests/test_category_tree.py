@@ -0,0 +1,31 @@
+from Pythonfun.models import SubCategory
+
+from .utils import PythonfunTestCase, make_category, make_tutorial
+
+
+class CategoryTreeApiTests(PythonfunTestCase):
+    url = '/api/category-tree/'
+
+    def setUp(self):
+        super().setUp()
+        self.category = make_category('字典')
+        make_tutorial(self.category, '字典的创建')
+
+    def test_unchanged_tree_returns_not_modified(self):
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_etag_follows_database_not_process_cache(self):
+        etag = self.client.get(self.url)['ETag']
+        # update()不触发信号，相当于其他worker修改了分类而本进程没有收到失效通知
+        SubCategory.objects.filter(pk=self.category.pk).update(name='映射')
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        names = [sub['name'] for main in response.json()['items'] for sub in main['sub_categories']]
+        self.assertEqual(names, ['映射'])
+
+    def test_published_count(self):
+        sub = self.client.get(self.url).json()['items'][0]['sub_categories'][0]
+        self.assertEqual(sub['article_count'], 1)
@@ -0,0 +1,55 @@
+from Pythonfun.category_tree import get_category_tree, navigation_version
+
+from .utils import PythonfunTestCase, make_category, make_tutorial
+
+
+class CategoryTreeCacheTests(PythonfunTestCase):
+    def setUp(self):
+        super().setUp()
+        self.category = make_category('元组')
+        self.article = make_tutorial(self.category, '元组解包')
+
+    def test_cached_tree_needs_no_queries(self):
+        tree = get_category_tree()
+        with self.assertNumQueries(0):
+            self.assertEqual(get_category_tree(), tree)
+        sub = tree[0]['sub_categories'][0]
+        self.assertEqual((sub['name'], sub['article_count']), ('元组', 1))
+
+    def test_category_change_invalidates(self):
+        get_category_tree()
+        version = navigation_version()
+        self.category.name = '不可变序列'
+        self.category.save()
+        self.assertNotEqual(navigation_version(), version)
+        self.assertEqual(get_category_tree()[0]['sub_categories'][0]['name'], '不可变序列')
+
+    def test_body_edit_keeps_navigation_version(self):
+        version = navigation_version()
+        self.article.content_html = '<p>新的正文</p>'
+        self.article.save()
+        self.assertEqual(navigation_version(), version)
+
+    def test_title_or_unpublish_bumps_navigation_version(self):
+        version = navigation_version()
+        self.article.title = '元组拆包'
+        self.article.save()
+        self.assertNotEqual(navigation_version(), version)
+        version = navigation_version()
+        self.article.is_published = False
+        self.article.save()
+        self.assertNotEqual(navigation_version(), version)
+
+    def test_publishing_updates_counts(self):
+        get_category_tree()
+        make_tutorial(self.category, '命名元组')
+        self.assertEqual(get_category_tree()[0]['sub_categories'][0]['article_count'], 2)
+
+    def test_disabled_categories_are_hidden(self):
+        self.category.is_enabled = False
+        self.category.save()
+        self.assertEqual(get_category_tree()[0]['sub_categories'], [])
+
+    def test_index_page_lists_categories(self):
+        response = self.client.get('/')
+        self.assertContains(response, f'/category/{self.category.slug}/')
@@ -0,0 +1,43 @@
+import shutil
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import override_settings
+
+from Pythonfun import static_export
+from Pythonfun.models import RelatedArticle
+
+from .utils import PythonfunTestCase, make_category, make_tutorial
+
+
+class RegeneratingCommandTests(PythonfunTestCase):
+    def setUp(self):
+        super().setUp()
+        self.output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.output_dir)
+        category = make_category('函数定义')
+        self.first = make_tutorial(category, 'def语句', content_html='<p>定义函数 参数 返回值</p>')
+        self.second = make_tutorial(category, 'lambda表达式', content_html='<p>匿名函数 参数 返回值</p>')
+
+    def call(self, name, **options):
+        out = StringIO()
+        call_command(name, stdout=out, stderr=StringIO(), **options)
+        return out.getvalue()
+
+    def test_compile_articles_regenerates_before_exiting(self):
+        with override_settings(PYTHONFUN_STATIC_EXPORT_ON_CHANGE=True, PYTHONFUN_STATIC_EXPORT_DIR=self.output_dir):
+            out = self.call('compile_articles', force=True, workers=1)
+        self.assertIn('已重建', out)
+        self.assertTrue(static_export.output_file(self.output_dir, f'/tutorial/{self.first.pk}/').exists())
+
+    def test_build_related_articles_regenerates_before_exiting(self):
+        with override_settings(PYTHONFUN_STATIC_EXPORT_ON_CHANGE=True, PYTHONFUN_STATIC_EXPORT_DIR=self.output_dir):
+            self.call('build_related_articles')
+        self.assertTrue(RelatedArticle.objects.filter(article=self.first, related=self.second).exists())
+        html = static_export.output_file(self.output_dir, f'/tutorial/{self.first.pk}/').read_text()
+        self.assertIn('lambda表达式', html)
+
+    def test_disabled_regeneration_points_to_export_command(self):
+        out = self.call('compile_articles', force=True, workers=1)
+        self.assertIn('export_static_site', out)
@@ -0,0 +1,77 @@
+import gzip
+from unittest import mock
+
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, modify_settings
+
+from Pythonfun import compression
+from Pythonfun.compression import CompressionMiddleware, compress_variants, negotiate_encoding
+
+from .utils import PythonfunTestCase, make_category, make_tutorial
+
+BODY = ('<p>Python 教程正文</p>' * 100).encode('utf-8')
+
+
+class CompressionMiddlewareTests(PythonfunTestCase):
+    def process(self, response, accept='gzip, deflate'):
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING=accept)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_negotiation_respects_quality(self):
+        factory = RequestFactory()
+        self.assertEqual(negotiate_encoding(factory.get('/', HTTP_ACCEPT_ENCODING='gzip;q=0.5')), 'gzip')
+        self.assertIsNone(negotiate_encoding(factory.get('/', HTTP_ACCEPT_ENCODING='gzip;q=0')))
+        self.assertIsNone(negotiate_encoding(factory.get('/', HTTP_ACCEPT_ENCODING='identity')))
+        self.assertEqual(negotiate_encoding(factory.get('/', HTTP_ACCEPT_ENCODING='*')), 'gzip')
+
+    def test_compresses_dynamic_response(self):
+        response = HttpResponse(BODY)
+        response['ETag'] = '"abc"'
+        response = self.process(response)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), BODY)
+        self.assertEqual(response['Content-Length'], str(len(response.content)))
+        self.assertEqual(response['ETag'], 'W/"abc"')
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    def test_dynamic_html_is_padded(self):
+        bodies = {self.process(HttpResponse(BODY)).content for _ in range(20)}
+        self.assertGreater(len({len(body) for body in bodies}), 1)
+        for body in bodies:
+            self.assertTrue(body[3] & gzip.FNAME)
+            self.assertEqual(gzip.decompress(body), BODY)
+        json_bodies = {self.process(HttpResponse(BODY, content_type='application/json')).content for _ in range(3)}
+        self.assertEqual(len(json_bodies), 1)
+
+    def test_dynamic_html_never_uses_brotli(self):
+        with mock.patch.object(compression, 'available_encodings', return_value=('br', 'gzip')):
+            self.assertFalse(self.process(HttpResponse(BODY), accept='br').has_header('Content-Encoding'))
+            self.assertEqual(self.process(HttpResponse(BODY), accept='br, gzip')['Content-Encoding'], 'gzip')
+
+    def test_uses_precompressed_content(self):
+        response = HttpResponse(BODY)
+        response.precompressed = {'gzip': b'precompressed'}
+        self.assertEqual(self.process(response).content, b'precompressed')
+
+    def test_skips_small_binary_streaming_and_unaccepted(self):
+        self.assertFalse(self.process(HttpResponse('short')).has_header('Content-Encoding'))
+        self.assertFalse(self.process(HttpResponse(BODY, content_type='image/png')).has_header('Content-Encoding'))
+        self.assertFalse(self.process(StreamingHttpResponse([BODY])).has_header('Content-Encoding'))
+        self.assertFalse(self.process(HttpResponse(BODY), accept='identity').has_header('Content-Encoding'))
+
+    def test_variants_are_deterministic(self):
+        self.assertEqual(compress_variants(BODY), compress_variants(BODY))
+        self.assertEqual(compress_variants(b'short'), {})
+
+
+@modify_settings(MIDDLEWARE={'append': 'Pythonfun.compression.CompressionMiddleware'})
+class CachedPageCompressionTests(PythonfunTestCase):
+    def test_cached_page_is_served_precompressed(self):
+        category = make_category('列表')
+        make_tutorial(category, '列表推导式')
+        first = self.client.get('/', HTTP_ACCEPT_ENCODING='gzip')
+        second = self.client.get('/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual((first['X-Page-Cache'], second['X-Page-Cache']), ('MISS', 'HIT'))
+        self.assertEqual(second['Content-Encoding'], 'gzip')
+        self.assertEqual(second.content, first.content)
+        self.assertIn('列表推导式'.encode('utf-8'), gzip.decompress(second.content))
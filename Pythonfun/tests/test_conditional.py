@@ -0,0 +1,42 @@
+from Pythonfun.models import Tag
+
+from .utils import PythonfunTestCase, make_category, make_tutorial
+
+
+class ConditionalGetTests(PythonfunTestCase):
+    def setUp(self):
+        super().setUp()
+        self.category = make_category('字符串')
+        self.tutorial = make_tutorial(self.category, '字符串格式化')
+
+    def assertRevalidates(self, url, change):
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        # 页面缓存在事务提交后清理
+        with self.captureOnCommitCallbacks(execute=True):
+            change()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_course_list_after_sub_category_rename(self):
+        def rename():
+            self.category.name = '文本'
+            self.category.save()
+
+        response = self.assertRevalidates('/api/courses/', rename)
+        self.assertEqual(response.json()['items'][0]['category_name'], '文本')
+
+    def test_tutorial_page_after_main_category_rename(self):
+        def rename():
+            parent = self.category.parent
+            parent.name = 'Python进阶'
+            parent.save()
+
+        response = self.assertRevalidates(f'/tutorial/{self.tutorial.pk}/', rename)
+        self.assertContains(response, 'Python进阶')
+
+    def test_article_detail_after_tag_change(self):
+        tag = Tag.objects.create(name='格式化', slug='format')
+        response = self.assertRevalidates(f'/api/articles/{self.tutorial.pk}/', lambda: self.tutorial.tags.add(tag))
+        self.assertEqual(response.json()['tags'], ['格式化'])
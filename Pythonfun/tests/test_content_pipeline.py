@@ -0,0 +1,56 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from Pythonfun import models
+from Pythonfun.content_pipeline import compile_content, content_hash
+from Pythonfun.models import Article
+
+from .utils import PythonfunTestCase, make_category, make_tutorial
+
+
+class CompileContentTests(SimpleTestCase):
+    def test_sanitizes_markup(self):
+        html = compile_content('<p onclick="x()">正文</p><script>alert(1)</script>'
+                               '<a href="javascript:alert(1)">链接</a>').html
+        self.assertEqual(html, '<p>正文</p><a>链接</a>')
+
+    def test_content_after_void_dropped_tags_is_kept(self):
+        for tag in ('<input type="checkbox">', '<input/>', '<embed src="a.swf">'):
+            with self.subTest(tag=tag):
+                compiled = compile_content(f'<p>A {tag} B</p><h2>Next</h2><p>C</p>')
+                self.assertEqual(compiled.html, '<p>A  B</p><h2 id="next">Next</h2><p>C</p>')
+
+    def test_headings_get_ids_and_toc(self):
+        compiled = compile_content('<h2>第一节</h2><p>内容</p><h3>小节</h3>')
+        self.assertIn('<h2 id="第一节">', compiled.html)
+        self.assertEqual([(item['level'], item['title']) for item in compiled.toc], [(2, '第一节'), (3, '小节')])
+
+    def test_images_are_lazy(self):
+        self.assertIn('loading="lazy"', compile_content('<img src="a.png">').html)
+
+    def test_word_count_and_read_time(self):
+        compiled = compile_content('<p>' + '字' * 600 + ' hello world</p>')
+        self.assertEqual(compiled.word_count, 602)
+        self.assertEqual(compiled.read_time_minutes, 3)
+
+
+class SaveTimeCompilationTests(PythonfunTestCase):
+    def setUp(self):
+        super().setUp()
+        self.article = make_tutorial(make_category('生成器'), 'yield', content_html='<h2>yield</h2><p>生成器</p>')
+
+    def test_compiled_on_save(self):
+        self.assertEqual(self.article.compiled_hash, content_hash(self.article.content_html))
+        self.assertEqual(self.article.toc[0]['title'], 'yield')
+
+    def test_unchanged_content_is_not_recompiled(self):
+        article = Article.objects.get(pk=self.article.pk)
+        with mock.patch.object(models, 'compile_content', wraps=models.compile_content) as compile_mock:
+            article.title = '生成器函数'
+            article.save()
+        compile_mock.assert_not_called()
+
+    def test_page_uses_compiled_html(self):
+        response = self.client.get(f'/tutorial/{self.article.pk}/')
+        self.assertContains(response, '<h2 id="yield">yield</h2>', html=False)
@@ -0,0 +1,52 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+from Pythonfun.models import Article, MainCategory, SubCategory
+
+from .utils import PythonfunTestCase, make_category, make_tutorial
+
+
+class PublishedCounterTests(PythonfunTestCase):
+    def setUp(self):
+        super().setUp()
+        self.first = make_category('整数')
+        self.second = make_category('浮点数')
+
+    def assertCounts(self, first, second):
+        self.assertEqual(SubCategory.objects.get(pk=self.first.pk).published_tutorial_count, first)
+        self.assertEqual(SubCategory.objects.get(pk=self.second.pk).published_tutorial_count, second)
+        self.assertEqual(MainCategory.objects.get(pk=self.first.parent_id).published_tutorial_count, first + second)
+
+    def test_publish_move_unpublish_delete(self):
+        article = make_tutorial(self.first, '整数运算')
+        make_tutorial(self.first, '草稿', is_published=False)
+        self.assertCounts(1, 0)
+        article.category = self.second
+        article.save()
+        self.assertCounts(0, 1)
+        article.is_published = False
+        article.save()
+        self.assertCounts(0, 0)
+        article.is_published = True
+        article.save()
+        article.delete()
+        self.assertCounts(0, 0)
+
+    def test_only_tutorials_are_counted(self):
+        make_tutorial(self.first, '数字的故事', content_type=Article.ContentType.STORY)
+        self.assertCounts(0, 0)
+
+    def test_moving_a_sub_category_moves_its_count(self):
+        make_tutorial(self.first, '整数运算')
+        other_main = MainCategory.objects.create(name='数值', slug='numbers')
+        self.first.parent = other_main
+        self.first.save()
+        self.assertEqual(MainCategory.objects.get(pk=other_main.pk).published_tutorial_count, 1)
+        self.assertEqual(MainCategory.objects.get(pk=self.second.parent_id).published_tutorial_count, 0)
+
+    def test_rebuild_command_repairs_drift(self):
+        make_tutorial(self.first, '整数运算')
+        SubCategory.objects.filter(pk=self.first.pk).update(published_tutorial_count=7)
+        call_command('rebuild_category_counters', stdout=StringIO())
+        self.assertCounts(1, 0)
@@ -0,0 +1,55 @@
+from django.test import override_settings
+
+from Pythonfun.function_index import _SharedIndex, _build_search_index, search_functions
+from Pythonfun.models import FunctionEntry, FunctionModuleState
+
+from .utils import PythonfunTestCase
+
+
+@override_settings(PYTHONFUN_FUNCTION_INDEX_CHECK_INTERVAL=0)
+class SharedFunctionIndexTests(PythonfunTestCase):
+    def setUp(self):
+        super().setUp()
+        FunctionModuleState.objects.create(module='os.path', fingerprint='v1', function_count=1)
+        FunctionEntry.objects.create(qualified_name='os.path.join', name='join', module='os.path')
+        self.builds = 0
+
+        def build(version):
+            self.builds += 1
+            return _build_search_index(version)
+
+        self.index = _SharedIndex(build)
+
+    def test_unchanged_catalog_is_not_rebuilt(self):
+        first = self.index.get()
+        for _ in range(3):
+            self.assertIs(self.index.get(), first)
+        self.assertEqual(self.builds, 1)
+
+    def test_entry_change_rebuilds(self):
+        self.index.get()
+        FunctionEntry.objects.create(qualified_name='os.path.split', name='split', module='os.path')
+        self.assertEqual(self.index.get().search('split'), (FunctionEntry.objects.get(name='split').pk,))
+        self.assertEqual(self.builds, 2)
+
+    def test_new_module_rebuilds(self):
+        self.index.get()
+        FunctionEntry.objects.create(qualified_name='json.dumps', name='dumps', module='json')
+        self.assertTrue(FunctionModuleState.objects.filter(module='json').exists())
+        self.assertEqual(len(self.index.get().search('dumps')), 1)
+
+    def test_ingest_state_change_rebuilds(self):
+        first = self.index.get()
+        FunctionModuleState.objects.filter(module='os.path').update(fingerprint='v2', function_count=2)
+        FunctionModuleState.objects.create(module='shutil', fingerprint='v1', function_count=0)
+        self.assertIsNot(self.index.get(), first)
+
+    def test_search_functions_pages(self):
+        total, entries = search_functions('join')
+        self.assertEqual(total, 1)
+        self.assertEqual(entries[0].qualified_name, 'os.path.join')
+
+    def test_huge_page_numbers_are_clamped(self):
+        response = self.client.get('/api/functions/search/', {'q': 'join', 'page': '99999999999999999999'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['current_page'], 1000)
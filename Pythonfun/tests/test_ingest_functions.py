@@ -0,0 +1,44 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+from Pythonfun.models import FunctionEntry, FunctionModuleState, FunctionParameter
+
+from .utils import PythonfunTestCase
+
+
+class IngestFunctionsTests(PythonfunTestCase):
+    def ingest(self, *args):
+        stdout, stderr = StringIO(), StringIO()
+        call_command('ingest_functions', *args, '--workers', '1', stdout=stdout, stderr=stderr)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_ingests_signatures_and_parameters(self):
+        self.ingest('colorsys')
+        entry = FunctionEntry.objects.get(qualified_name='colorsys.rgb_to_hsv')
+        self.assertEqual(entry.module, 'colorsys')
+        self.assertIn('rgb_to_hsv', entry.source)
+        self.assertEqual(
+            list(FunctionParameter.objects.filter(function=entry).order_by('position').values_list('name', flat=True)),
+            ['r', 'g', 'b'],
+        )
+        state = FunctionModuleState.objects.get(module='colorsys')
+        self.assertEqual(state.function_count, FunctionEntry.objects.filter(module='colorsys').count())
+
+    def test_rerun_is_incremental(self):
+        self.ingest('colorsys')
+        stdout, _ = self.ingest('colorsys')
+        self.assertIn('都是最新的', stdout)
+
+    def test_force_replaces_stale_entries(self):
+        self.ingest('colorsys')
+        count = FunctionEntry.objects.filter(module='colorsys').count()
+        FunctionEntry.objects.create(qualified_name='colorsys.removed', name='removed', module='colorsys')
+        self.ingest('colorsys', '--force')
+        self.assertFalse(FunctionEntry.objects.filter(qualified_name='colorsys.removed').exists())
+        self.assertEqual(FunctionEntry.objects.filter(module='colorsys').count(), count)
+
+    def test_unknown_module_is_skipped(self):
+        _, stderr = self.ingest('no_such_module_xyz')
+        self.assertIn('no_such_module_xyz', stderr)
+        self.assertFalse(FunctionModuleState.objects.exists())
@@ -0,0 +1,63 @@
+from datetime import timedelta
+
+from django.urls import reverse
+from django.utils import timezone
+
+from Pythonfun.models import Library, LibraryItem, LibraryModule
+from Pythonfun.views import LIBRARY_PAGE_SIZE
+
+from .utils import PythonfunTestCase
+
+
+class FunctionLibraryTests(PythonfunTestCase):
+    def setUp(self):
+        super().setUp()
+        # 迁移里带有初始的函数库数据
+        Library.objects.all().delete()
+        library = Library.objects.create(key='builtins', name='Python内置库')
+        self.module = LibraryModule.objects.create(library=library, name='os')
+        self.other = LibraryModule.objects.create(library=library, name='json', order=1)
+        LibraryItem.objects.bulk_create(
+            [LibraryItem(module=self.module, position=0, kind=LibraryItem.Kind.CLASS, name='DirEntry')]
+            + [LibraryItem(module=self.module, position=i, kind=LibraryItem.Kind.FUNCTION, name=f'func{i}')
+               for i in range(1, LIBRARY_PAGE_SIZE + 6)]
+        )
+        LibraryItem.objects.create(module=self.other, position=0, kind=LibraryItem.Kind.FUNCTION, name='loads')
+        self.module.refresh_from_db()
+        self.other.refresh_from_db()
+
+    def url(self, module):
+        return reverse('Pythonfun:library_module_api', args=[module.pk])
+
+    def test_page_renders_only_first_module(self):
+        response = self.client.get(reverse('Pythonfun:function_library'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['first_module'], self.module)
+        self.assertEqual(len(response.context['first_rows']), LIBRARY_PAGE_SIZE)
+        self.assertTrue(response.context['first_has_more'])
+        self.assertEqual(response.context['first_classes'], ['DirEntry'])
+        self.assertNotContains(response, 'loads')
+
+    def test_module_api_pages_items(self):
+        path = self.url(self.module)
+        data = self.client.get(path, {'page': 2}).json()
+        self.assertEqual(data['total_items'], LIBRARY_PAGE_SIZE + 6)
+        self.assertEqual(data['current_page'], 2)
+        self.assertEqual(len(data['items']), 6)
+        self.assertEqual(data['version'], self.module.version)
+
+    def test_versioned_url_is_cached_long_term(self):
+        path = self.url(self.other)
+        response = self.client.get(path, {'v': self.other.version})
+        self.assertIn('immutable', response['Cache-Control'])
+        response = self.client.get(path, {'v': 'stale'})
+        self.assertNotIn('immutable', response['Cache-Control'])
+        self.assertIn('max-age=60', response['Cache-Control'])
+
+    def test_item_change_bumps_module_version(self):
+        LibraryModule.objects.filter(pk=self.other.pk).update(updated_at=timezone.now() - timedelta(days=1))
+        self.other.refresh_from_db()
+        version = self.other.version
+        LibraryItem.objects.create(module=self.other, position=1, kind=LibraryItem.Kind.FUNCTION, name='dumps')
+        self.other.refresh_from_db()
+        self.assertNotEqual(self.other.version, version)
@@ -0,0 +1,38 @@
+from django.template.loader import render_to_string
+
+from Pythonfun.category_tree import get_category_tree, invalidate_category_tree
+
+from .utils import PythonfunTestCase, make_category, make_tutorial
+
+
+class NavigationFragmentTests(PythonfunTestCase):
+    def setUp(self):
+        super().setUp()
+        self.category = make_category('集合')
+        make_tutorial(self.category, '集合运算')
+
+    def render_sidebar(self, tree):
+        return render_to_string('front/includes/sidebar.html', {'category_tree': tree})
+
+    def test_sidebar_is_served_from_fragment_cache(self):
+        first = self.render_sidebar(get_category_tree())
+        self.assertIn('集合', first)
+        # 版本未变时不再读取上下文中的分类树
+        self.assertEqual(self.render_sidebar([]), first)
+
+    def test_invalidation_rerenders_sidebar(self):
+        self.render_sidebar(get_category_tree())
+        invalidate_category_tree()
+        self.assertIn('暂无分类', self.render_sidebar([]))
+
+    def test_category_rename_rerenders_sidebar(self):
+        self.render_sidebar(get_category_tree())
+        self.category.name = '冻结集合'
+        self.category.save()
+        self.assertIn('冻结集合', self.render_sidebar(get_category_tree()))
+
+    def test_header_is_cached_per_active_link(self):
+        index = render_to_string('front/includes/header.html', {'active': 'index'})
+        library = render_to_string('front/includes/header.html', {'active': 'function_library'})
+        self.assertNotEqual(index, library)
+        self.assertEqual(render_to_string('front/includes/header.html', {'active': 'index'}), index)
@@ -0,0 +1,75 @@
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.management import call_command
+from django.test import override_settings
+
+from Pythonfun.category_tree import invalidate_category_tree, navigation_version
+from Pythonfun.page_cache import PAGE_CACHE_STATS_KEYS, get_page_cache_stats, purge_pages
+
+from .utils import PythonfunTestCase, make_category, make_tutorial
+
+
+class PageCacheTests(PythonfunTestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir)
+        # 与settings一致使用文件缓存，模拟多个worker共享；页面缓存条目很少时就淘汰（CULL_FREQUENCY=1清空全部）
+        self.enterContext(override_settings(CACHES={
+            'default': {
+                'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                'LOCATION': os.path.join(self.cache_dir, 'default'),
+                'OPTIONS': {'MAX_ENTRIES': 3, 'CULL_FREQUENCY': 1},
+            },
+            'pythonfun_state': {
+                'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                'LOCATION': os.path.join(self.cache_dir, 'state'),
+            },
+        }))
+        super().setUp()
+        self.tutorial = make_tutorial(make_category('列表'), '列表推导式')
+        self.path = f'/tutorial/{self.tutorial.pk}/'
+
+    def test_second_request_is_a_hit(self):
+        self.assertEqual(self.client.get(self.path)['X-Page-Cache'], 'MISS')
+        self.assertEqual(self.client.get(self.path)['X-Page-Cache'], 'HIT')
+        stats = get_page_cache_stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+        self.assertEqual(stats['hit_ratio'], 0.5)
+
+    def test_stats_are_visible_to_other_processes(self):
+        self.client.get(self.path)
+        other_worker = FileBasedCache(os.path.join(self.cache_dir, 'state'), {})
+        self.assertEqual(other_worker.get(PAGE_CACHE_STATS_KEYS['miss']), 1)
+
+    def test_purge_pages_forces_a_miss(self):
+        self.client.get(self.path)
+        purge_pages([self.path])
+        self.assertEqual(self.client.get(self.path)['X-Page-Cache'], 'MISS')
+
+    def test_stats_command_reset(self):
+        self.client.get(self.path)
+        out = StringIO()
+        call_command('page_cache_stats', reset=True, stdout=out)
+        self.assertIn('未命中: 1', out.getvalue())
+        self.assertEqual(get_page_cache_stats()['misses'], 0)
+
+    def test_state_survives_page_cache_culling(self):
+        self.client.get(self.path)
+        version = navigation_version()
+        for i in range(10):
+            cache.set(f'filler:{i}', i)
+        self.assertIsNone(cache.get('filler:0'))
+        self.assertEqual(get_page_cache_stats()['misses'], 1)
+        self.assertEqual(navigation_version(), version)
+
+    def test_invalidation_always_changes_the_version(self):
+        versions = {navigation_version()}
+        for _ in range(5):
+            invalidate_category_tree()
+            versions.add(navigation_version())
+        self.assertEqual(len(versions), 6)
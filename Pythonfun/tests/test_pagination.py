@@ -0,0 +1,64 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from Pythonfun.models import Article, MainCategory
+from Pythonfun.pagination import InvalidCursor, decode_cursor, encode_cursor
+
+from .utils import PythonfunTestCase, make_category, make_tutorial
+
+
+class CursorPaginationTests(PythonfunTestCase):
+    def setUp(self):
+        super().setUp()
+        category = make_category('字典')
+        self.tutorials = [make_tutorial(category, f'字典教程{i}') for i in range(7)]
+        # 部分教程创建时间相同，按id决定先后
+        now = timezone.now()
+        for i, tutorial in enumerate(self.tutorials):
+            Article.objects.filter(pk=tutorial.pk).update(created_at=now - timedelta(minutes=i // 3))
+        # 按 -created_at, -id 排序：先比较所在分组，组内id大的在前
+        self.expected = [
+            tutorial.pk for _, tutorial in sorted(enumerate(self.tutorials), key=lambda pair: (pair[0] // 3, -pair[1].pk))
+        ]
+
+    def walk(self, url, **params):
+        ids = []
+        pages = []
+        params = {'cursor': '', 'page_size': 3, **params}
+        while True:
+            data = self.client.get(url, params).json()
+            ids += [item['id'] for item in data['items']]
+            pages.append(data)
+            if not data['next_cursor']:
+                return ids, pages
+            params['cursor'] = data['next_cursor']
+
+    def test_forward_walk_visits_each_row_once(self):
+        ids, pages = self.walk('/api/courses/')
+        self.assertEqual(ids, self.expected)
+        self.assertIsNone(pages[0]['prev_cursor'])
+        self.assertNotIn('total_items', pages[0])
+
+    def test_prev_cursor_returns_previous_page(self):
+        _, pages = self.walk('/api/courses/')
+        data = self.client.get('/api/courses/', {'cursor': pages[2]['prev_cursor'], 'page_size': 3}).json()
+        self.assertEqual([item['id'] for item in data['items']], self.expected[3:6])
+        self.assertIsNotNone(data['next_cursor'])
+
+    def test_total_is_opt_in(self):
+        data = self.client.get('/api/courses/', {'cursor': '', 'total': '1'}).json()
+        self.assertEqual(data['total_items'], 7)
+
+    def test_invalid_cursor_is_rejected(self):
+        for cursor in ['not-base64!', encode_cursor([1]), encode_cursor(['not a date', 1])]:
+            with self.subTest(cursor=cursor):
+                self.assertEqual(self.client.get('/api/courses/', {'cursor': cursor}).status_code, 400)
+        with self.assertRaises(InvalidCursor):
+            decode_cursor('e30', Article, ('-created_at', '-id'))
+
+    def test_category_apis_support_cursor(self):
+        ids, _ = self.walk('/api/main-categories/', page_size=1)
+        self.assertEqual(ids, list(MainCategory.objects.order_by('order', 'id').values_list('id', flat=True)))
+        data = self.client.get('/api/sub-categories/', {'cursor': '', 'page_size': 100}).json()
+        self.assertIsNone(data['next_cursor'])
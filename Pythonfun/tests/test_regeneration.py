@@ -0,0 +1,54 @@
+import shutil
+import tempfile
+from unittest import mock
+
+from django.test import override_settings
+
+from Pythonfun import static_export
+
+from .utils import PythonfunTestCase, make_category, make_tutorial
+
+
+class IncrementalRegenerationTests(PythonfunTestCase):
+    def setUp(self):
+        super().setUp()
+        self.output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.output_dir)
+        self.category = make_category('文件')
+        self.tutorial = make_tutorial(self.category, '读取文件')
+        self.path = f'/tutorial/{self.tutorial.pk}/'
+
+    def test_unpublished_pages_are_removed(self):
+        static_export.regenerate(self.output_dir)
+        self.assertTrue(static_export.output_file(self.output_dir, self.path).exists())
+        self.tutorial.is_published = False
+        self.tutorial.save()
+        result = static_export.regenerate(self.output_dir, [self.path])
+        self.assertEqual(result.removed, [self.path])
+        self.assertFalse(static_export.output_file(self.output_dir, self.path).exists())
+
+    def test_only_given_paths_are_checked(self):
+        static_export.regenerate(self.output_dir)
+        other = make_tutorial(make_category('目录'), '遍历目录')
+        result = static_export.regenerate(self.output_dir, [self.path])
+        self.assertNotIn(f'/tutorial/{other.pk}/', result.rendered)
+
+    @override_settings(PYTHONFUN_STATIC_EXPORT_ON_CHANGE=True, PYTHONFUN_STATIC_EXPORT_DEBOUNCE=0.05)
+    def test_changes_are_batched_into_one_background_run(self):
+        with mock.patch.object(static_export, 'regenerate') as regenerate:
+            regenerate.return_value = static_export.ExportResult(total=0)
+            with self.captureOnCommitCallbacks(execute=True):
+                self.tutorial.title = '按行读取文件'
+                self.tutorial.save()
+                make_tutorial(self.category, '写入文件')
+            static_export._worker_thread.join(timeout=5)
+        self.assertEqual(regenerate.call_count, 1)
+        paths = regenerate.call_args[0][1]
+        self.assertIn(self.path, paths)
+        self.assertIn(f'/category/{self.category.slug}/', paths)
+
+    def test_disabled_by_default(self):
+        with mock.patch.object(static_export, 'regenerate') as regenerate:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.tutorial.save()
+        regenerate.assert_not_called()
@@ -0,0 +1,58 @@
+import numpy as np
+from django.test import SimpleTestCase
+
+from Pythonfun.models import Article, RelatedArticle
+from Pythonfun.related import TfidfIndex, build_related_articles
+
+from .utils import PythonfunTestCase, make_category, make_tutorial
+
+
+class TfidfIndexTests(SimpleTestCase):
+    def test_similarities_match_dense_cosine(self):
+        documents = ['列表 推导式 列表', '列表 切片', '字典 推导式', '集合 字典 推导式', '字符串 切片']
+        index = TfidfIndex(documents)
+        dense = np.zeros((index.n_docs, int(index.indices.max()) + 1))
+        for row in range(index.n_docs):
+            start, end = index.indptr[row], index.indptr[row + 1]
+            dense[row, index.indices[start:end]] = index.data[start:end]
+        for row in range(index.n_docs):
+            np.testing.assert_allclose(index.similarities(row), dense @ dense[row], rtol=1e-5, atol=1e-6)
+
+
+class BuildRelatedArticlesTests(PythonfunTestCase):
+    def setUp(self):
+        super().setUp()
+        category = make_category('类')
+        self.classes = make_tutorial(category, '类的定义', content_html='<p>类 属性 方法 继承</p>')
+        self.inherit = make_tutorial(category, '继承', content_html='<p>类 继承 方法 重写</p>')
+        self.files = make_tutorial(make_category('文件'), '文件读写', content_html='<p>打开 文件 读取</p>')
+        self.story = make_tutorial(category, '类的故事', content_type=Article.ContentType.STORY,
+                                   content_html='<p>类 属性 方法 继承</p>')
+
+    def related_ids(self, article):
+        return list(RelatedArticle.objects.filter(article=article).order_by('rank').values_list('related_id', flat=True))
+
+    def test_related_tutorials(self):
+        build_related_articles()
+        self.assertEqual(self.related_ids(self.classes)[0], self.inherit.pk)
+        for article in (self.classes, self.inherit, self.files, self.story):
+            ids = self.related_ids(article)
+            self.assertNotIn(article.pk, ids)
+            # 只推荐教程
+            self.assertNotIn(self.story.pk, ids)
+
+    def test_incremental_rebuild(self):
+        build_related_articles()
+        self.assertEqual(build_related_articles()['rescored'], 0)
+        self.files.content_html = '<p>类 方法 继承 文件</p>'
+        self.files.save()
+        stats = build_related_articles()
+        self.assertGreater(stats['rescored'], 0)
+        self.assertIn(self.files.pk, self.related_ids(self.classes))
+
+    def test_tutorial_page_shows_related(self):
+        build_related_articles()
+        response = self.client.get(f'/tutorial/{self.classes.pk}/')
+        self.assertEqual([article.pk for article in response.context['related_tutorials']],
+                         self.related_ids(self.classes))
+        self.assertContains(response, '继承')
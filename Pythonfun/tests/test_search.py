@@ -0,0 +1,50 @@
+import math
+
+from Pythonfun.models import SearchDocument, SearchPosting
+from Pythonfun.search import B, K1, collection_stats, rank, search_articles
+
+from .utils import PythonfunTestCase, make_category, make_tutorial
+
+
+class SearchTests(PythonfunTestCase):
+    def setUp(self):
+        super().setUp()
+        self.category = make_category('模块')
+        self.imports = make_tutorial(self.category, '导入模块', content_html='<p>import语句导入模块</p>')
+        self.packages = make_tutorial(self.category, '包的结构', content_html='<p>包由多个模块组成</p>')
+        for i in range(3):
+            make_tutorial(self.category, f'草稿{i}', is_published=False, content_html='<p>尚未完成的import示例</p>')
+
+    def test_statistics_only_count_published_documents(self):
+        self.assertEqual(collection_stats()['total'], 2)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.packages.is_published = False
+            self.packages.save()
+        self.assertEqual(collection_stats()['total'], 1)
+
+    def test_scores_use_the_published_collection(self):
+        total, hits = rank('import', 10)
+        self.assertEqual(total, 1)
+        posting = SearchPosting.objects.get(term='import', article=self.imports)
+        published = SearchDocument.objects.filter(article__is_published=True)
+        avg_length = sum(published.values_list('length', flat=True)) / published.count()
+        # 文档总数和文档频率都只算两篇已发布文章：n=2, df=1
+        idf = math.log(1 + (2 - 1 + 0.5) / (1 + 0.5))
+        norm = K1 * (1 - B + B * posting.doc_length / avg_length)
+        self.assertEqual(hits[0][0], self.imports.pk)
+        self.assertAlmostEqual(hits[0][1], idf * posting.tf * (K1 + 1) / (posting.tf + norm))
+
+    def test_drafts_are_not_returned(self):
+        total, articles = search_articles('尚未完成')
+        self.assertEqual((total, articles), (0, []))
+
+    def test_title_matches_rank_first(self):
+        total, articles = search_articles('导入')
+        self.assertEqual(articles[0].pk, self.imports.pk)
+
+    def test_huge_page_numbers_are_clamped(self):
+        response = self.client.get('/api/search/', {'q': '模块', 'page': '99999999999999999999'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['current_page'], 1000)
+        response = self.client.get('/search/', {'q': '模块', 'page': '99999999999999999999'})
+        self.assertEqual(response.context['page'], 1000)
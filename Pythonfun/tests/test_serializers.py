@@ -0,0 +1,49 @@
+import datetime
+import json
+
+from django.test import SimpleTestCase
+
+from Pythonfun.serializers import dumps, stdlib_dumps
+
+from .utils import PythonfunTestCase, make_category, make_tutorial
+
+
+class DumpsTests(SimpleTestCase):
+    def test_matches_stdlib_output(self):
+        data = {'名称': '列表', 'created_at': datetime.datetime(2024, 5, 1, 8, 30), 'tags': ['a', 'b'], 'n': None}
+        self.assertEqual(json.loads(dumps(data)), json.loads(stdlib_dumps(data)))
+        self.assertEqual(json.loads(dumps(data))['created_at'], '2024-05-01T08:30:00')
+
+    def test_integers_wider_than_64_bits(self):
+        self.assertEqual(json.loads(dumps({'page': 10 ** 20})), {'page': 10 ** 20})
+
+    def test_unserializable_objects_still_raise(self):
+        with self.assertRaises(TypeError):
+            dumps({'value': object()})
+
+
+class ApiSerializationTests(PythonfunTestCase):
+    def setUp(self):
+        super().setUp()
+        self.category = make_category('集合')
+        self.tutorial = make_tutorial(self.category, '集合运算')
+
+    def test_course_detail(self):
+        data = self.client.get(f'/api/courses/{self.tutorial.pk}/').json()
+        self.assertEqual(data['title'], '集合运算')
+        self.assertEqual(data['category_id'], self.category.pk)
+        self.assertEqual(data['category_name'], '集合')
+        self.assertEqual(data['tags'], [])
+        self.assertTrue(data['is_published'])
+        self.assertIn('集合运算的正文', data['content_html'])
+
+    def test_detail_not_found(self):
+        self.assertEqual(self.client.get('/api/articles/999999/').status_code, 404)
+        self.assertEqual(self.client.get('/api/sub-categories/999999/').status_code, 404)
+
+    def test_category_details(self):
+        sub = self.client.get(f'/api/sub-categories/{self.category.pk}/').json()
+        self.assertEqual(sub, {'id': self.category.pk, 'name': '集合',
+                               'parent_id': self.category.parent_id, 'is_enabled': True})
+        main = self.client.get(f'/api/main-categories/{self.category.parent_id}/').json()
+        self.assertEqual(set(main), {'id', 'name', 'order', 'is_enabled'})
@@ -0,0 +1,90 @@
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from Pythonfun import static_export
+from Pythonfun.models import RelatedArticle
+from Pythonfun.page_dependencies import article_page_paths
+
+from .utils import PythonfunTestCase, make_category, make_tutorial
+
+
+class StaticExportTests(PythonfunTestCase):
+    def setUp(self):
+        super().setUp()
+        self.output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.output_dir)
+        self.category = make_category('变量')
+        self.first = make_tutorial(self.category, '变量入门')
+        self.second = make_tutorial(self.category, '变量作用域')
+
+    def export(self):
+        return static_export.regenerate(self.output_dir)
+
+    def test_exports_every_page(self):
+        result = self.export()
+        self.assertEqual(result.failed, {})
+        self.assertEqual(len(result.rendered), result.total)
+        html = static_export.output_file(self.output_dir, f'/tutorial/{self.first.pk}/').read_text()
+        self.assertIn('变量入门', html)
+        self.assertIn(f'/tutorial/{self.second.pk}/', html)
+
+    def test_unchanged_pages_are_skipped(self):
+        self.export()
+        self.assertEqual(self.export().rendered, [])
+
+    def test_only_full_exports_rescan_templates(self):
+        self.export()
+        with mock.patch.object(static_export, '_scan_templates', wraps=static_export._scan_templates) as scan:
+            static_export.regenerate(self.output_dir, [f'/tutorial/{self.first.pk}/'])
+            self.assertEqual(scan.call_count, 0)
+            self.export()
+            self.assertEqual(scan.call_count, 1)
+
+    def test_render_path_serves_anonymous_visitor(self):
+        html = static_export.render_path(f'/tutorial/{self.first.pk}/').decode('utf-8')
+        self.assertIn('变量入门', html)
+
+    def test_renaming_a_neighbour_regenerates_its_links(self):
+        self.export()
+        self.second.title = '作用域与闭包'
+        self.second.save()
+        rendered = set(self.export().rendered)
+        first_page = f'/tutorial/{self.first.pk}/'
+        self.assertTrue({'/', f'/category/{self.category.slug}/', first_page} <= rendered)
+        html = static_export.output_file(self.output_dir, first_page).read_text()
+        self.assertIn('作用域与闭包', html)
+
+    def test_renaming_a_related_tutorial_regenerates_referrers(self):
+        other = make_tutorial(make_category('函数'), '函数参数')
+        RelatedArticle.objects.create(article=other, related=self.first, rank=1, score=0.5)
+        self.export()
+        self.first.title = '变量基础'
+        self.first.save()
+        self.assertIn(f'/tutorial/{other.pk}/', self.export().rendered)
+
+    def test_related_tutorials_are_page_dependencies(self):
+        other = make_tutorial(make_category('函数'), '函数参数')
+        RelatedArticle.objects.create(article=other, related=self.first, rank=1, score=0.5)
+        self.assertIn(f'/tutorial/{other.pk}/', article_page_paths(self.first.pk, [self.category.pk]))
+
+    def test_command_fails_when_pages_fail(self):
+        with mock.patch.object(static_export, 'render_path', side_effect=ValueError('boom')):
+            with self.assertRaises(CommandError):
+                call_command('export_static_site', output=self.output_dir, workers=1,
+                             stdout=StringIO(), stderr=StringIO())
+
+
+class FrontTemplateTests(PythonfunTestCase):
+    def test_unknown_category_renders_not_found_page(self):
+        response = self.client.get('/category/missing/')
+        self.assertContains(response, '页面不存在', status_code=404)
+
+    def test_unpublished_tutorial_is_not_found(self):
+        draft = make_tutorial(make_category('草稿'), '草稿教程', is_published=False)
+        response = self.client.get(f'/tutorial/{draft.pk}/')
+        self.assertContains(response, '教程不存在或未发布', status_code=404)
@@ -0,0 +1,60 @@
+import re
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import CommandError, call_command
+from django.test import override_settings
+
+from Pythonfun.management.commands.extract_template_assets import extract
+
+from .utils import PythonfunTestCase
+
+STATIC_REFERENCE_RE = re.compile(r"""\{% static '(pythonfun/[^']+)' %\}""")
+
+
+class ExtractTemplateAssetsTests(PythonfunTestCase):
+    def test_extracts_plain_blocks_after_extends(self):
+        source = (
+            '{% extends "base.html" %}\n'
+            '<style>\n    body { margin: 0; }\n</style>\n'
+            '<script>\n    run();\n</script>\n'
+            '<script>var url = "{% url \'Pythonfun:index\' %}";</script>\n'
+            '<script src="/x.js"></script>\n'
+        )
+        result, assets, skipped = extract(source, 'front/page.html')
+        self.assertEqual(assets, {
+            'pythonfun/front/page.css': 'body { margin: 0; }\n',
+            'pythonfun/front/page.js': 'run();\n',
+        })
+        self.assertEqual(skipped, 1)
+        self.assertTrue(result.startswith('{% extends "base.html" %}\n{% load static %}\n'))
+        self.assertIn('<link rel="stylesheet" href="{% static \'pythonfun/front/page.css\' %}">', result)
+        self.assertIn('{% url \'Pythonfun:index\' %}', result)
+        self.assertIn('<script src="/x.js"></script>', result)
+
+    def test_command_writes_assets_and_refuses_conflicts(self):
+        root = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        (root / 'templates').mkdir()
+        template = root / 'templates' / 'page.html'
+        template.write_text('<style>p { color: red; }</style>', encoding='utf-8')
+        templates = [{**settings.TEMPLATES[0], 'DIRS': [str(root / 'templates')]}]
+        with override_settings(TEMPLATES=templates, STATICFILES_DIRS=[str(root / 'static')]):
+            call_command('extract_template_assets', '--dry-run', stdout=StringIO())
+            self.assertFalse((root / 'static').exists())
+            call_command('extract_template_assets', stdout=StringIO())
+            self.assertEqual((root / 'static/pythonfun/page.css').read_text(encoding='utf-8'), 'p { color: red; }\n')
+            self.assertIn("{% static 'pythonfun/page.css' %}", template.read_text(encoding='utf-8'))
+
+            template.write_text('<style>p { color: blue; }</style>', encoding='utf-8')
+            with self.assertRaises(CommandError):
+                call_command('extract_template_assets', stdout=StringIO())
+
+    def test_referenced_assets_exist(self):
+        template_dir = Path(settings.BASE_DIR) / 'templates'
+        static_dir = Path(settings.BASE_DIR) / 'static'
+        for path in template_dir.rglob('*.html'):
+            for name in STATIC_REFERENCE_RE.findall(path.read_text(encoding='utf-8')):
+                with self.subTest(template=path.name, asset=name):
+                    self.assertTrue((static_dir / name).is_file())
@@ -0,0 +1,37 @@
+import os
+import tempfile
+
+from django.template import engines
+from django.test import override_settings
+
+from Pythonfun.template_warmup import warm_templates
+
+from .utils import PythonfunTestCase
+
+
+class TemplateWarmupTests(PythonfunTestCase):
+    def setUp(self):
+        super().setUp()
+        directory = self.enterContext(tempfile.TemporaryDirectory())
+        os.makedirs(os.path.join(directory, 'front'))
+        for name, source in [('base.html', '{% block body %}{% endblock %}'),
+                             ('front/page.html', '{% extends "base.html" %}{% block body %}ok{% endblock %}'),
+                             ('broken.html', '{% if %}'),
+                             ('notes.md', '{% if %}')]:
+            with open(os.path.join(directory, name), 'w', encoding='utf-8') as f:
+                f.write(source)
+        self.enterContext(override_settings(TEMPLATES=[{
+            'BACKEND': 'django.template.backends.django.DjangoTemplates',
+            'DIRS': [directory],
+            'OPTIONS': {'loaders': [('django.template.loaders.cached.Loader', [
+                'django.template.loaders.filesystem.Loader',
+            ])]},
+        }]))
+
+    def test_compiles_templates_into_cached_loader(self):
+        with self.assertLogs('Pythonfun.template_warmup', 'WARNING') as logs:
+            self.assertEqual(warm_templates(), 2)
+        self.assertIn('broken.html', logs.output[0])
+        loader = engines['django'].engine.template_loaders[0]
+        self.assertIn('front/page.html', loader.get_template_cache)
+        self.assertEqual(engines['django'].get_template('front/page.html').render().strip(), 'ok')
@@ -0,0 +1,6 @@
+from django.urls import include, path
+
+# mysite.urls目前只挂载测试路由，测试时直接挂载Pythonfun的路由
+urlpatterns = [
+    path('', include('Pythonfun.urls')),
+]
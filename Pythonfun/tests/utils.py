@@ -0,0 +1,39 @@
+import hashlib
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from Pythonfun.models import Article, MainCategory, SubCategory
+
+
+@override_settings(
+    ROOT_URLCONF='Pythonfun.tests.urls',
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    PYTHONFUN_STATIC_EXPORT_ON_CHANGE=False,
+    # 测试不执行collectstatic，没有带哈希文件名的清单
+    STORAGES={
+        'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+        'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    },
+)
+class PythonfunTestCase(TestCase):
+    """挂载Pythonfun路由、使用独立的内存缓存和不带哈希的静态文件存储，并关闭发布后的后台导出"""
+
+    def setUp(self):
+        cache.clear()
+
+
+def _slug(name):
+    return 'c' + hashlib.md5(name.encode('utf-8')).hexdigest()[:8]
+
+
+def make_category(name='基础语法', slug=None, parent_name='Python基础'):
+    parent, _ = MainCategory.objects.get_or_create(
+        name=parent_name, defaults={'slug': _slug(parent_name)})
+    return SubCategory.objects.create(parent=parent, name=name, slug=slug or _slug(name))
+
+
+def make_tutorial(category, title, is_published=True, **kwargs):
+    kwargs.setdefault('summary', f'{title}的摘要')
+    kwargs.setdefault('content_html', f'<h2>{title}</h2><p>{title}的正文</p>')
+    return Article.objects.create(title=title, category=category, is_published=is_published, **kwargs)
@@ -0,0 +1,28 @@
+import re
+from html import unescape
+
+from django.utils.html import strip_tags
+
+# 中文按字符二元组切分，英文、代码标识符按单词切分
+_TOKEN_RE = re.compile(r'[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+|[A-Za-z_][A-Za-z0-9_]*|\d+')
+_CJK_RE = re.compile(r'[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]')
+
+
+def html_to_text(html):
+    """去掉HTML标签和实体，得到纯文本"""
+    return unescape(strip_tags(html or ''))
+
+
+def tokenize(text):
+    """把文本切分为检索/相似度计算用的词项"""
+    tokens = []
+    for match in _TOKEN_RE.finditer(text or ''):
+        chunk = match.group()
+        if _CJK_RE.match(chunk):
+            if len(chunk) == 1:
+                tokens.append(chunk)
+            else:
+                tokens.extend(chunk[i:i + 2] for i in range(len(chunk) - 1))
+        else:
+            tokens.append(chunk.lower())
+    return tokens
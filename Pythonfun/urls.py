@@ -13,22 +13,37 @@ urlpatterns = [
     
     # 前台页面路由
     path('tutorial/<int:pk>/', views.tutorial_detail_view, name='tutorial_detail'),
+    path('search/', views.search_view, name='search'),
     
     # API 路由 - 分类管理
     path('api/main-categories/', views.main_category_api, name='main_category_api'),
     path('api/main-categories/<int:pk>/', views.main_category_detail_api, name='main_category_detail_api'),
     path('api/sub-categories/', views.sub_category_api, name='sub_category_api'),
     path('api/sub-categories/<int:pk>/', views.sub_category_detail_api, name='sub_category_detail_api'),
+    path('api/category-tree/', views.category_tree_api, name='category_tree_api'),
     
     # API 路由 - 文章管理
     path('api/articles/', views.article_api, name='article_api'),
+    path('api/articles/bulk/', views.article_bulk_api, name='article_bulk_api'),
     path('api/articles/<int:pk>/', views.article_detail_api, name='article_detail_api'),
     
     # API 路由 - 教程管理
     path('api/courses/', views.course_api, name='course_api'),
+    path('api/courses/bulk/', views.course_bulk_api, name='course_bulk_api'),
+    path('api/courses/bulk/publish/', views.course_bulk_publish_api, name='course_bulk_publish_api'),
     path('api/courses/<int:pk>/', views.course_detail_api, name='course_detail_api'),
     path('api/courses/<int:pk>/publish/', views.course_publish_api, name='course_publish_api'),
     
+    # API 路由 - 全文检索
+    path('api/search/', views.search_api, name='search_api'),
+    
+    # API 路由 - 函数查询
+    path('api/functions/search/', views.function_search_api, name='function_search_api'),
+    path('api/functions/suggest/', views.function_suggest_api, name='function_suggest_api'),
+    
+    # API 路由 - 函数库分节数据
+    path('api/library-modules/<int:pk>/items/', views.library_module_api, name='library_module_api'),
+    
     # 导航栏页面路由
     path('function-library/', views.function_library_view, name='function_library'),
     path('function-query/', views.function_query_view, name='function_query'),
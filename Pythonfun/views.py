@@ -1,18 +1,46 @@
 import json
 from django.core.paginator import Paginator, EmptyPage
-from django.http import JsonResponse
+from django.db import DatabaseError, transaction
+from django.http import Http404
+from django.utils.cache import patch_cache_control
 from django.shortcuts import render, get_object_or_404
-from django.views.decorators.http import require_http_methods
+from django.views.decorators.http import require_http_methods, condition
 from django.views.decorators.csrf import csrf_exempt
-from .models import MainCategory, SubCategory, Article, Tag
+from .models import MainCategory, SubCategory, Article, Tag, RelatedArticle, Library, LibraryModule, LibraryItem
+from .category_tree import get_category_tree
+from .page_cache import cache_front_page
+from . import conditional
+from .search import search_articles
+from .function_index import get_suggest_index, search_functions
+from .pagination import InvalidCursor, MAX_PAGE_SIZE, cursor_paginate
+from .bulk import MAX_OPERATIONS, apply_article_operations, is_id, set_published
+from .serializers import (
+    ARTICLE_DETAIL_FIELDS, ARTICLE_DETAIL_SCHEMA, ARTICLE_SCHEMA, COURSE_DETAIL_FIELDS, COURSE_FIELDS,
+    MAIN_CATEGORY_SCHEMA, SUB_CATEGORY_SCHEMA, JsonResponse,
+)
 
 from django.contrib.auth import authenticate, login
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render, redirect
+from django.urls import reverse
 from django.contrib import messages
 
 # ========== 页面渲染视图 ==========
 
+# 函数库页面每次输出或获取的条目数
+LIBRARY_PAGE_SIZE = 100
+# 带版本号的分节数据内容不会再变化，浏览器可以长期缓存
+LIBRARY_SECTION_MAX_AGE = 365 * 24 * 60 * 60
+# 检索结果按页码切片，页码过大时偏移量没有意义（超出64位的整数也无法编码）
+MAX_SEARCH_PAGE = 1000
+
+# 前后篇只用于生成链接，不需要读取正文
+NAVIGATION_RELATED = ('prev_in_category', 'next_in_category')
+NAVIGATION_DEFERRED = tuple(
+    f'{relation}__{name}' for relation in NAVIGATION_RELATED
+    for name in ('content_html', 'content_code', 'compiled_html', 'toc')
+)
+
 def login_view(request):
     if request.method == 'POST':
         username = request.POST.get('username')
@@ -26,71 +54,39 @@ def login_view(request):
             return render(request, 'admin/登录.html', status=401)
     return render(request, 'admin/登录.html')
 
+@cache_front_page
 def index_view(request):
     """首页视图 - 显示分类树和默认第一篇文章"""
-    main_categories = MainCategory.objects.filter(is_enabled=True).order_by('order')
-    category_tree = []
-    for main_category in main_categories:
-        sub_categories = SubCategory.objects.filter(
-            parent=main_category,
-            is_enabled=True
-        ).order_by('id')
-        sub_categories_with_count = []
-        for sub in sub_categories:
-            article_count = Article.objects.filter(
-                category=sub,
-                content_type=Article.ContentType.TUTORIAL,
-                is_published=True
-            ).count()
-            sub.article_count = article_count
-            sub_categories_with_count.append(sub)
-        category_tree.append({
-            'main_category': main_category,
-            'sub_categories': sub_categories_with_count
-        })
-    current_article = Article.objects.filter(
+    current_article = Article.objects.select_related('category__parent', *NAVIGATION_RELATED).defer(
+        'content_html', 'content_code', *NAVIGATION_DEFERRED
+    ).filter(
         content_type=Article.ContentType.TUTORIAL,
         is_published=True
     ).order_by('created_at').first()
     context = {
-        'category_tree': category_tree,
+        # 传入函数，侧栏片段缓存命中时不会读取分类树
+        'category_tree': get_category_tree,
         'current_article': current_article,
     }
     return render(request, 'front/index.html', context)
 
+@cache_front_page
 def category_view(request, slug):
     """子分类文章显示视图"""
-    main_categories = MainCategory.objects.filter(is_enabled=True).order_by('order')
-    category_tree = []
-    for main_category in main_categories:
-        sub_categories = SubCategory.objects.filter(
-            parent=main_category,
-            is_enabled=True
-        ).order_by('id')
-        sub_categories_with_count = []
-        for sub in sub_categories:
-            article_count = Article.objects.filter(
-                category=sub,
-                content_type=Article.ContentType.TUTORIAL,
-                is_published=True
-            ).count()
-            sub.article_count = article_count
-            sub_categories_with_count.append(sub)
-        category_tree.append({
-            'main_category': main_category,
-            'sub_categories': sub_categories_with_count
-        })
     try:
         current_category = SubCategory.objects.get(slug=slug)
     except SubCategory.DoesNotExist:
         return render(request, 'front/404.html', status=404)
-    current_article = Article.objects.filter(
+    current_article = Article.objects.select_related('category__parent', *NAVIGATION_RELATED).defer(
+        'content_html', 'content_code', *NAVIGATION_DEFERRED
+    ).filter(
         category=current_category,
         content_type=Article.ContentType.TUTORIAL,
         is_published=True
     ).order_by('created_at').first()
     context = {
-        'category_tree': category_tree,
+        # 传入函数，侧栏片段缓存命中时不会读取分类树
+        'category_tree': get_category_tree,
         'current_category': current_category,
         'current_article': current_article,
     }
@@ -112,32 +108,80 @@ def article_edit_view(request):
 def course_management_view(request):
     return render(request, 'admin/教程管理.html')
 
+@condition(etag_func=conditional.tutorial_etag, last_modified_func=conditional.tutorial_last_modified)
+@cache_front_page
 def tutorial_detail_view(request, pk):
-    tutorial = get_object_or_404(Article, pk=pk)
+    tutorial = get_object_or_404(
+        Article.objects.select_related('category__parent', *NAVIGATION_RELATED).defer(*NAVIGATION_DEFERRED), pk=pk
+    )
     is_admin = request.user.is_authenticated and request.user.is_staff
     if not tutorial.is_published and not is_admin:
-        return render(request, 'front/404.html', {'error_message': '教程不存在或未发布'})
-
-    related_tutorials = Article.objects.filter(
-        category=tutorial.category, content_type=Article.ContentType.TUTORIAL, is_published=True
-    ).exclude(pk=pk)[:5]
+        return render(request, 'front/404.html', {'error_message': '教程不存在或未发布'}, status=404)
+
+    # 相关教程由 build_related_articles 离线计算；尚未计算时退回同分类的教程
+    related_tutorials = [
+        entry.related for entry in RelatedArticle.objects.filter(
+            article_id=pk, related__content_type=Article.ContentType.TUTORIAL, related__is_published=True
+        ).select_related('related').defer(
+            'related__content_html', 'related__content_code', 'related__compiled_html', 'related__toc'
+        )[:5]
+    ]
+    if not related_tutorials:
+        related_tutorials = Article.objects.filter(
+            category=tutorial.category, content_type=Article.ContentType.TUTORIAL, is_published=True
+        ).exclude(pk=pk)[:5]
     
     context = {
         'tutorial': tutorial,
         'related_tutorials': related_tutorials,
+        'prev_tutorial': tutorial.prev_in_category,
+        'next_tutorial': tutorial.next_in_category,
         'is_admin': is_admin
     }
     return render(request, 'front/tutorial_detail.html', context)
 
 # ========== API 视图 ==========
 
+def _detail_data(schema, queryset, fields):
+    """详情接口：按模式读取单行，不存在时返回404"""
+    rows = schema.serialize(queryset, fields)
+    if not rows:
+        raise Http404
+    return rows[0]
+
+def _cursor_mode(request):
+    """请求带cursor参数（第一页为空值）时使用游标分页"""
+    return 'cursor' in request.GET
+
+
+def _cursor_page_response(request, queryset, ordering, schema, fields=None):
+    """游标分页的列表响应，按schema只读取所需列；total=1时才计算总数"""
+    try:
+        page_size = min(max(int(request.GET.get('page_size', 10)), 1), MAX_PAGE_SIZE)
+    except ValueError:
+        page_size = 10
+    try:
+        page = cursor_paginate(
+            schema.select(queryset, fields, extra=[name.lstrip('-') for name in ordering]), ordering,
+            cursor=request.GET.get('cursor'),
+            page_size=page_size,
+            with_total=request.GET.get('total') in ('1', 'true'),
+        )
+    except InvalidCursor as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+    page['items'] = schema.render(page['items'], fields)
+    return JsonResponse(page)
+
+
 @require_http_methods(["GET", "POST"])
 def main_category_api(request):
     if request.method == 'GET':
+        if _cursor_mode(request):
+            return _cursor_page_response(request, MainCategory.objects.all(), ('order', 'id'), MAIN_CATEGORY_SCHEMA)
         page = request.GET.get('page', 1)
         page_size = 10
         
-        categories = MainCategory.objects.all().order_by('order')
+        categories = MAIN_CATEGORY_SCHEMA.select(MainCategory.objects.order_by('order', 'id'))
         
         # 添加分页
         paginator = Paginator(categories, page_size)
@@ -147,7 +191,7 @@ def main_category_api(request):
             categories_page = paginator.page(paginator.num_pages)
         
         data = {
-            'items': list(categories_page.object_list.values('id', 'name', 'slug', 'order', 'is_enabled')),
+            'items': MAIN_CATEGORY_SCHEMA.render(categories_page.object_list),
             'current_page': categories_page.number,
             'total_pages': paginator.num_pages,
             'total_items': paginator.count
@@ -176,16 +220,11 @@ def main_category_api(request):
 @csrf_exempt
 @require_http_methods(["GET", "PUT", "DELETE"])
 def main_category_detail_api(request, pk):
-    main_category = get_object_or_404(MainCategory, pk=pk)
     if request.method == 'GET':
-        data = {
-            'id': main_category.id,
-            'name': main_category.name,
-            'order': main_category.order,
-            'is_enabled': main_category.is_enabled
-        }
-        return JsonResponse(data)
-    elif request.method == 'PUT':
+        return JsonResponse(_detail_data(
+            MAIN_CATEGORY_SCHEMA, MainCategory.objects.filter(pk=pk), ['id', 'name', 'order', 'is_enabled']))
+    main_category = get_object_or_404(MainCategory, pk=pk)
+    if request.method == 'PUT':
         data = json.loads(request.body)
         main_category.name = data.get('name', main_category.name)
         main_category.slug = data.get('slug', main_category.slug)
@@ -197,6 +236,16 @@ def main_category_detail_api(request, pk):
         main_category.delete()
         return JsonResponse({'status': 'success', 'message': 'Main category deleted successfully'})
 
+@require_http_methods(["GET"])
+@condition(etag_func=conditional.category_tree_etag)
+def category_tree_api(request):
+    """全部主分类及其子分类（含未启用的）和已发布教程数，后台页面一次请求取得"""
+    version, tree = conditional.category_tree_state(request)
+    response = JsonResponse({'version': version, 'items': tree})
+    # 浏览器保留副本，每次用ETag向服务器确认
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
 @csrf_exempt
 @require_http_methods(["GET", "POST"])
 def sub_category_api(request):
@@ -208,6 +257,9 @@ def sub_category_api(request):
         categories = SubCategory.objects.all()
         if main_category_id:
             categories = categories.filter(parent_id=main_category_id)
+        if _cursor_mode(request):
+            return _cursor_page_response(request, categories, ('id',), SUB_CATEGORY_SCHEMA)
+        categories = SUB_CATEGORY_SCHEMA.select(categories.order_by('id'))
 
         # Add pagination
         paginator = Paginator(categories, page_size)
@@ -217,14 +269,7 @@ def sub_category_api(request):
             categories_page = paginator.page(paginator.num_pages)
 
         data = {
-            'items': [{
-                'id': cat.id,
-                'name': cat.name,
-                'slug': cat.slug,
-                'parent_id': cat.parent.id if cat.parent else None,
-                'parent_name': cat.parent.name if cat.parent else None,
-                'is_enabled': cat.is_enabled
-            } for cat in categories_page.object_list],
+            'items': SUB_CATEGORY_SCHEMA.render(categories_page.object_list),
             'current_page': categories_page.number,
             'total_pages': paginator.num_pages,
             'total_items': paginator.count
@@ -245,16 +290,11 @@ def sub_category_api(request):
 @csrf_exempt
 @require_http_methods(["GET", "PUT", "DELETE"])
 def sub_category_detail_api(request, pk):
-    sub_category = get_object_or_404(SubCategory, pk=pk)
     if request.method == 'GET':
-        data = {
-            'id': sub_category.id,
-            'name': sub_category.name,
-            'parent_id': sub_category.parent.id if sub_category.parent else None,
-            'is_enabled': sub_category.is_enabled
-        }
-        return JsonResponse(data)
-    elif request.method == 'PUT':
+        return JsonResponse(_detail_data(
+            SUB_CATEGORY_SCHEMA, SubCategory.objects.filter(pk=pk), ['id', 'name', 'parent_id', 'is_enabled']))
+    sub_category = get_object_or_404(SubCategory, pk=pk)
+    if request.method == 'PUT':
         data = json.loads(request.body)
         sub_category.name = data.get('name', sub_category.name)
         if 'parent_id' in data:
@@ -272,61 +312,92 @@ def sub_category_detail_api(request, pk):
 
 @csrf_exempt
 @require_http_methods(["GET", "POST"])
+@condition(etag_func=conditional.article_list_etag, last_modified_func=conditional.article_list_last_modified)
 def article_api(request):
     if request.method == 'GET':
-        articles = Article.objects.all()
-        data = [{
-            'id': article.id,
-            'title': article.title,
-            'subtitle': article.subtitle,
-            'summary': article.summary,
-            'read_time_minutes': article.read_time_minutes,
-            'is_published': article.is_published,
-            'created_at': article.created_at.isoformat(),
-            'updated_at': article.updated_at.isoformat(),
-            'category_name': article.category.name if article.category else None,
-            'tags': [tag.name for tag in article.tags.all()]
-        } for article in articles]
-        return JsonResponse(data, safe=False)
+        fields = request.GET.get('fields')
+        fields = [name.strip() for name in fields.split(',') if name.strip()] if fields else None
+        unknown = ARTICLE_SCHEMA.check(fields or [])
+        if unknown:
+            return JsonResponse({'status': 'error', 'message': f'未知字段: {", ".join(unknown)}'}, status=400)
+
+        # 只读取所请求字段对应的列，正文不在模式中
+        if _cursor_mode(request):
+            return _cursor_page_response(request, Article.objects.all(), ('-created_at', '-id'), ARTICLE_SCHEMA, fields)
+        try:
+            page_size = min(max(int(request.GET.get('page_size', 20)), 1), MAX_PAGE_SIZE)
+        except ValueError:
+            page_size = 20
+        articles = ARTICLE_SCHEMA.select(Article.objects.order_by('-created_at', '-id'), fields)
+        paginator = Paginator(articles, page_size)
+        articles_page = paginator.get_page(request.GET.get('page', 1))
+        data = {
+            'items': ARTICLE_SCHEMA.render(articles_page.object_list, fields),
+            'current_page': articles_page.number,
+            'total_pages': paginator.num_pages,
+            'total_items': paginator.count
+        }
+        return JsonResponse(data)
     elif request.method == 'POST':
         data = json.loads(request.body)
-        article = Article.objects.create(
-            title=data['title'],
-            subtitle=data.get('subtitle', ''),
-            summary=data.get('summary', ''),
-            content_html=data.get('content_html', ''),
-            content_code=data.get('content_code', ''),
-            code_language=data.get('code_language', ''),
-            content_type=data.get('content_type', Article.ContentType.TUTORIAL),
-            read_time_minutes=data.get('read_time_minutes', 5),
-            is_published=data.get('is_published', False)
-        )
-        if data.get('category_id'):
-            article.category = get_object_or_404(SubCategory, pk=data.get('category_id'))
-        article.save()
-        if data.get('tags'):
-            article.tags.set(Tag.objects.filter(name__in=data.get('tags')))
+        # 先确定分类，一次INSERT完成创建，标签与文章在同一事务中写入
+        category = get_object_or_404(SubCategory, pk=data['category_id']) if data.get('category_id') else None
+        with transaction.atomic():
+            article = Article.objects.create(
+                title=data['title'],
+                subtitle=data.get('subtitle', ''),
+                summary=data.get('summary', ''),
+                content_html=data.get('content_html', ''),
+                content_code=data.get('content_code', ''),
+                code_language=data.get('code_language', ''),
+                content_type=data.get('content_type', Article.ContentType.TUTORIAL),
+                read_time_minutes=data.get('read_time_minutes', 5),
+                is_published=data.get('is_published', False),
+                category=category,
+            )
+            if data.get('tags'):
+                article.tags.set(Tag.objects.filter(name__in=data.get('tags')))
         return JsonResponse({'status': 'success', 'message': 'Article created successfully', 'id': article.id}, status=201)
 
+def _bulk_response(request, content_type=None):
+    """批量接口：{"operations": [...], "atomic": true}，返回逐项结果"""
+    try:
+        data = json.loads(request.body)
+    except ValueError:
+        return JsonResponse({'status': 'error', 'message': '请求体不是有效的JSON'}, status=400)
+    operations = data.get('operations') if isinstance(data, dict) else None
+    if not isinstance(operations, list) or not operations:
+        return JsonResponse({'status': 'error', 'message': 'operations必须是非空列表'}, status=400)
+    if len(operations) > MAX_OPERATIONS:
+        return JsonResponse({'status': 'error', 'message': f'单次最多 {MAX_OPERATIONS} 个操作'}, status=400)
+    try:
+        results, applied = apply_article_operations(operations, content_type, atomic=data.get('atomic', True))
+    except DatabaseError as e:
+        return JsonResponse({'status': 'error', 'message': f'批量写入失败: {str(e)}'}, status=500)
+    return JsonResponse(_bulk_result_data(results, applied), status=200 if applied else 400)
+
+def _bulk_result_data(results, applied):
+    failed = sum(1 for result in results if result['status'] != 'success')
+    return {
+        'status': 'success' if not failed else ('partial' if applied else 'error'),
+        'applied': applied,
+        'failed': failed,
+        'results': results,
+    }
+
+@csrf_exempt
+@require_http_methods(["POST"])
+def article_bulk_api(request):
+    return _bulk_response(request)
+
 @csrf_exempt
 @require_http_methods(["GET", "PUT", "DELETE"])
+@condition(etag_func=conditional.article_etag, last_modified_func=conditional.article_last_modified)
 def article_detail_api(request, pk):
-    article = get_object_or_404(Article, pk=pk)
     if request.method == 'GET':
-        data = {
-            'id': article.id,
-            'title': article.title,
-            'subtitle': article.subtitle,
-            'summary': article.summary,
-            'read_time_minutes': article.read_time_minutes,
-            'content_html': article.content_html,
-            'content_code': article.content_code,
-            'code_language': article.code_language,
-            'category_id': article.category.id if article.category else None,
-            'tags': [tag.name for tag in article.tags.all()],
-        }
-        return JsonResponse(data)
-    elif request.method == 'PUT':
+        return JsonResponse(_detail_data(ARTICLE_DETAIL_SCHEMA, Article.objects.filter(pk=pk), ARTICLE_DETAIL_FIELDS))
+    article = get_object_or_404(Article, pk=pk)
+    if request.method == 'PUT':
         data = json.loads(request.body)
         article.title = data.get('title', article.title)
         article.subtitle = data.get('subtitle', article.subtitle)
@@ -344,12 +415,16 @@ def article_detail_api(request, pk):
 
 @csrf_exempt
 @require_http_methods(["GET", "POST"])
+@condition(etag_func=conditional.course_list_etag, last_modified_func=conditional.course_list_last_modified)
 def course_api(request):
     if request.method == 'GET':
         page = request.GET.get('page', 1)
         page_size = 10 # Assuming a default page size
 
         courses = Article.objects.filter(content_type=Article.ContentType.TUTORIAL)
+        if _cursor_mode(request):
+            return _cursor_page_response(request, courses, ('-created_at', '-id'), ARTICLE_SCHEMA, COURSE_FIELDS)
+        courses = ARTICLE_SCHEMA.select(courses.order_by('-created_at', '-id'), COURSE_FIELDS)
 
         # Add pagination
         paginator = Paginator(courses, page_size)
@@ -359,18 +434,7 @@ def course_api(request):
             courses_page = paginator.page(paginator.num_pages)
 
         data = {
-            'items': [{
-                'id': course.id,
-                'title': course.title,
-                'subtitle': course.subtitle,
-                'summary': course.summary,
-                'read_time_minutes': course.read_time_minutes,
-                'is_published': course.is_published,
-                'created_at': course.created_at.isoformat(),
-                'updated_at': course.updated_at.isoformat(),
-                'category_name': course.category.name if course.category else None,
-                'tags': [tag.name for tag in course.tags.all()]
-            } for course in courses_page.object_list],
+            'items': ARTICLE_SCHEMA.render(courses_page.object_list, COURSE_FIELDS),
             'current_page': courses_page.number,
             'total_pages': paginator.num_pages,
             'total_items': paginator.count
@@ -378,45 +442,38 @@ def course_api(request):
         return JsonResponse(data, safe=False)
     elif request.method == 'POST':
         data = json.loads(request.body)
-        course = Article.objects.create(
-            title=data['title'],
-            subtitle=data.get('subtitle', ''),
-            summary=data.get('summary', ''),
-            read_time_minutes=data.get('read_time_minutes', 0),
-            content_html=data.get('content_html', ''),
-            content_code=data.get('content_code', ''),
-            code_language=data.get('code_language', ''),
-            content_type=Article.ContentType.TUTORIAL,
-            is_published=data.get('is_published', False)
-        )
-        if data.get('category_id'):
-            course.category = get_object_or_404(SubCategory, pk=data.get('category_id'))
-        course.save()
-        if data.get('tags'):
-            course.tags.set(Tag.objects.filter(name__in=data.get('tags')))
+        category = get_object_or_404(SubCategory, pk=data['category_id']) if data.get('category_id') else None
+        with transaction.atomic():
+            course = Article.objects.create(
+                title=data['title'],
+                subtitle=data.get('subtitle', ''),
+                summary=data.get('summary', ''),
+                read_time_minutes=data.get('read_time_minutes', 0),
+                content_html=data.get('content_html', ''),
+                content_code=data.get('content_code', ''),
+                code_language=data.get('code_language', ''),
+                content_type=Article.ContentType.TUTORIAL,
+                is_published=data.get('is_published', False),
+                category=category,
+            )
+            if data.get('tags'):
+                course.tags.set(Tag.objects.filter(name__in=data.get('tags')))
         return JsonResponse({'status': 'success', 'message': 'Course created successfully', 'id': course.id}, status=201)
 
+@csrf_exempt
+@require_http_methods(["POST"])
+def course_bulk_api(request):
+    return _bulk_response(request, Article.ContentType.TUTORIAL)
+
 @csrf_exempt
 @require_http_methods(["GET", "PUT", "DELETE"])
+@condition(etag_func=conditional.course_etag, last_modified_func=conditional.course_last_modified)
 def course_detail_api(request, pk):
-    course = get_object_or_404(Article, pk=pk, content_type=Article.ContentType.TUTORIAL)
+    courses = Article.objects.filter(pk=pk, content_type=Article.ContentType.TUTORIAL)
     if request.method == 'GET':
-        data = {
-            'id': course.id,
-            'title': course.title,
-            'subtitle': course.subtitle,
-            'summary': course.summary,
-            'read_time_minutes': course.read_time_minutes,
-            'content_html': course.content_html,
-            'content_code': course.content_code,
-            'code_language': course.code_language,
-            'category_id': course.category.id if course.category else None,
-            'category_name': course.category.name if course.category else None,
-            'tags': [tag.name for tag in course.tags.all()],
-            'is_published': course.is_published,
-        }
-        return JsonResponse(data)
-    elif request.method == 'PUT':
+        return JsonResponse(_detail_data(ARTICLE_DETAIL_SCHEMA, courses, COURSE_DETAIL_FIELDS))
+    course = get_object_or_404(courses)
+    if request.method == 'PUT':
         data = json.loads(request.body)
         course.title = data.get('title', course.title)
         course.subtitle = data.get('subtitle', course.subtitle)
@@ -454,33 +511,201 @@ def course_detail_api(request, pk):
 @csrf_exempt
 @require_http_methods(["POST"])
 def course_publish_api(request, pk):
-    course = get_object_or_404(Article, pk=pk, content_type=Article.ContentType.TUTORIAL)
     data = json.loads(request.body)
     is_published = data.get('is_published')
-    if is_published is not None:
-        course.is_published = is_published
-        course.save()
+    if not isinstance(is_published, bool):
+        return JsonResponse({'status': 'error', 'message': 'Invalid request'}, status=400)
+    # 只校验发布条件并更新一列，不读出正文
+    results, applied = set_published([pk], is_published, Article.ContentType.TUTORIAL)
+    if applied:
         return JsonResponse({'status': 'success', 'message': 'Course publish status updated successfully'})
-    return JsonResponse({'status': 'error', 'message': 'Invalid request'}, status=400)
+    if not Article.objects.filter(pk=pk, content_type=Article.ContentType.TUTORIAL).exists():
+        raise Http404
+    return JsonResponse({'status': 'error', 'message': results[0]['message']}, status=400)
+
+@csrf_exempt
+@require_http_methods(["POST"])
+def course_bulk_publish_api(request):
+    """批量发布或取消发布：{"ids": [...], "is_published": true, "atomic": true}"""
+    try:
+        data = json.loads(request.body)
+    except ValueError:
+        return JsonResponse({'status': 'error', 'message': '请求体不是有效的JSON'}, status=400)
+    if not isinstance(data, dict):
+        return JsonResponse({'status': 'error', 'message': 'Invalid request'}, status=400)
+    ids = data.get('ids')
+    is_published = data.get('is_published')
+    if not isinstance(ids, list) or not ids or not all(map(is_id, ids)) or not isinstance(is_published, bool):
+        return JsonResponse({'status': 'error', 'message': 'Invalid request'}, status=400)
+    if len(ids) > MAX_OPERATIONS:
+        return JsonResponse({'status': 'error', 'message': f'单次最多 {MAX_OPERATIONS} 个操作'}, status=400)
+    results, applied = set_published(ids, is_published, Article.ContentType.TUTORIAL, atomic=data.get('atomic', True))
+    return JsonResponse(_bulk_result_data(results, applied), status=200 if applied else 400)
+
+@require_http_methods(["GET"])
+def search_api(request):
+    query = request.GET.get('q', '').strip()
+    try:
+        page = min(max(1, int(request.GET.get('page', 1))), MAX_SEARCH_PAGE)
+        page_size = min(50, max(1, int(request.GET.get('page_size', 10))))
+    except ValueError:
+        return JsonResponse({'status': 'error', 'message': 'Invalid page'}, status=400)
+    total, articles = search_articles(query, page, page_size)
+    data = {
+        'query': query,
+        'items': [{
+            'id': article.id,
+            'title': article.title,
+            'subtitle': article.subtitle,
+            'summary': article.summary,
+            'category_name': article.category.name if article.category else None,
+            'score': round(article.score, 4),
+            'url': reverse('Pythonfun:tutorial_detail', args=[article.id]),
+        } for article in articles],
+        'current_page': page,
+        'total_pages': (total + page_size - 1) // page_size,
+        'total_items': total,
+    }
+    return JsonResponse(data)
+
+def _function_data(entry):
+    """字段名与函数查询页面一致"""
+    return {
+        '完整名称': entry.qualified_name,
+        '函数名称': entry.name,
+        '所属模块': entry.module,
+        '描述': entry.description,
+        '函数类型': entry.get_function_type_display(),
+        '源码定义': entry.source,
+        '返回值说明': entry.returns,
+        '参数': [{
+            '参数名称': parameter.name,
+            '参数类型': parameter.type,
+            '结构类型': parameter.kind,
+            '是否有默认值': parameter.has_default,
+            '默认值': parameter.default,
+            '参数是否必填': parameter.is_required,
+            '描述': parameter.description,
+        } for parameter in entry.parameters.all()],
+    }
+
+@require_http_methods(["GET"])
+def function_search_api(request):
+    query = request.GET.get('q', '').strip()
+    try:
+        page = min(max(1, int(request.GET.get('page', 1))), MAX_SEARCH_PAGE)
+        page_size = min(50, max(1, int(request.GET.get('page_size', 20))))
+    except ValueError:
+        return JsonResponse({'status': 'error', 'message': 'Invalid page'}, status=400)
+    total, entries = search_functions(query, page, page_size)
+    data = {
+        'query': query,
+        'items': [_function_data(entry) for entry in entries],
+        'current_page': page,
+        'total_pages': (total + page_size - 1) // page_size,
+        'total_items': total,
+    }
+    return JsonResponse(data)
+
+@require_http_methods(["GET"])
+def function_suggest_api(request):
+    query = request.GET.get('q', '')
+    try:
+        limit = min(20, max(1, int(request.GET.get('limit', 10))))
+    except ValueError:
+        return JsonResponse({'status': 'error', 'message': 'Invalid limit'}, status=400)
+    return JsonResponse({'query': query, 'suggestions': get_suggest_index().suggest(query, limit)})
+
+@require_http_methods(["GET"])
+def library_module_api(request, pk):
+    """函数库一个模块的条目（分页）；URL带当前版本号时允许长期缓存"""
+    module = get_object_or_404(LibraryModule, pk=pk)
+    paginator = Paginator(module.items.all(), LIBRARY_PAGE_SIZE)
+    items_page = paginator.get_page(request.GET.get('page', 1))
+    data = {
+        'module': {'id': module.id, 'name': module.name, 'description': module.description},
+        'version': module.version,
+        'items': list(items_page.object_list.values(
+            'kind', 'class_name', 'name', 'operation', 'semantic', 'input_structure', 'output_structure')),
+        'current_page': items_page.number,
+        'total_pages': paginator.num_pages,
+        'total_items': paginator.count,
+    }
+    response = JsonResponse(data)
+    if request.GET.get('v') == module.version:
+        patch_cache_control(response, public=True, max_age=LIBRARY_SECTION_MAX_AGE, immutable=True)
+    else:
+        patch_cache_control(response, public=True, max_age=60)
+    return response
+
+def search_view(request):
+    """搜索结果页面视图"""
+    query = request.GET.get('q', '').strip()
+    try:
+        page = min(max(1, int(request.GET.get('page', 1))), MAX_SEARCH_PAGE)
+    except ValueError:
+        page = 1
+    page_size = 10
+    total, articles = search_articles(query, page, page_size) if query else (0, [])
+    context = {
+        'query': query,
+        'articles': articles,
+        'total': total,
+        'page': page,
+        'has_prev': page > 1,
+        'has_next': page * page_size < total,
+    }
+    return render(request, 'front/搜索.html', context)
 
 # ========== 导航栏页面视图 ==========
 
+@cache_front_page
 def function_library_view(request):
-    """函数库页面视图"""
-    return render(request, 'front/函数库.html')
+    """函数库页面视图：只输出模块列表和第一个模块的第一页，其余分节由页面按需获取"""
+    libraries = list(Library.objects.prefetch_related('modules'))
+    first_module = next((module for library in libraries for module in library.modules.all()), None)
+    first_rows = []
+    first_classes = []
+    if first_module:
+        first_rows = list(first_module.items.exclude(kind=LibraryItem.Kind.CLASS)[:LIBRARY_PAGE_SIZE + 1])
+        first_classes = list(first_module.items.filter(kind=LibraryItem.Kind.CLASS).values_list('name', flat=True))
+    sections = [{
+        'key': library.key,
+        'name': library.name,
+        'modules': [{
+            'id': module.id,
+            'name': module.name,
+            'description': module.description,
+            'version': module.version,
+        } for module in library.modules.all()],
+    } for library in libraries]
+    context = {
+        'libraries': libraries,
+        'sections': sections,
+        'first_library': libraries[0] if libraries else None,
+        'first_module': first_module,
+        'first_rows': first_rows[:LIBRARY_PAGE_SIZE],
+        'first_has_more': len(first_rows) > LIBRARY_PAGE_SIZE,
+        'first_classes': first_classes,
+    }
+    return render(request, 'front/函数库.html', context)
 
+@cache_front_page
 def function_query_view(request):
     """函数查询页面视图"""
     return render(request, 'front/函数查询.html')
 
+@cache_front_page
 def data_structure_view(request):
     """数据结构页面视图"""
     return render(request, 'front/数据结构.html')
 
+@cache_front_page
 def statement_view(request):
     """语句页面视图"""
     return render(request, 'front/语句.html')
 
+@cache_front_page
 def project_view(request):
     """项目页面视图"""
     return render(request, 'front/项目.html')
\ No newline at end of file
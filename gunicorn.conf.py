@@ -32,3 +32,24 @@ group = None
 
 # 临时目录
 tmp_upload_dir = None
+
+
+def when_ready(server):
+    """preload_app时主进程在fork工作进程之前编译模板、建好函数索引，各工作进程共享同一份内存"""
+    import gc
+
+    try:
+        from Pythonfun.template_warmup import warm_templates
+        server.log.info("已预编译 %d 个模板", warm_templates())
+    except Exception as exc:
+        server.log.warning("模板预编译失败，将在首次渲染时编译: %s", exc)
+    try:
+        from django.db import connections
+        from Pythonfun.function_index import warm_function_indexes
+        warm_function_indexes()
+        # 不把主进程的数据库连接带进工作进程
+        connections.close_all()
+    except Exception as exc:
+        server.log.warning("函数索引预建失败，将在首次查询时建立: %s", exc)
+    # 已有对象不再参与垃圾回收扫描，避免工作进程中的GC写入这些内存页触发复制
+    gc.freeze()
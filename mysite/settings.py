@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 import os
+import tempfile
 from pathlib import Path
 # 简化配置，不使用decouple
 # try:
@@ -43,6 +44,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',  # 安全中间件
+    'Pythonfun.compression.CompressionMiddleware',    # brotli/gzip压缩（缓存页面使用预先压缩的内容）
     'whitenoise.middleware.WhiteNoiseMiddleware',     # 静态文件中间件
     'django.middleware.common.CommonMiddleware',      # 通用中间件
 ]
@@ -53,11 +55,17 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [os.path.join(BASE_DIR, 'templates')],
-        'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.request',
             ],
+            # 显式使用缓存加载器：模板只解析一次，gunicorn预加载时预先编译（见 gunicorn.conf.py）
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
         },
     },
 ]
@@ -69,6 +77,24 @@ TEMPLATES = [
 # Database - 禁用数据库
 DATABASES = {}
 
+# 缓存 - 页面缓存、命中统计和导航版本号需要在所有gunicorn worker之间共享，
+# 不能使用默认的进程内LocMemCache；部署时可通过DJANGO_CACHE_DIR指定目录
+CACHE_DIR = os.environ.get('DJANGO_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'mysite_cache'))
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(CACHE_DIR, 'default'),
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    },
+    # 导航版本号、命中统计等少量状态单独存放，不会因页面缓存条目超过MAX_ENTRIES被淘汰
+    'pythonfun_state': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(CACHE_DIR, 'state'),
+    },
+}
+
 # 日志配置 - 禁用（不需要）
 # LOGGING = {
 #     'version': 1,
@@ -112,7 +138,15 @@ STATICFILES_FINDERS = [
 ]
 
 # Whitenoise配置 - 启用
-STATICFILES_STORAGE = 'whitenoise.storage.StaticFilesStorage'
+# 文件名带内容哈希（需先执行collectstatic，见 build.sh），WhiteNoise以immutable长期缓存这些文件
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage',
+    },
+}
 
 # Default primary key field type - 禁用（不需要）
 # DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
@@ -46,8 +46,12 @@ MIDDLEWARE = [
     'whitenoise.middleware.WhiteNoiseMiddleware',
 ] + MIDDLEWARE
 
-# 静态文件压缩
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+# 静态文件压缩：沿用 settings.STORAGES 中的 CompressedManifestStaticFilesStorage
+
+# 预渲染的静态页面（见 export_static_site 命令和README中的Nginx配置）：
+# Nginx直接返回 static_site 中的页面，发布、修改文章后由后台线程重建受影响的页面
+PYTHONFUN_STATIC_EXPORT_DIR = os.environ.get('PYTHONFUN_STATIC_EXPORT_DIR', os.path.join(BASE_DIR, 'static_site'))
+PYTHONFUN_STATIC_EXPORT_ON_CHANGE = True
 
 # 媒体文件配置
 MEDIA_URL = '/media/'
@@ -96,13 +100,7 @@ LOGGING = {
 # 确保日志目录存在
 os.makedirs(os.path.join(BASE_DIR, 'logs'), exist_ok=True)
 
-# 缓存配置（生产环境建议使用Redis）
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'unique-snowflake',
-    }
-}
+# 缓存配置：沿用 settings.CACHES 中各worker共享的文件缓存（生产环境建议使用Redis）
 
 # 会话配置
 SESSION_COOKIE_AGE = 3600  # 1小时
@@ -0,0 +1,335 @@
+// ================= API & 全局变量 =================
+const mainCategoryApiUrl = `/api/main-categories/`;
+const subCategoryApiUrl = `/api/sub-categories/`;
+const categoryTreeApiUrl = `/api/category-tree/`;
+const PAGE_SIZE = 10;
+let mainCategoriesCache = []; // 全部主分类，用于子分类下拉列表
+let subCategoriesCache = [];
+let currentMainPage = 1;
+let currentSubPage = 1;
+
+// CSRF Token for Django
+function getCookie(name) {
+    let cookieValue = null;
+    if (document.cookie && document.cookie !== '') {
+        const cookies = document.cookie.split(';');
+        for (let i = 0; i < cookies.length; i++) {
+            const cookie = cookies[i].trim();
+            if (cookie.substring(0, name.length + 1) === (name + '=')) {
+                cookieValue = decodeURIComponent(cookie.substring(name.length + 1));
+                break;
+            }
+        }
+    }
+    return cookieValue;
+}
+const csrftoken = getCookie('csrftoken');
+
+// ================= Toast提示框 =================
+function showToast(message, type = 'success') {
+  const toastContainer = document.getElementById('toastContainer');
+  const toast = document.createElement('div');
+  toast.className = `toast ${type}`;
+  const iconClass = type === 'success' ? 'fa-check-circle' : 'fa-times-circle';
+  toast.innerHTML = `<i class="fas ${iconClass} toast-icon"></i> ${message}`;
+
+  toastContainer.appendChild(toast);
+
+  setTimeout(() => { toast.classList.add('show'); }, 100);
+
+  setTimeout(() => {
+    toast.classList.remove('show');
+    setTimeout(() => { toast.remove(); }, 500);
+  }, 3000);
+}
+
+// ================= 模态框控制 =================
+const categoryModal = document.getElementById('categoryModal');
+const subCategoryModal = document.getElementById('subCategoryModal');
+const addCategoryBtn = document.getElementById('addCategoryBtn');
+const addSubCategoryBtn = document.getElementById('addSubCategoryBtn');
+
+function setupModal(modal, openBtn, closeBtnId, cancelBtnId, formId, titleId) {
+    const closeBtn = document.getElementById(closeBtnId);
+    const cancelBtn = document.getElementById(cancelBtnId);
+
+    openBtn.addEventListener('click', () => {
+        document.getElementById(formId).reset();
+        document.getElementById(titleId).textContent = openBtn.textContent.trim();
+        if(formId === 'subCategoryForm') updateParentCategoryOptions();
+        modal.classList.add('show');
+    });
+
+    const closeModal = () => modal.classList.remove('show');
+    closeBtn.addEventListener('click', closeModal);
+    cancelBtn.addEventListener('click', closeModal);
+    modal.addEventListener('click', (e) => { if (e.target === modal) closeModal(); });
+}
+
+setupModal(categoryModal, addCategoryBtn, 'closeModal', 'cancelBtn', 'categoryForm', 'modalTitle');
+setupModal(subCategoryModal, addSubCategoryBtn, 'closeSubModal', 'cancelSubBtn', 'subCategoryForm', 'subModalTitle');
+
+// ================= 分页渲染 =================
+function renderPagination(container, currentPage, totalPages, onPageClick) {
+  container.innerHTML = '';
+  if (totalPages <= 1) return;
+
+  const createBtn = (text, page, enabled = true) => {
+      const btn = document.createElement('button');
+      btn.innerHTML = text;
+      btn.classList.add('pagination-btn');
+      if (!enabled) btn.classList.add('disabled');
+      btn.addEventListener('click', () => { if (enabled) onPageClick(page); });
+      return btn;
+  }
+
+  container.appendChild(createBtn('&laquo; 上一页', currentPage - 1, currentPage > 1));
+
+  for (let i = 1; i <= totalPages; i++) {
+    const pageLink = document.createElement('a');
+    pageLink.href = '#';
+    pageLink.textContent = i;
+    pageLink.classList.add('page-link');
+    if (i === currentPage) pageLink.classList.add('active');
+    pageLink.addEventListener('click', (e) => { e.preventDefault(); onPageClick(i); });
+    container.appendChild(pageLink);
+  }
+
+  container.appendChild(createBtn('下一页 &raquo;', currentPage + 1, currentPage < totalPages));
+}
+
+// ================= 分类树 =================
+// 两张表和下拉列表共用一次请求取得的完整分类树，分页在本地完成
+async function loadCategoryTree() {
+    try {
+        const response = await fetch(categoryTreeApiUrl);
+        if (!response.ok) throw new Error('Network response was not ok');
+        const data = await response.json();
+
+        mainCategoriesCache = data.items;
+        subCategoriesCache = data.items.flatMap(main =>
+            main.sub_categories.map(sub => ({ ...sub, parent_name: main.name }))
+        ).sort((a, b) => a.id - b.id);
+        renderMainCategories(currentMainPage);
+        renderSubCategories(currentSubPage);
+    } catch (error) {
+        showToast('加载分类失败', 'danger');
+        console.error('Fetch error:', error);
+    }
+}
+
+function pageOf(items, page) {
+    const totalPages = Math.max(1, Math.ceil(items.length / PAGE_SIZE));
+    const current = Math.min(Math.max(page, 1), totalPages);
+    return { current, totalPages, items: items.slice((current - 1) * PAGE_SIZE, current * PAGE_SIZE) };
+}
+
+// ================= 主分类 CRUD =================
+function renderMainCategories(page = 1) {
+    const data = pageOf(mainCategoriesCache, page);
+    currentMainPage = data.current;
+    const tableBody = document.getElementById('mainCategoryTableBody');
+    tableBody.innerHTML = '';
+
+    if(data.items.length === 0) {
+        tableBody.innerHTML = `<tr><td colspan="6" style="text-align:center;">暂无数据</td></tr>`;
+    }
+
+    data.items.forEach(cat => {
+        const statusBadge = cat.is_enabled ? `<span class="badge badge-success">已启用</span>` : `<span class="badge badge-warning">未启用</span>`;
+        const row = document.createElement('tr');
+        row.innerHTML = `
+            <td>${cat.id}</td>
+            <td>${cat.name}</td>
+            <td>${cat.slug}</td>
+            <td>${cat.order}</td>
+            <td>${statusBadge}</td>
+            <td>
+                <div class="btn-group">
+                    <button class="btn btn-outline btn-sm" onclick="editCategory(${cat.id})"><i class="fas fa-edit"></i> 编辑</button>
+                    <button class="btn btn-danger btn-sm" onclick="deleteCategory(${cat.id})"><i class="fas fa-trash-alt"></i> 删除</button>
+                </div>
+            </td>
+        `;
+        tableBody.appendChild(row);
+    });
+
+    renderPagination(document.getElementById('mainCategoryPagination'), data.current, data.totalPages, renderMainCategories);
+}
+
+document.getElementById('saveCategoryBtn').addEventListener('click', async () => {
+    const id = document.getElementById('categoryId').value;
+    const name = document.getElementById('categoryName').value.trim();
+    const slug = document.getElementById('categorySlug').value.trim();
+    if (!name || !slug) return showToast('分类名称和别名不能为空!', 'danger');
+
+    const url = id ? `${mainCategoryApiUrl}${id}/` : mainCategoryApiUrl;
+    const method = id ? 'PUT' : 'POST';
+
+    const body = JSON.stringify({
+        name: name,
+        slug: slug,
+        order: parseInt(document.getElementById('categoryOrder').value) || 0,
+        is_enabled: document.getElementById('categoryStatus').value === 'true'
+    });
+
+    try {
+        const response = await fetch(url, {
+            method: method,
+            headers: { 'Content-Type': 'application/json', 'X-CSRFToken': csrftoken },
+            body: body
+        });
+
+        if (!response.ok) throw new Error(await response.text());
+
+        showToast(`主分类已${id ? '更新' : '添加'}`);
+        categoryModal.classList.remove('show');
+        if (!id) currentMainPage = 1; // 编辑时留着当前页，添加时去第一页
+        loadCategoryTree();
+    } catch (error) {
+        showToast(`操作失败: ${error.message}`, 'danger');
+    }
+});
+
+function editCategory(id) {
+    const cat = mainCategoriesCache.find(c => c.id === id);
+    if (!cat) return showToast('找不到分类信息', 'danger');
+
+    document.getElementById('modalTitle').textContent = '编辑主分类';
+    document.getElementById('categoryId').value = cat.id;
+    document.getElementById('categoryName').value = cat.name;
+    document.getElementById('categorySlug').value = cat.slug;
+    document.getElementById('categoryOrder').value = cat.order;
+    document.getElementById('categoryStatus').value = cat.is_enabled.toString();
+    categoryModal.classList.add('show');
+}
+
+async function deleteCategory(id) {
+    if (!confirm('确定要删除这个主分类吗？此操作不可撤销。')) return;
+
+    try {
+        const response = await fetch(`${mainCategoryApiUrl}${id}/`, {
+            method: 'DELETE',
+            headers: { 'X-CSRFToken': csrftoken }
+        });
+        if (response.status !== 204) throw new Error('删除失败');
+        showToast('主分类已删除');
+        loadCategoryTree();
+    } catch (error) {
+        showToast(error.message, 'danger');
+    }
+}
+
+// ================= 子分类 CRUD =================
+function renderSubCategories(page = 1) {
+    const data = pageOf(subCategoriesCache, page);
+    currentSubPage = data.current;
+    const tableBody = document.getElementById('subCategoryTableBody');
+    tableBody.innerHTML = '';
+
+    if(data.items.length === 0) {
+        tableBody.innerHTML = `<tr><td colspan="6" style="text-align:center;">暂无数据</td></tr>`;
+    }
+
+    data.items.forEach(cat => {
+        const statusBadge = cat.is_enabled ? `<span class="badge badge-success">已启用</span>` : `<span class="badge badge-warning">未启用</span>`;
+        const row = document.createElement('tr');
+        row.innerHTML = `
+            <td>${cat.id}</td>
+            <td>${cat.parent_name}</td>
+            <td>${cat.name}</td>
+            <td>${cat.slug}</td>
+            <td>${statusBadge}</td>
+            <td>
+                <div class="btn-group">
+                    <button class="btn btn-outline btn-sm" onclick="editSubCategory(${cat.id})"><i class="fas fa-edit"></i> 编辑</button>
+                    <button class="btn btn-danger btn-sm" onclick="deleteSubCategory(${cat.id})"><i class="fas fa-trash-alt"></i> 删除</button>
+                </div>
+            </td>
+        `;
+        tableBody.appendChild(row);
+    });
+
+    renderPagination(document.getElementById('subCategoryPagination'), data.current, data.totalPages, renderSubCategories);
+}
+
+function updateParentCategoryOptions() {
+    const select = document.getElementById('parentCategory');
+    select.innerHTML = '<option value="">请选择主分类</option>';
+    mainCategoriesCache.forEach(cat => {
+        const option = document.createElement('option');
+        option.value = cat.id;
+        option.textContent = cat.name;
+        select.appendChild(option);
+    });
+}
+
+document.getElementById('saveSubCategoryBtn').addEventListener('click', async () => {
+    const id = document.getElementById('subCategoryId').value;
+    const name = document.getElementById('subCategoryName').value.trim();
+    const slug = document.getElementById('subCategorySlug').value.trim();
+    const parentId = document.getElementById('parentCategory').value;
+    if (!name || !slug || !parentId) return showToast('所有字段均为必填项!', 'danger');
+
+    const url = id ? `${subCategoryApiUrl}${id}/` : subCategoryApiUrl;
+    const method = id ? 'PUT' : 'POST';
+
+    const body = JSON.stringify({
+        name: name,
+        slug: slug,
+        parent_id: parseInt(parentId),
+        is_enabled: document.getElementById('subCategoryStatus').value === 'true'
+    });
+
+    try {
+        const response = await fetch(url, {
+            method: method,
+            headers: { 'Content-Type': 'application/json', 'X-CSRFToken': csrftoken },
+            body: body
+        });
+
+        if (!response.ok) throw new Error(await response.text());
+
+        showToast(`子分类已${id ? '更新' : '添加'}`);
+        subCategoryModal.classList.remove('show');
+        if (!id) currentSubPage = 1;
+        loadCategoryTree();
+    } catch (error) {
+        showToast(`操作失败: ${error.message}`, 'danger');
+    }
+});
+
+function editSubCategory(id) {
+    const cat = subCategoriesCache.find(c => c.id === id);
+    if (!cat) return showToast('找不到子分类信息', 'danger');
+
+    updateParentCategoryOptions();
+    document.getElementById('subModalTitle').textContent = '编辑子分类';
+    document.getElementById('subCategoryId').value = cat.id;
+    document.getElementById('subCategoryName').value = cat.name;
+    document.getElementById('subCategorySlug').value = cat.slug;
+    document.getElementById('parentCategory').value = cat.parent_id;
+    document.getElementById('subCategoryStatus').value = cat.is_enabled.toString();
+    subCategoryModal.classList.add('show');
+}
+
+async function deleteSubCategory(id) {
+    if (!confirm('确定要删除这个子分类吗？')) return;
+
+    try {
+        const response = await fetch(`${subCategoryApiUrl}${id}/`, {
+            method: 'DELETE',
+            headers: { 'X-CSRFToken': csrftoken }
+        });
+        if (response.status !== 204) throw new Error('删除失败');
+        showToast('子分类已删除');
+        loadCategoryTree();
+    } catch (error) {
+        showToast(error.message, 'danger');
+    }
+}
+
+// ================= 初始加载 =================
+document.addEventListener('DOMContentLoaded', () => {
+  loadCategoryTree();
+});
@@ -0,0 +1,1116 @@
+// 全局变量
+let monacoEditor = null;
+let tinymceEditor = null;
+const tags = [];
+let currentArticleId = null; // 当前编辑的文章ID
+let isEditMode = false; // 是否是编辑模式
+
+// 配置常量 - 集中管理，避免硬编码
+const EDITOR_CONFIG = {
+    DEFAULT_READ_TIME: 5,
+    DEFAULT_CODE_LANGUAGE: 'python',
+    DEFAULT_CODE_CONTENT: '# 在这里输入您的代码\nprint("Hello, World!")',
+    DEFAULT_PREVIEW_TITLE: '文章标题',
+    DEFAULT_PREVIEW_SUBTITLE: '副标题',
+    DEFAULT_PREVIEW_SUMMARY: '文章摘要',
+    EDITOR_INIT_TIMEOUT: 15000, // 15秒超时
+    RETRY_INTERVAL: 500, // 重试间隔
+    MAX_RETRY_ATTEMPTS: 30 // 最大重试次数
+};
+
+// 编辑器状态管理
+const EditorState = {
+    TINYMCE: 'tinymce',
+    MONACO: 'monaco',
+    FALLBACK_RICH_TEXT: 'fallback_rich_text',
+    FALLBACK_CODE: 'fallback_code'
+};
+
+let currentEditorStates = {
+    richText: null,
+    code: null
+};
+
+// 编辑器就绪状态检查
+function isEditorReady(editorType) {
+    if (editorType === 'richText') {
+        return tinymceEditor && currentEditorStates.richText === EditorState.TINYMCE;
+    } else if (editorType === 'code') {
+        return monacoEditor && currentEditorStates.code === EditorState.MONACO;
+    }
+    return false;
+}
+
+// 统一的编辑器状态检查
+function checkEditorStatus() {
+    return {
+        richTextReady: isEditorReady('richText'),
+        codeReady: isEditorReady('code'),
+        allReady: isEditorReady('richText') && isEditorReady('code')
+    };
+}
+
+// 获取CSRF令牌
+function getCsrfToken() {
+    let cookieValue = null;
+    if (document.cookie && document.cookie !== '') {
+        const cookies = document.cookie.split(';');
+        for (let i = 0; i < cookies.length; i++) {
+            const cookie = cookies[i].trim();
+            if (cookie.substring(0, 10) === 'csrftoken=') {
+                cookieValue = decodeURIComponent(cookie.substring(10));
+                break;
+            }
+        }
+    }
+    return cookieValue;
+}
+// 初始化编辑器
+document.addEventListener('DOMContentLoaded', function() {
+    console.log('DOMContentLoaded - 开始初始化编辑器');
+
+    // 添加错误处理确保编辑器初始化
+    try {
+        initTinyMCE();
+        console.log('TinyMCE初始化完成');
+    } catch (error) {
+        console.error('TinyMCE初始化失败:', error);
+        createFallbackRichTextEditor();
+    }
+
+    try {
+        initMonacoEditor();
+        console.log('Monaco编辑器初始化完成');
+    } catch (error) {
+        console.error('Monaco编辑器初始化失败:', error);
+        createFallbackCodeEditor();
+    }
+
+    initEventListeners();
+
+    // 延迟检查文章ID，确保所有资源加载完成
+    setTimeout(() => {
+        checkForArticleId();
+    }, 1000);
+});
+
+// 检查URL中是否有文章ID参数
+function checkForArticleId() {
+    const urlParams = new URLSearchParams(window.location.search);
+    const articleId = urlParams.get('id');
+    const typeParam = urlParams.get('type');
+
+    console.log('检查URL参数:', { id: articleId, type: typeParam });
+
+    if (articleId) {
+        currentArticleId = articleId;
+        isEditMode = true;
+
+        // 记录调试信息
+        console.log('检测到编辑模式:', {
+            articleId: articleId,
+            type: typeParam,
+            url: window.location.href,
+            editorStatus: checkEditorStatus()
+        });
+
+        // 等待编辑器初始化完成后再加载文章数据
+        const checkAndLoad = () => {
+            const status = checkEditorStatus();
+            console.log('检查编辑器状态:', {
+                ...status,
+                attempts: checkAndLoad.attempts || 0
+            });
+
+            checkAndLoad.attempts = (checkAndLoad.attempts || 0) + 1;
+
+            if (status.allReady) {
+                console.log('编辑器已就绪，开始加载文章数据');
+                loadArticle(articleId);
+            } else if (checkAndLoad.attempts > EDITOR_CONFIG.MAX_RETRY_ATTEMPTS) {
+                // 使用配置的超时设置
+                console.error('编辑器初始化超时');
+                Swal.fire({
+                    title: '编辑器加载超时',
+                    text: `编辑器初始化超时（${EDITOR_CONFIG.EDITOR_INIT_TIMEOUT/1000}秒），请刷新页面重试`,
+                    icon: 'warning',
+                    confirmButtonText: '刷新页面'
+                }).then(() => {
+                    window.location.reload();
+                });
+            } else {
+                setTimeout(checkAndLoad, EDITOR_CONFIG.RETRY_INTERVAL);
+            }
+        };
+
+        // 立即开始检查
+        checkAndLoad();
+    } else {
+        console.log('未检测到文章ID，新建文章模式');
+        // 新建文章模式，确保分类数据加载
+        loadCategories();
+    }
+}
+
+// 从API加载文章数据
+function loadArticle(articleId) {
+    // 判断是否是教程，优先使用URL参数
+    const urlParams = new URLSearchParams(window.location.search);
+    const typeParam = urlParams.get('type');
+    const isCourse = typeParam === 'course';
+    const apiUrl = isCourse ? `/api/courses/${articleId}/` : `/api/articles/${articleId}/`;
+
+    console.log('正在加载文章，ID:', articleId, '类型:', isCourse ? '教程' : '文章', 'API:', apiUrl, 'type参数:', typeParam);
+    console.log('当前URL:', window.location.href);
+    console.log('URL参数:', window.location.search);
+
+    fetch(apiUrl)
+        .then(response => {
+            console.log('API响应状态:', response.status);
+            if (!response.ok) {
+                if (response.status === 404) {
+                    throw new Error(`文章不存在 (ID: ${articleId})`);
+                } else if (response.status === 403) {
+                    throw new Error('没有权限访问此文章');
+                } else if (response.status === 500) {
+                    throw new Error('服务器内部错误，请稍后重试');
+                } else {
+                    throw new Error(`加载失败，状态码: ${response.status}`);
+                }
+            }
+            return response.json();
+        })
+        .then(data => {
+            console.log('文章数据加载成功:', data);
+
+            // 验证数据完整性
+            if (!data || !data.title) {
+                console.warn('文章数据可能不完整:', data);
+            }
+
+            // 填充表单字段
+            document.getElementById('title').value = data.title || '';
+            document.getElementById('description').value = data.description || '';
+            document.getElementById('article-subtitle').value = data.subtitle || '';
+            document.getElementById('article-summary').value = data.summary || '';
+            document.getElementById('read-time').value = data.read_time_minutes || EDITOR_CONFIG.DEFAULT_READ_TIME;
+
+            // 设置内容类型 - 如果是教程模式，强制设置为TUTORIAL
+            document.querySelectorAll('.content-type-tab').forEach(tab => {
+                tab.classList.remove('active');
+            });
+
+            if (isCourse) {
+                // 教程模式，强制设置为TUTORIAL
+                document.querySelector('[data-type="tutorial"]').classList.add('active');
+                // 同时隐藏内容类型选择，因为教程只能是TUTORIAL
+                document.querySelector('.content-type-tabs').style.display = 'none';
+            } else {
+                // 普通文章模式，根据实际内容类型设置
+                document.querySelector('.content-type-tabs').style.display = 'flex';
+                if (data.content_type) {
+                    const contentTypeMap = {
+                        'STORY': 'story',
+                        'STRUCTURE': 'structure',
+                        'TUTORIAL': 'tutorial'
+                    };
+                    const tabId = contentTypeMap[data.content_type] || 'tutorial';
+                    document.querySelector(`[data-type="${tabId}"]`).classList.add('active');
+                } else {
+                    document.querySelector('[data-type="tutorial"]').classList.add('active');
+                }
+            }
+
+            // 设置分类 - 确保分类数据正确加载
+            if (data.category_id) {
+                loadCategories(data.category_id);
+            } else {
+                loadCategories();
+            }
+
+            // 设置标签
+            if (data.tags && data.tags.length > 0) {
+                tags.length = 0; // 清空现有标签
+                data.tags.forEach(tag => {
+                    // 处理标签数据格式（兼容对象数组和字符串数组）
+                    if (typeof tag === 'object' && tag.name) {
+                        tags.push(tag.name);
+                    } else if (typeof tag === 'string') {
+                        tags.push(tag);
+                    }
+                });
+                renderTags();
+            }
+
+            // 设置富文本内容 - 改进内容设置逻辑
+            if (isEditorReady('richText')) {
+                const contentHtml = data.content_html || '';
+                console.log('设置富文本编辑器内容:', contentHtml);
+                tinymceEditor.setContent(contentHtml);
+            } else {
+                console.warn('富文本编辑器未就绪，无法设置内容');
+                // 如果编辑器未就绪，延迟设置内容
+                setTimeout(() => {
+                    if (isEditorReady('richText')) {
+                        const contentHtml = data.content_html || '';
+                        console.log('延迟设置富文本编辑器内容:', contentHtml);
+                        tinymceEditor.setContent(contentHtml);
+                    }
+                }, 1000);
+            }
+
+            // 设置代码内容 - 改进内容设置逻辑
+            if (isEditorReady('code')) {
+                const contentCode = data.content_code || '';
+                console.log('设置代码编辑器内容:', contentCode);
+                monacoEditor.setValue(contentCode);
+
+                // 设置代码语言
+                if (data.code_language) {
+                    document.getElementById('code-language').value = data.code_language;
+                    try {
+                        monaco.editor.setModelLanguage(monacoEditor.getModel(), data.code_language);
+                    } catch (error) {
+                        console.warn('设置代码语言失败:', error);
+                    }
+                } else {
+                    // 如果没有指定语言，使用默认语言
+                    document.getElementById('code-language').value = EDITOR_CONFIG.DEFAULT_CODE_LANGUAGE;
+                }
+            } else {
+                console.warn('代码编辑器未就绪，无法设置内容');
+                // 如果编辑器未就绪，延迟设置内容
+                setTimeout(() => {
+                    if (isEditorReady('code')) {
+                        const contentCode = data.content_code || '';
+                        console.log('延迟设置代码编辑器内容:', contentCode);
+                        monacoEditor.setValue(contentCode);
+
+                        if (data.code_language) {
+                            document.getElementById('code-language').value = data.code_language;
+                            try {
+                                monaco.editor.setModelLanguage(monacoEditor.getModel(), data.code_language);
+                            } catch (error) {
+                                console.warn('设置代码语言失败:', error);
+                            }
+                        } else {
+                            // 如果没有指定语言，使用默认语言
+                            document.getElementById('code-language').value = EDITOR_CONFIG.DEFAULT_CODE_LANGUAGE;
+                        }
+                    }
+                }, 1000);
+            }
+
+            // 更新预览
+            setTimeout(() => {
+                updatePreview();
+            }, 500);
+        })
+        .catch(error => {
+            console.error('加载文章失败:', error);
+            console.error('错误详情:', {
+                articleId: articleId,
+                isCourse: isCourse,
+                apiUrl: apiUrl,
+                error: error.message,
+                stack: error.stack
+            });
+
+            // 使用SweetAlert2显示更友好的错误提示
+            let errorMessage = error.message;
+            let errorDetails = '';
+
+            if (error.message.includes('404')) {
+                errorDetails = '可能原因：<br>1. ' + (isCourse ? '教程' : '文章') + 'ID不正确<br>2. ' + (isCourse ? '教程' : '文章') + '已被删除<br>3. 网络连接问题';
+            } else if (error.message.includes('权限')) {
+                errorDetails = '请确认您有权限编辑此' + (isCourse ? '教程' : '文章');
+            } else if (error.message.includes('fetch')) {
+                errorDetails = '网络连接错误，请检查：<br>1. 服务器是否正常运行<br>2. 网络连接是否稳定<br>3. 浏览器控制台查看详细错误';
+            } else {
+                errorDetails = '未知错误，请稍后重试或联系技术支持';
+            }
+
+            Swal.fire({
+                title: `加载${isCourse ? '教程' : '文章'}失败`,
+                html: `
+                    <div style="text-align: left;">
+                        <p><strong>错误信息：</strong> ${errorMessage}</p>
+                        <p><strong>调试信息：</strong></p>
+                        <ul style="text-align: left; margin-left: 20px;">
+                            <li>文章ID: ${articleId}</li>
+                            <li>内容类型: ${isCourse ? '教程' : '文章'}</li>
+                            <li>API地址: ${apiUrl}</li>
+                        </ul>
+                        <p><strong>${errorDetails}</strong></p>
+                    </div>
+                `,
+                icon: 'error',
+                confirmButtonText: '返回列表',
+                cancelButtonText: '重试',
+                showCancelButton: true,
+                reverseButtons: true
+            }).then((result) => {
+                if (result.isConfirmed) {
+                    window.history.back();
+                } else if (result.isDismissed && result.dismiss === Swal.DismissReason.cancel) {
+                    // 重试加载
+                    loadArticle(articleId);
+                }
+            });
+
+            // 提供返回按钮
+            const container = document.querySelector('.main-editor');
+            if (container) {
+                container.innerHTML = `
+                    <div style="text-align: center; padding: 2rem;">
+                        <h3 style="color: #e74c3c; margin-bottom: 1rem;">文章加载失败</h3>
+                        <p style="color: #666; margin-bottom: 1rem;">${error.message}</p>
+                        <p style="color: #999; font-size: 0.9rem; margin-bottom: 2rem;">
+                            文章ID: ${articleId} | 类型: ${isCourse ? '教程' : '文章'}
+                        </p>
+                        <div style="display: flex; gap: 1rem; justify-content: center;">
+                            <button onclick="window.history.back()" style="padding: 0.5rem 1rem; background: #6c757d; color: white; border: none; border-radius: 0.5rem; cursor: pointer;">
+                                返回列表
+                            </button>
+                            <button onclick="loadArticle(${articleId})" style="padding: 0.5rem 1rem; background: #4361ee; color: white; border: none; border-radius: 0.5rem; cursor: pointer;">
+                                重试
+                            </button>
+                        </div>
+                    </div>
+                `;
+            }
+        });
+}
+
+// 完整分类树，一次请求取得，切换主分类时不再请求
+let categoryTree = [];
+
+// 加载分类数据
+function loadCategories(selectedCategoryId = null) {
+    fetch('/api/category-tree/')
+        .then(response => {
+            if (!response.ok) {
+                throw new Error('获取分类数据失败');
+            }
+            return response.json();
+        })
+        .then(data => {
+            categoryTree = data.items || [];
+            const mainCategorySelect = document.getElementById('primary-category');
+            mainCategorySelect.innerHTML = '<option value="">选择主分类</option>';
+
+            // 清空子分类
+            loadSubCategories();
+
+            // 如果没有主分类数据
+            if (categoryTree.length === 0) {
+                const option = document.createElement('option');
+                option.value = "";
+                option.textContent = "暂无主分类数据";
+                option.disabled = true;
+                mainCategorySelect.appendChild(option);
+                return;
+            }
+
+            categoryTree.forEach(category => {
+                const option = document.createElement('option');
+                option.value = category.id;
+                option.textContent = category.name;
+                mainCategorySelect.appendChild(option);
+            });
+
+            // 如果有选定的分类，找到它所属的主分类
+            if (selectedCategoryId) {
+                const parent = categoryTree.find(main => main.sub_categories.some(sub => sub.id == selectedCategoryId));
+                if (parent) {
+                    mainCategorySelect.value = parent.id;
+                    loadSubCategories(parent.id, selectedCategoryId);
+                } else {
+                    console.warn('未找到子分类ID:', selectedCategoryId);
+                }
+            }
+        })
+        .catch(error => {
+            console.error('加载分类失败:', error);
+            const mainCategorySelect = document.getElementById('primary-category');
+            mainCategorySelect.innerHTML = '<option value="">加载失败</option>';
+            loadSubCategories(); // 确保子分类也被清空
+        });
+}
+
+// 加载子分类数据
+function loadSubCategories(mainCategoryId = null, selectedSubCategoryId = null) {
+    const subCategorySelect = document.getElementById('sub-category');
+    subCategorySelect.innerHTML = '<option value="">选择子分类</option>';
+
+    // 如果没有主分类ID，清空子分类并返回
+    if (!mainCategoryId) {
+        return;
+    }
+
+    const main = categoryTree.find(category => category.id == mainCategoryId);
+    const subCategories = main ? main.sub_categories : [];
+
+    // 如果没有子分类数据，显示提示
+    if (subCategories.length === 0) {
+        const option = document.createElement('option');
+        option.value = "";
+        option.textContent = "该主分类下暂无子分类";
+        option.disabled = true;
+        subCategorySelect.appendChild(option);
+        return;
+    }
+
+    subCategories.forEach(category => {
+        const option = document.createElement('option');
+        option.value = category.id;
+        option.textContent = category.name;
+        subCategorySelect.appendChild(option);
+
+        // 如果这是我们要选择的子分类
+        if (selectedSubCategoryId && category.id == selectedSubCategoryId) {
+            option.selected = true;
+        }
+    });
+}
+// 初始化TinyMCE富文本编辑器
+function initTinyMCE() {
+    console.log('开始初始化TinyMCE...');
+
+    // 检查tinymce是否已加载
+    if (typeof tinymce === 'undefined') {
+        console.error('TinyMCE库未加载');
+        createFallbackRichTextEditor();
+        return;
+    }
+
+    // 等待DOM完全加载后再初始化
+    setTimeout(() => {
+        try {
+            tinymce.init({
+                selector: '#rich-text-editor',
+                height: '100%',
+                menubar: false,
+                language: 'zh_CN',
+                language_url: 'https://cdnjs.cloudflare.com/ajax/libs/tinymce/6.7.0/langs/zh_CN.js',
+                plugins: [
+                    'advlist', 'autolink', 'lists', 'link', 'image', 'charmap', 'preview',
+                    'anchor', 'searchreplace', 'visualblocks', 'code', 'fullscreen',
+                    'insertdatetime', 'media', 'table', 'code', 'help', 'wordcount'
+                ],
+                toolbar: 'undo redo | blocks | ' + 
+                    'bold italic forecolor | alignleft aligncenter ' + 
+                    'alignright alignjustify | bullist numlist outdent indent | ' + 
+                    'removeformat | code | help',
+                content_style: 'body { font-family: Inter, -apple-system, BlinkMacSystemFont, sans-serif; font-size:14px; line-height:1.6; }',
+                setup: function(editor) {
+                    tinymceEditor = editor;
+                    currentEditorStates.richText = EditorState.TINYMCE;
+                    console.log('TinyMCE编辑器初始化成功');
+                    editor.on('change', function() {
+                        updatePreview();
+                    });
+                },
+                init_instance_callback: function(editor) {
+                    console.log('TinyMCE编辑器完全加载完成');
+                    // 如果是在编辑模式下，设置内容
+                    if (isEditMode && currentArticleId) {
+                        // 内容会在loadArticle中设置
+                        console.log('TinyMCE编辑器就绪，等待加载文章内容');
+                    }
+                }
+            }).catch(function(error) {
+                console.error('TinyMCE初始化失败:', error);
+                createFallbackRichTextEditor();
+            });
+        } catch (error) {
+            console.error('TinyMCE初始化失败:', error);
+            createFallbackRichTextEditor();
+        }
+    }, 100);
+}
+
+// 创建回退富文本编辑器
+function createFallbackRichTextEditor() {
+    console.log('创建回退富文本编辑器');
+    const editorDiv = document.getElementById('rich-text-editor');
+    if (editorDiv) {
+        editorDiv.innerHTML = '<textarea id="fallback-rich-text-editor" style="width:100%;height:400px;border:1px solid #ccc;padding:10px;font-family:sans-serif;resize:vertical;"></textarea>';
+        const fallbackEditor = document.getElementById('fallback-rich-text-editor');
+        fallbackEditor.placeholder = '在这里输入文章内容...';
+
+        tinymceEditor = {
+            getContent: () => fallbackEditor.value,
+            setContent: (content) => {
+                fallbackEditor.value = content || '';
+                console.log('回退编辑器设置内容:', content);
+            },
+            on: (event, callback) => {
+                if (event === 'change') {
+                    fallbackEditor.addEventListener('input', callback);
+                }
+            }
+        };
+
+        // 设置编辑器状态
+        currentEditorStates.richText = EditorState.FALLBACK_RICH_TEXT;
+
+        // 监听内容变化
+        fallbackEditor.addEventListener('input', updatePreview);
+        console.log('回退富文本编辑器创建完成');
+    }
+}
+
+// 初始化Monaco代码编辑器
+function initMonacoEditor() {
+    console.log('开始初始化Monaco编辑器...');
+
+    // 检查require是否可用
+    if (typeof require === 'undefined') {
+        console.error('Monaco Editor库未加载');
+        createFallbackCodeEditor();
+        return;
+    }
+
+    try {
+        require.config({ paths: { vs: 'https://cdnjs.cloudflare.com/ajax/libs/monaco-editor/0.44.0/min/vs' } });
+        require(['vs/editor/editor.main'], function() {
+            try {
+                monacoEditor = monaco.editor.create(document.getElementById('monaco-editor'), {
+                    value: '', // 移除默认代码内容
+                    language: EDITOR_CONFIG.DEFAULT_CODE_LANGUAGE,
+                    theme: 'vs',
+                    fontSize: 14,
+                    minimap: { enabled: false },
+                    scrollBeyondLastLine: false,
+                    automaticLayout: true
+                });
+                console.log('Monaco编辑器初始化成功');
+                currentEditorStates.code = EditorState.MONACO;
+                // 监听内容变化
+                monacoEditor.onDidChangeModelContent(function() {
+                    updatePreview();
+                });
+            } catch (error) {
+                console.error('Monaco编辑器创建失败:', error);
+                createFallbackCodeEditor();
+            }
+        }, function(error) {
+            console.error('Monaco Editor加载失败:', error);
+            createFallbackCodeEditor();
+        });
+    } catch (error) {
+        console.error('Monaco编辑器初始化失败:', error);
+        createFallbackCodeEditor();
+    }
+}
+
+// 创建回退代码编辑器
+function createFallbackCodeEditor() {
+    console.log('创建回退代码编辑器');
+    const editorDiv = document.getElementById('monaco-editor');
+    if (editorDiv) {
+        editorDiv.innerHTML = '<textarea id="fallback-code-editor" style="width:100%;height:400px;border:1px solid #ccc;padding:10px;font-family:monospace;resize:vertical;"></textarea>';
+        const fallbackEditor = document.getElementById('fallback-code-editor');
+        fallbackEditor.placeholder = '在这里输入代码...';
+
+        monacoEditor = {
+            getValue: () => fallbackEditor.value,
+            setValue: (value) => {
+                fallbackEditor.value = value || '';
+                console.log('回退代码编辑器设置内容:', value);
+            },
+            onDidChangeModelContent: (callback) => {
+                fallbackEditor.addEventListener('input', callback);
+            }
+        };
+
+        // 设置编辑器状态
+        currentEditorStates.code = EditorState.FALLBACK_CODE;
+
+        // 监听内容变化
+        fallbackEditor.addEventListener('input', updatePreview);
+        console.log('回退代码编辑器创建完成');
+    }
+}
+// 初始化事件监听器
+function initEventListeners() {
+    // 编辑器标签页切换
+    document.querySelectorAll('.editor-tab').forEach(tab => {
+        tab.addEventListener('click', function() {
+            switchEditorTab(this.dataset.tab);
+        });
+    });
+    // 内容类型标签页
+    document.querySelectorAll('.content-type-tab').forEach(tab => {
+        tab.addEventListener('click', function() {
+            document.querySelectorAll('.content-type-tab').forEach(t => t.classList.remove('active'));
+            this.classList.add('active');
+        });
+    });
+    // 标签输入
+    const tagInput = document.getElementById('tag-input');
+    tagInput.addEventListener('keypress', function(e) {
+        if (e.key === 'Enter' && this.value.trim()) {
+            e.preventDefault();
+            addTag(this.value.trim());
+            this.value = '';
+        }
+    });
+    // 代码语言切换
+    document.getElementById('code-language').addEventListener('change', function() {
+        if (monacoEditor) {
+            monaco.editor.setModelLanguage(monacoEditor.getModel(), this.value);
+        }
+    });
+    // 表单字段变化时更新预览
+    ['title', 'description', 'article-subtitle', 'article-summary'].forEach(id => {
+        document.getElementById(id).addEventListener('input', updatePreview);
+    });
+
+    // 主分类变化时加载对应的子分类
+    document.getElementById('primary-category').addEventListener('change', function() {
+        const mainCategoryId = this.value;
+        if (mainCategoryId) {
+            loadSubCategories(mainCategoryId);
+        } else {
+            // 清空子分类选择框
+            const subCategorySelect = document.getElementById('sub-category');
+            subCategorySelect.innerHTML = '<option value="">选择子分类</option>';
+        }
+    });
+
+    // 初始加载分类数据
+    loadCategories();
+}
+// 切换编辑器标签页
+function switchEditorTab(tabName) {
+    // 更新标签页状态
+    document.querySelectorAll('.editor-tab').forEach(tab => tab.classList.remove('active'));
+    document.querySelector(`[data-tab="${tabName}"]`).classList.add('active');
+    // 显示对应面板
+    document.querySelectorAll('.editor-pane').forEach(pane => pane.classList.remove('active'));
+    document.getElementById(`${tabName}-pane`).classList.add('active');
+    // 如果切换到Monaco编辑器，重新布局
+    if (tabName === 'code' && monacoEditor) {
+        setTimeout(() => monacoEditor.layout(), 100);
+    }
+    // 如果切换到预览，更新预览内容
+    if (tabName === 'preview') {
+        updatePreview();
+    }
+}
+// 添加标签
+function addTag(tagText) {
+    if (!tags.includes(tagText)) {
+        tags.push(tagText);
+        renderTags();
+    }
+}
+// 移除标签
+function removeTag(tagText) {
+    const index = tags.indexOf(tagText);
+    if (index > -1) {
+        tags.splice(index, 1);
+        renderTags();
+    }
+}
+// 渲染标签
+function renderTags() {
+    const container = document.getElementById('tag-container');
+    const input = document.getElementById('tag-input');
+    // 清除现有标签
+    container.querySelectorAll('.tag').forEach(tag => tag.remove());
+    // 添加新标签
+    tags.forEach(tagText => {
+        const tagElement = document.createElement('span');
+        tagElement.className = 'tag';
+        tagElement.innerHTML = `
+            ${tagText}
+            <button class="tag-remove" onclick="removeTag('${tagText}')">
+                <i class="fas fa-times"></i>
+            </button>
+        `;
+        container.insertBefore(tagElement, input);
+    });
+}
+// 更新预览
+function updatePreview() {
+    try {
+        const title = document.getElementById('title').value || EDITOR_CONFIG.DEFAULT_PREVIEW_TITLE;
+        const subtitle = document.getElementById('article-subtitle').value;
+        const summary = document.getElementById('article-summary').value;
+
+        let richTextContent = '';
+        if (isEditorReady('richText')) {
+            try {
+                richTextContent = tinymceEditor.getContent() || '';
+                console.log('获取富文本内容:', richTextContent);
+            } catch (error) {
+                console.warn('获取富文本内容失败:', error);
+                richTextContent = '';
+            }
+        }
+
+        let codeContent = '';
+        if (isEditorReady('code')) {
+            try {
+                const code = monacoEditor.getValue() || '';
+                const language = document.getElementById('code-language').value;
+                console.log('获取代码内容:', code);
+
+                if (code.trim()) {
+                    codeContent = `
+                        <div class="chat-style-codeblock">
+                            <button class="copy-btn" onclick="copyCode(this)">
+                                <i class="fas fa-copy"></i>
+                            </button>
+                            <pre><code class="language-${language}">${escapeHtml(code)}</code></pre>
+                        </div>
+                    `;
+                }
+            } catch (error) {
+                console.warn('获取代码内容失败:', error);
+                codeContent = '';
+            }
+        }
+
+        const previewContent = `
+            <h1>${escapeHtml(title)}</h1>
+            ${subtitle ? `<h2 style="color: #8d99ae; font-weight: 400; margin-bottom: 1rem;">${escapeHtml(subtitle)}</h2>` : ''}
+            ${summary ? `<div style="background: #f8f9fa; padding: 1rem; border-radius: 8px; margin-bottom: 2rem; font-style: italic;">${escapeHtml(summary)}</div>` : ''}
+            ${richTextContent}
+            ${codeContent}
+        `;
+
+        const previewElement = document.getElementById('preview-content');
+        if (previewElement) {
+            previewElement.innerHTML = previewContent;
+            console.log('预览更新完成');
+        } else {
+            console.warn('预览元素未找到');
+        }
+    } catch (error) {
+        console.error('更新预览失败:', error);
+    }
+}
+// HTML转义
+function escapeHtml(text) {
+    const div = document.createElement('div');
+    div.textContent = text;
+    return div.innerHTML;
+}
+// 复制代码
+function copyCode(button) {
+    try {
+        const codeBlock = button.closest('.chat-style-codeblock');
+        if (!codeBlock) {
+            console.warn('代码块元素未找到');
+            return;
+        }
+
+        const codeElement = codeBlock.querySelector('code');
+        if (!codeElement) {
+            console.warn('代码元素未找到');
+            return;
+        }
+
+        const code = codeElement.textContent || '';
+        if (!code.trim()) {
+            Swal.fire('提示', '没有可复制的代码内容', 'warning');
+            return;
+        }
+
+        // 尝试使用现代API复制
+        if (navigator.clipboard && window.isSecureContext) {
+            navigator.clipboard.writeText(code).then(() => {
+                showCopySuccess(button);
+            }).catch(error => {
+                console.warn('现代复制API失败，使用回退方法:', error);
+                fallbackCopyTextToClipboard(code, button);
+            });
+        } else {
+            // 回退到传统方法
+            fallbackCopyTextToClipboard(code, button);
+        }
+    } catch (error) {
+        console.error('复制代码失败:', error);
+        Swal.fire('错误', '复制代码失败: ' + error.message, 'error');
+    }
+}
+
+// 回退复制方法
+function fallbackCopyTextToClipboard(text, button) {
+    try {
+        const textArea = document.createElement('textarea');
+        textArea.value = text;
+        textArea.style.position = 'fixed';
+        textArea.style.left = '-999999px';
+        textArea.style.top = '-999999px';
+        document.body.appendChild(textArea);
+        textArea.focus();
+        textArea.select();
+
+        const successful = document.execCommand('copy');
+        document.body.removeChild(textArea);
+
+        if (successful) {
+            showCopySuccess(button);
+        } else {
+            throw new Error('复制命令执行失败');
+        }
+    } catch (error) {
+        console.error('回退复制方法失败:', error);
+        Swal.fire('错误', '复制失败，请手动选择代码复制', 'error');
+    }
+}
+
+// 显示复制成功提示
+function showCopySuccess(button) {
+    const originalIcon = button.innerHTML;
+    button.innerHTML = '<i class="fas fa-check"></i>';
+    button.style.color = '#10b981';
+
+    setTimeout(() => {
+        button.innerHTML = originalIcon;
+        button.style.color = '';
+    }, 2000);
+
+    // 可选：显示成功提示
+    Swal.fire({
+        title: '复制成功！',
+        text: '代码已复制到剪贴板',
+        icon: 'success',
+        timer: 1500,
+        showConfirmButton: false
+    });
+}
+// 工具栏功能
+function previewContent() {
+    switchEditorTab('preview');
+}
+
+function saveToList() {
+    if (confirm('确定要保存这篇文章吗？')) {
+        saveArticle();
+    }
+}
+
+// 保存文章到后端
+function saveArticle() {
+    // 收集表单数据
+    const title = document.getElementById('title').value;
+    const subtitle = document.getElementById('article-subtitle').value;
+    const summary = document.getElementById('article-summary').value;
+    const categoryId = document.getElementById('sub-category').value;
+    const readTimeMinutes = document.getElementById('read-time').value || EDITOR_CONFIG.DEFAULT_READ_TIME;
+
+    // 获取内容类型 - 根据编辑模式决定
+    const urlParams = new URLSearchParams(window.location.search);
+    const typeParam = urlParams.get('type');
+    let contentType = 'TUTORIAL'; // 默认为教程
+
+    // 如果是教程编辑模式，强制为TUTORIAL
+    if (typeParam === 'course' || (isEditMode && window.location.href.includes('type=course'))) {
+        contentType = 'TUTORIAL';
+    } else {
+        // 普通文章模式，根据选择的内容类型
+        document.querySelectorAll('.content-type-tab').forEach(tab => {
+            if (tab.classList.contains('active')) {
+                const typeMap = {
+                    'tutorial': 'TUTORIAL',
+                    'story': 'STORY',
+                    'structure': 'STRUCTURE'
+                };
+                contentType = typeMap[tab.dataset.type] || 'TUTORIAL';
+            }
+        });
+    }
+
+    // 获取富文本内容
+    const contentHtml = isEditorReady('richText') ? tinymceEditor.getContent() : '';
+
+    // 获取代码内容
+    const contentCode = isEditorReady('code') ? monacoEditor.getValue() : '';
+    const codeLanguage = document.getElementById('code-language').value;
+
+    // 构建请求数据
+    const articleData = {
+        title: title,
+        subtitle: subtitle,
+        summary: summary,
+        content_type: contentType,
+        read_time_minutes: parseInt(readTimeMinutes),
+        category_id: categoryId || null,
+        content_html: contentHtml,
+        content_code: contentCode,
+        code_language: codeLanguage,
+        tags: tags
+    };
+
+    // 确定请求URL和方法
+    let url = contentType === 'TUTORIAL' ? '/api/courses/' : '/api/articles/';
+    let method = 'POST';
+
+    if (isEditMode && currentArticleId) {
+        url = `${url}${currentArticleId}/`;
+        method = 'PUT';
+    }
+
+    // 发送请求
+    fetch(url, {
+        method: method,
+        headers: {
+            'Content-Type': 'application/json',
+            'X-CSRFToken': getCsrfToken() // 获取CSRF令牌
+        },
+        body: JSON.stringify(articleData)
+    })
+    .then(response => {
+        if (!response.ok) {
+            throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+        }
+        return response.json();
+    })
+    .then(data => {
+        if (data.status === 'success') {
+            // 如果是新建文章，更新URL和状态
+            if (!isEditMode && data.id) {
+                currentArticleId = data.id;
+                isEditMode = true;
+                // 更新URL，但不刷新页面，保持type参数
+                const urlParams = new URLSearchParams(window.location.search);
+                const typeParam = urlParams.get('type');
+                const newUrl = typeParam ? `?id=${data.id}&type=${typeParam}` : `?id=${data.id}`;
+                window.history.pushState({}, '', newUrl);
+            }
+
+            Swal.fire({
+                title: '保存成功！',
+                text: data.message || '文章已成功保存',
+                icon: 'success',
+                timer: 2000,
+                showConfirmButton: false
+            });
+
+            // 可以选择跳转到列表页
+            // window.location.href = '/manage/course-management/';
+        } else {
+            Swal.fire({
+                title: '保存失败',
+                text: data.message || '未知错误',
+                icon: 'error',
+                confirmButtonText: '确定'
+            });
+        }
+    })
+    .catch(error => {
+        console.error('保存文章失败:', error);
+        Swal.fire({
+            title: '保存失败',
+            text: error.message || '网络错误或服务器异常',
+            icon: 'error',
+            confirmButtonText: '确定'
+        });
+    });
+}
+
+// 获取CSRF令牌
+function getCsrfToken() {
+    const cookieValue = document.cookie
+        .split('; ')
+        .find(row => row.startsWith('csrftoken='))
+        ?.split('=')[1];
+    return cookieValue || '';
+}
+function formatCode() {
+    try {
+        if (isEditorReady('code')) {
+            const action = monacoEditor.getAction('editor.action.formatDocument');
+            if (action) {
+                action.run();
+                console.log('代码格式化完成');
+            } else {
+                console.warn('格式化操作不可用');
+                Swal.fire('提示', '代码格式化功能不可用', 'warning');
+            }
+        } else {
+            console.warn('代码编辑器未就绪');
+            Swal.fire('提示', '代码编辑器未就绪，请稍后重试', 'warning');
+        }
+    } catch (error) {
+        console.error('代码格式化失败:', error);
+        Swal.fire('错误', '代码格式化失败: ' + error.message, 'error');
+    }
+}
+
+function runCode() {
+    try {
+        if (isEditorReady('code')) {
+            const code = monacoEditor.getValue() || '';
+            if (code.trim()) {
+                Swal.fire({
+                    title: '代码运行',
+                    html: `
+                        <div style="text-align: left;">
+                            <p><strong>代码内容：</strong></p>
+                            <pre style="background: #f8f9fa; padding: 1rem; border-radius: 8px; overflow-x: auto; font-size: 0.9rem;">${escapeHtml(code)}</pre>
+                            <p style="margin-top: 1rem; color: #666;">代码运行功能需要后端支持，目前仅作预览。</p>
+                        </div>
+                    `,
+                    icon: 'info',
+                    confirmButtonText: '确定'
+                });
+            } else {
+                Swal.fire('提示', '请先输入代码内容', 'warning');
+            }
+        } else {
+            console.warn('代码编辑器未就绪');
+            Swal.fire('提示', '代码编辑器未就绪，请稍后重试', 'warning');
+        }
+    } catch (error) {
+        console.error('代码运行失败:', error);
+        Swal.fire('错误', '代码运行失败: ' + error.message, 'error');
+    }
+}
+function insertCodeBlock() {
+    try {
+        if (isEditorReady('richText')) {
+            let code = '';
+            let language = EDITOR_CONFIG.DEFAULT_CODE_LANGUAGE;
+
+            // 尝试从Monaco编辑器获取代码
+            if (isEditorReady('code')) {
+                try {
+                    code = monacoEditor.getValue() || '';
+                    language = document.getElementById('code-language').value || EDITOR_CONFIG.DEFAULT_CODE_LANGUAGE;
+                } catch (error) {
+                    console.warn('从Monaco编辑器获取代码失败:', error);
+                }
+            }
+
+            // 如果没有代码内容，使用默认提示
+            if (!code.trim()) {
+                code = EDITOR_CONFIG.DEFAULT_CODE_CONTENT;
+            }
+
+            const codeBlock = `
+                <div class="chat-style-codeblock">
+                    <button class="copy-btn" onclick="copyCode(this)">
+                        <i class="fas fa-copy"></i>
+                    </button>
+                    <pre><code class="language-${language}">${escapeHtml(code)}</code></pre>
+                </div>
+            `;
+
+            tinymceEditor.insertContent(codeBlock);
+            console.log('代码块插入成功');
+        } else {
+            console.warn('富文本编辑器未就绪');
+            Swal.fire('提示', '富文本编辑器未就绪，请稍后重试', 'warning');
+        }
+    } catch (error) {
+        console.error('插入代码块失败:', error);
+        Swal.fire('错误', '插入代码块失败: ' + error.message, 'error');
+    }
+}
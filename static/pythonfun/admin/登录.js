@@ -0,0 +1,43 @@
+function togglePassword() {
+  const passwordInput = document.getElementById('password');
+  const toggleIcon = document.getElementById('password-toggle');
+
+  if (passwordInput.type === 'password') {
+    passwordInput.type = 'text';
+    toggleIcon.classList.remove('fa-eye');
+    toggleIcon.classList.add('fa-eye-slash');
+  } else {
+    passwordInput.type = 'password';
+    toggleIcon.classList.remove('fa-eye-slash');
+    toggleIcon.classList.add('fa-eye');
+  }
+}
+
+// 表单验证
+document.querySelector('form').addEventListener('submit', function(e) {
+  const username = document.getElementById('username').value.trim();
+  const password = document.getElementById('password').value;
+
+  if (!username || !password) {
+    e.preventDefault();
+    alert('请填写用户名和密码');
+    return false;
+  }
+
+  if (username.length < 3) {
+    e.preventDefault();
+    alert('用户名至少需要3个字符');
+    return false;
+  }
+
+  if (password.length < 6) {
+    e.preventDefault();
+    alert('密码至少需要6个字符');
+    return false;
+  }
+});
+
+// 自动聚焦用户名输入框
+document.addEventListener('DOMContentLoaded', function() {
+  document.getElementById('username').focus();
+});
@@ -0,0 +1,322 @@
+// 库和模块列表；模块条目通过分节接口获取，URL带版本号以便浏览器长期缓存
+const libraries = JSON.parse(document.getElementById('library-sections').textContent);
+const sectionItems = {};
+
+const librarySelector = document.getElementById('library-selector');
+const moduleSelector = document.getElementById('module-selector');
+const classSelector = document.getElementById('class-selector');
+const typeSelector = document.getElementById('type-selector');
+const operationSelector = document.getElementById('operation-selector');
+const searchBox = document.getElementById('search-box');
+const contentTable = document.getElementById('content-table');
+const SECTION_URL = contentTable.dataset.sectionUrl;
+
+// 初始选中的库和模块由服务端输出
+let currentLibrary = librarySelector.value || null;
+let currentModule = moduleSelector.value || null;
+let currentClass = null;
+let currentType = null;
+let currentOperation = null;
+let currentSearch = "";
+
+function escapeHtml(value) {
+    return String(value ?? "").replace(/[&<>"']/g, (ch) => ({
+        "&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#39;"
+    })[ch]);
+}
+
+function findModule(moduleId) {
+    const library = libraries.find(l => l.key === currentLibrary);
+    return library ? library.modules.find(m => String(m.id) === String(moduleId)) : null;
+}
+
+// 获取一个模块的全部条目（第一页之后的分页并发获取），结果缓存在页面中
+function loadSection(module) {
+    if (!sectionItems[module.id]) {
+        const url = (page) => `${SECTION_URL.replace('/0/', `/${module.id}/`)}?${new URLSearchParams({ v: module.version, page: page })}`;
+        const fetchPage = (page) => fetch(url(page)).then(response => {
+            if (!response.ok) throw new Error(response.statusText);
+            return response.json();
+        });
+        sectionItems[module.id] = fetchPage(1).then(async (first) => {
+            const rest = [];
+            for (let page = 2; page <= first.total_pages; page++) rest.push(fetchPage(page));
+            const pages = [first, ...(await Promise.all(rest))];
+            return pages.flatMap(p => p.items);
+        }).catch(error => {
+            delete sectionItems[module.id];
+            throw error;
+        });
+    }
+    return sectionItems[module.id];
+}
+
+function showMessage(message) {
+    contentTable.innerHTML = `<tr><td colspan="8" class="empty-message">${message}</td></tr>`;
+}
+
+// 筛选条件变化时，确保当前模块的条目已加载再重新渲染
+async function refresh() {
+    const module = findModule(currentModule);
+    if (!module) {
+        showMessage(currentLibrary ? '请选择一个模块' : '请选择一个库和模块');
+        return;
+    }
+    const requested = currentModule;
+    if (!sectionItems[module.id]) showMessage('<i class="fas fa-spinner fa-spin"></i> 加载中...');
+    try {
+        const items = await loadSection(module);
+        if (requested !== currentModule) return;
+        renderTable(module, items);
+    } catch (error) {
+        console.error('加载模块失败:', error);
+        showMessage('加载失败');
+    }
+}
+
+function init() {
+    librarySelector.addEventListener('change', function() {
+        currentLibrary = this.value;
+        currentModule = null;
+        currentClass = null;
+        currentType = null;
+        currentOperation = null;
+        currentSearch = "";
+        searchBox.value = "";
+        loadLibrary(currentLibrary);
+    });
+
+    moduleSelector.addEventListener('change', function() {
+        currentModule = this.value;
+        currentClass = null;
+        currentSearch = "";
+        searchBox.value = "";
+        loadClasses();
+        refresh();
+    });
+
+    classSelector.addEventListener('change', function() {
+        currentClass = this.value;
+        refresh();
+    });
+
+    typeSelector.addEventListener('change', function() {
+        currentType = this.value;
+        refresh();
+    });
+
+    operationSelector.addEventListener('change', function() {
+        currentOperation = this.value;
+        refresh();
+    });
+
+    searchBox.addEventListener('input', function() {
+        currentSearch = this.value.toLowerCase();
+        refresh();
+    });
+
+    contentTable.addEventListener('click', function(e) {
+        if (e.target.id === 'load-all') {
+            e.preventDefault();
+            refresh();
+        }
+    });
+}
+
+function loadLibrary(libraryId) {
+    const library = libraries.find(l => l.key === libraryId);
+    generateModuleOptions(library ? library.modules : []);
+    classSelector.innerHTML = '<option value="">-- 全部类 --</option>';
+    typeSelector.value = "";
+    operationSelector.value = "";
+    if (library && library.modules.length > 0) {
+        moduleSelector.value = library.modules[0].id;
+        currentModule = String(library.modules[0].id);
+        loadClasses();
+        refresh();
+    } else {
+        showMessage('该库没有可用模块');
+    }
+}
+
+async function loadClasses() {
+    const module = findModule(currentModule);
+    classSelector.innerHTML = '<option value="">-- 全部类 --</option>';
+    if (!module) return;
+    const requested = currentModule;
+    let items;
+    try {
+        items = await loadSection(module);
+    } catch (error) {
+        return;
+    }
+    if (requested !== currentModule) return;
+    items.filter(item => item.kind === 'class').forEach(cls => {
+        const option = document.createElement('option');
+        option.value = cls.name;
+        option.textContent = cls.name;
+        classSelector.appendChild(option);
+    });
+}
+
+function generateModuleOptions(modules) {
+    moduleSelector.innerHTML = "";
+    const defaultOption = document.createElement('option');
+    defaultOption.value = "";
+    defaultOption.textContent = "-- 选择模块 --";
+    moduleSelector.appendChild(defaultOption);
+    modules.forEach(module => {
+        const option = document.createElement('option');
+        option.value = module.id;
+        option.textContent = `${module.name} - ${module.description}`;
+        moduleSelector.appendChild(option);
+    });
+}
+
+function renderTable(module, items) {
+    let tableContent = "";
+    items.forEach(item => {
+        if (item.kind === 'class') return;
+        // 选中某个类时只显示该类的方法和属性
+        if (currentClass ? currentClass !== item.class_name : false) return;
+        if (currentType && currentType !== item.kind) return;
+        if (currentOperation && currentOperation !== item.operation) return;
+        if (!matchesSearch(item.name, item.semantic)) return;
+        tableContent += renderTableRow(
+            module.name,
+            item.class_name || '-',
+            item.kind,
+            item.operation,
+            item.name,
+            item.semantic,
+            item.input_structure,
+            item.output_structure
+        );
+    });
+    contentTable.innerHTML = tableContent || '<tr><td colspan="8" class="empty-message">没有找到匹配的结果</td></tr>';
+}
+
+function renderTableRow(moduleName, className, type, operation, name, semantic, input, output) {
+    let typeBadge = '';
+    let nameElement = '';
+    switch(type) {
+        case 'function':
+            typeBadge = `<span class="type-badge type-function">函数</span>`;
+            nameElement = `<span class="function-name">${highlightSearch(name)}</span>`;
+            break;
+        case 'method':
+            typeBadge = `<span class="type-badge type-method">方法</span>`;
+            nameElement = `<span class="method-name">${highlightSearch(name)}</span>`;
+            break;
+        case 'attribute':
+            typeBadge = `<span class="type-badge type-attribute">属性</span>`;
+            nameElement = `<span class="attribute-name">${highlightSearch(name)}</span>`;
+            break;
+    }
+    return `
+        <tr>
+            <td class="module-name">${escapeHtml(moduleName)}</td>
+            <td>${className === '-' ? '-' : `<span class="class-name">${escapeHtml(className)}</span>`}</td>
+            <td>${typeBadge}</td>
+            <td class="operation-type">${escapeHtml(operation)}</td>
+            <td>${nameElement}</td>
+            <td class="semantic-desc">${highlightSearch(semantic)}</td>
+            <td class="input-structure">${highlightSearch(input)}</td>
+            <td class="output-structure">${highlightSearch(output)}</td>
+        </tr>
+    `;
+}
+
+function matchesSearch(name, semantic) {
+    if (!currentSearch) return true;
+    return name.toLowerCase().includes(currentSearch) || 
+           semantic.toLowerCase().includes(currentSearch);
+}
+
+function highlightSearch(text) {
+    const escaped = escapeHtml(text);
+    if (!currentSearch || !text) return escaped;
+    const pattern = escapeHtml(currentSearch).replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
+    return escaped.replace(new RegExp(pattern, 'gi'), match => `<span class="search-highlight">${match}</span>`);
+}
+
+// 思维导图交互增强功能
+function enhanceTableInteractivity() {
+    // 为表格行添加点击高亮效果
+    contentTable.addEventListener('click', function(e) {
+        const row = e.target.closest('tr');
+        if (row && !row.classList.contains('empty-message')) {
+            // 移除其他行的高亮
+            document.querySelectorAll('.structure-table tr').forEach(tr => {
+                tr.classList.remove('highlighted-row');
+            });
+            // 添加当前行高亮
+            row.classList.add('highlighted-row');
+
+            // 平滑滚动到该行
+            row.scrollIntoView({ 
+                behavior: 'smooth', 
+                block: 'center' 
+            });
+        }
+    });
+
+    // 为类型标签添加点击筛选功能
+    contentTable.addEventListener('click', function(e) {
+        if (e.target.classList.contains('type-badge')) {
+            const type = e.target.textContent.trim();
+            let typeValue = '';
+            switch(type) {
+                case '函数': typeValue = 'function'; break;
+                case '方法': typeValue = 'method'; break;
+                case '属性': typeValue = 'attribute'; break;
+            }
+            if (typeValue) {
+                typeSelector.value = typeValue;
+                currentType = typeValue;
+                refresh();
+
+                // 添加视觉反馈
+                e.target.style.transform = 'scale(1.1)';
+                setTimeout(() => {
+                    e.target.style.transform = 'scale(1.05)';
+                }, 200);
+            }
+        }
+    });
+
+    // 为操作类型添加点击筛选功能
+    contentTable.addEventListener('click', function(e) {
+        if (e.target.classList.contains('operation-type')) {
+            const operation = e.target.textContent.trim();
+            operationSelector.value = operation;
+            currentOperation = operation;
+            refresh();
+
+            // 添加视觉反馈
+            e.target.style.color = '#3a0ca3';
+            setTimeout(() => {
+                e.target.style.color = '';
+            }, 500);
+        }
+    });
+}
+
+// 添加高亮行的样式
+const style = document.createElement('style');
+style.textContent = `
+    .highlighted-row {
+        background-color: rgba(67, 97, 238, 0.1) !important;
+        border-left: 4px solid #4361ee;
+        transform: translateX(4px);
+    }
+
+    .highlighted-row td {
+        font-weight: 500;
+    }
+`;
+document.head.appendChild(style);
+
+init();
+// 初始化交互增强功能
+setTimeout(enhanceTableInteractivity, 100);
@@ -0,0 +1,217 @@
+// 数据变量
+const SEARCH_URL = document.getElementById('search-input').dataset.searchUrl;
+const SUGGEST_URL = document.getElementById('search-input').dataset.suggestUrl;
+const PAGE_SIZE = 20;
+let functions = [];
+let currentQuery = "";
+let currentPage = 0;
+let totalPages = 0;
+let requestSeq = 0;
+
+function escapeHtml(value) {
+    return String(value ?? "").replace(/[&<>"']/g, (ch) => ({
+        "&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#39;"
+    })[ch]);
+}
+
+// 获取函数参数
+function getParameters(func) {
+    return func["参数"] || [];
+}
+
+// 加载数据：检索和分页都在服务端完成，page为1时重新开始列表
+async function loadData(query = currentQuery, page = 1) {
+    const seq = ++requestSeq;
+    try {
+        const params = new URLSearchParams({ q: query, page: page, page_size: PAGE_SIZE });
+        const response = await fetch(`${SEARCH_URL}?${params}`);
+        if (!response.ok) throw new Error(response.statusText);
+        const data = await response.json();
+        // 忽略已被新查询取代的响应
+        if (seq !== requestSeq) return;
+        currentQuery = query;
+        currentPage = data.current_page;
+        totalPages = data.total_pages;
+        functions = page === 1 ? data.items : functions.concat(data.items);
+        renderFunctionList(functions);
+    } catch (error) {
+        console.error("加载数据失败:", error);
+        document.getElementById("function-list").innerHTML = `
+            <div style="padding: 20px; text-align: center; color: #e74c3c;">
+                <i class="fas fa-exclamation-circle"></i> 加载失败
+            </div>
+        `;
+    }
+}
+
+// 渲染函数列表
+function renderFunctionList(funcs) {
+    const listEl = document.getElementById("function-list");
+
+    if (funcs.length === 0) {
+        listEl.innerHTML = `
+            <div style="padding: 20px; text-align: center;">
+                <i class="fas fa-search-minus"></i> 未找到匹配函数
+            </div>
+        `;
+        return;
+    }
+
+    listEl.innerHTML = "";
+    funcs.forEach((func) => {
+        const item = document.createElement("div");
+        item.className = "function-item";
+        item.dataset.qualifiedName = func["完整名称"];
+        item.innerHTML = `
+            <div class="function-name">
+                <i class="fas fa-${func["函数类型"] === "方法" ? "cube" : "code"}"></i>
+                ${escapeHtml(func["函数名称"])}
+            </div>
+            <div class="function-module">${escapeHtml(func["所属模块"])}</div>
+        `;
+        item.addEventListener("click", () => {
+            document.querySelectorAll(".function-item").forEach((el) =>
+                el.classList.remove("active")
+            );
+            item.classList.add("active");
+            renderFunctionDetail(func);
+        });
+        listEl.appendChild(item);
+    });
+
+    if (currentPage < totalPages) {
+        const more = document.createElement("div");
+        more.className = "function-item";
+        more.style.textAlign = "center";
+        more.innerHTML = `<i class="fas fa-angle-double-down"></i> 加载更多`;
+        more.addEventListener("click", () => loadData(currentQuery, currentPage + 1));
+        listEl.appendChild(more);
+    }
+}
+
+// 渲染函数详情
+function renderFunctionDetail(func) {
+    const content = document.getElementById("content");
+    const params = getParameters(func);
+
+    let paramsTable = "";
+    if (params.length > 0) {
+        paramsTable = `
+            <table class="parameters-table">
+                <thead>
+                    <tr>
+                        <th>参数名</th>
+                        <th>类型</th>
+                        <th>结构类型</th>
+                        <th>默认值</th>
+                        <th>参数是否必填</th>
+                        <th>描述</th>
+                    </tr>
+                </thead>
+                <tbody>
+                    ${params
+                        .map(
+                            (p) => `
+                        <tr>
+                            <td><code>${escapeHtml(p["参数名称"])}</code></td>
+                            <td>${escapeHtml(p["参数类型"] || "未知")}</td>
+                            <td>${escapeHtml(p["结构类型"] || "未知")}</td>
+                            <td>${p["是否有默认值"] ? escapeHtml(p["默认值"] || "无") : "无"}</td>
+                            <td>${p["参数是否必填"] ? "是" : "否"}</td>
+                            <td>${escapeHtml(p["描述"] || "无描述")}</td>
+                        </tr>
+                    `
+                        )
+                        .join("")}
+                </tbody>
+            </table>
+        `;
+    } else {
+        paramsTable = "<p>该函数没有参数。</p>";
+    }
+
+    content.innerHTML = `
+        <div class="function-header">
+            <h1 class="function-title">${escapeHtml(func["函数名称"])}</h1>
+            <div class="function-path">${escapeHtml(func["完整名称"])}</div>
+            <div class="function-meta">
+                <div class="meta-item">
+                    <span>模块:</span>
+                    <span>${escapeHtml(func["所属模块"])}</span>
+                </div>
+                <div class="meta-item">
+                    <span>类型:</span>
+                    <span>${escapeHtml(func["函数类型"])}</span>
+                </div>
+            </div>
+        </div>
+
+        <div style="margin-bottom: 20px;">
+            <h3>功能描述</h3>
+            <p>${escapeHtml(func["描述"])}</p>
+        </div>
+
+        <div style="margin-bottom: 20px;">
+            <h3>函数定义</h3>
+            <div class="code-block">${escapeHtml(func["源码定义"])}</div>
+        </div>
+
+        <div style="margin-bottom: 20px;">
+            <h3>参数说明</h3>
+            ${paramsTable}
+        </div>
+
+        <div style="margin-bottom: 20px;">
+            <h3>返回值</h3>
+            <p>${escapeHtml(func["返回值说明"] || "无返回值说明")}</p>
+        </div>
+    `;
+}
+
+// 搜索功能
+function performSearch() {
+    const term = document.getElementById("search-input").value.trim();
+    loadData(term, 1);
+}
+
+// 输入时按完整名称前缀补全
+let suggestTimer = null;
+let suggestSeq = 0;
+function updateSuggestions() {
+    clearTimeout(suggestTimer);
+    suggestTimer = setTimeout(async () => {
+        const term = document.getElementById("search-input").value.trim();
+        const seq = ++suggestSeq;
+        const listEl = document.getElementById("function-suggestions");
+        if (!term) {
+            listEl.innerHTML = "";
+            return;
+        }
+        try {
+            const response = await fetch(`${SUGGEST_URL}?${new URLSearchParams({ q: term })}`);
+            const data = await response.json();
+            if (seq !== suggestSeq) return;
+            listEl.innerHTML = data.suggestions.map((name) => `<option value="${escapeHtml(name)}"></option>`).join("");
+        } catch (error) {
+            console.error("获取补全失败:", error);
+        }
+    }, 80);
+}
+
+// 初始化
+document.addEventListener("DOMContentLoaded", () => {
+    loadData();
+
+    document.getElementById("search-button").addEventListener("click", performSearch);
+    document.getElementById("search-input").addEventListener("keyup", (e) => {
+        if (e.key === "Enter") performSearch();
+    });
+    document.getElementById("search-input").addEventListener("input", (e) => {
+        // 从补全列表中选中时直接检索
+        if (e.inputType === "insertReplacementText" || e.inputType === undefined) {
+            performSearch();
+        } else {
+            updateSuggestions();
+        }
+    });
+});
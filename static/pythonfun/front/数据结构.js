@@ -0,0 +1,27 @@
+function filterDataStructure(type) {
+    // 移除所有按钮的 active 状态
+    document.querySelectorAll('.filter-option').forEach(option => {
+        option.classList.remove('active');
+    });
+    // 给当前点击的按钮添加 active
+    event.currentTarget.classList.add('active');
+
+    // 隐藏所有内容块
+    document.querySelectorAll('.data-structure-section').forEach(section => {
+        section.classList.remove('active');
+    });
+
+    // 显示对应的内容块
+    const targetSection = document.getElementById(type + '-section');
+    if (targetSection) {
+        targetSection.classList.add('active');
+    }
+}
+
+// 页面加载后默认选中"列表"
+document.addEventListener('DOMContentLoaded', function () {
+    const listButton = document.querySelector('.filter-option[onclick="filterDataStructure(\'list\')"]');
+    if (listButton) {
+        listButton.click();
+    }
+});
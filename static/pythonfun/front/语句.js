@@ -0,0 +1,40 @@
+document.addEventListener('DOMContentLoaded', function() {
+    // 获取所有分类筛选按钮
+    const filterButtons = document.querySelectorAll('.filter-option');
+
+    // 为每个筛选按钮添加点击事件
+    filterButtons.forEach(button => {
+        button.addEventListener('click', function() {
+            // 移除所有按钮的active类
+            filterButtons.forEach(btn => btn.classList.remove('active'));
+            // 给当前点击的按钮添加active类
+            this.classList.add('active');
+
+            // 获取选中的分类
+            const selectedCategory = this.dataset.category;
+
+            // 处理所有语句卡片
+            document.querySelectorAll('.statement-card').forEach(card => {
+                if (selectedCategory === 'all') {
+                    card.classList.add('active');
+                } else {
+                    const cardCategories = card.dataset.categories.split(' ');
+                    if (cardCategories.includes(selectedCategory)) {
+                        card.classList.add('active');
+                    } else {
+                        card.classList.remove('active');
+                    }
+                }
+            });
+
+            // 处理分类标题
+            document.querySelectorAll('.category-title').forEach(title => {
+                if (selectedCategory === 'all' || title.id === `category-${selectedCategory}`) {
+                    title.classList.add('active');
+                } else {
+                    title.classList.remove('active');
+                }
+            });
+        });
+    });
+});